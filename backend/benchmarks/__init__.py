@@ -0,0 +1,21 @@
+"""
+Benchmarks for the task API.
+
+Each workload module exposes ``run(client, size, repeat)`` returning a
+list of result dicts; ``size`` defaults to a scale suited to the
+workload. Run them with ``python manage.py run_benchmarks``,
+which uses a throwaway test database; ``python manage.py seed_tasks``
+fills a database with the same synthetic tasks the workloads use.
+"""
+
+WORKLOADS = {
+    "admin": "benchmarks.admin.run",
+    "api": "benchmarks.api.run",
+    "batch": "benchmarks.batch.run",
+    "encodings": "benchmarks.encodings.run",
+    "fieldsets": "benchmarks.fieldsets.run",
+    "read_service": "benchmarks.read_service.run",
+    "response_cache": "benchmarks.response_cache.run",
+    "serialization": "benchmarks.serialization.run",
+    "servers": "benchmarks.servers.run",
+}
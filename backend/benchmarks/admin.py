@@ -0,0 +1,83 @@
+"""
+Task admin changelist page loads against a table of ``size`` tasks.
+
+Each page is loaded in the large-table mode (estimated counts, keyset
+pages) and, as ``*_exact``, with it turned off, which counts every page
+load and pages by ``OFFSET``. The filter choice cache is warm.
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from tasks.admin import CURSOR_VAR, TaskAdmin
+from tasks.models import Task
+
+from .harness import latency
+from .seed import clear_tasks, seed_tasks
+
+REQUESTS = 20
+WARMUP = 2
+
+# Beyond any table: the large-table mode is off.
+NEVER = 10**15
+
+
+def run(client, size=5000000, repeat=3):
+    clear_tasks()
+    seed_tasks(size)
+    if connection.vendor == "postgresql":
+        # Planner statistics for the estimates; autovacuum may not have
+        # caught up with the seed.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE tasks_task")
+    user = get_user_model().objects.create_superuser("benchmark-admin")
+    client.force_login(user)
+
+    url = reverse("admin:tasks_task_changelist")
+    middle = (
+        Task.objects.order_by("-pk").values_list("pk", flat=True)[size // 2]
+        + 1
+    )
+    pages = size // TaskAdmin.list_per_page
+    filtered = {"completed__exact": "0", "priority__exact": "high"}
+    # (name, query string, query string with the mode off)
+    loads = [
+        ("first_page", {}, {}),
+        ("middle_page", {CURSOR_VAR: middle}, {"p": pages // 2}),
+        ("filtered", filtered, filtered),
+        ("due_month", {"due_month": "2026-03"}, {"due_month": "2026-03"}),
+        ("search", {"q": "deploy"}, {"q": "deploy"}),
+    ]
+    cases = []
+    for name, params, exact in loads:
+        cases.append((name, params, {}))
+        cases.append(
+            (f"{name}_exact", exact, {"ADMIN_LARGE_TABLE_ROWS": NEVER})
+        )
+
+    count = REQUESTS * repeat
+    results = []
+    for name, params, overrides in cases:
+        with override_settings(**overrides):
+            durations = []
+            for i in range(WARMUP + count):
+                start = time.perf_counter()
+                response = client.get(url, params)
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f"{name} returned {response.status_code}"
+                    )
+                if i >= WARMUP:
+                    durations.append(time.perf_counter() - start)
+        result = latency("admin", name, durations)
+        result["size"] = size
+        results.append(result)
+
+    client.logout()
+    user.delete()
+    clear_tasks()
+    return results
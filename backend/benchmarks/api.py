@@ -0,0 +1,156 @@
+"""
+Every ``TaskViewSet`` action against a table of ``size`` seeded tasks.
+
+Each case issues ``REQUESTS * repeat`` timed requests after a short
+warm-up, then a few more under query capture and memory tracing.
+Requests pick their tasks from a fixed random sample, so runs at the
+same size are comparable.
+"""
+
+import random
+import time
+
+from django.db.models import Max, Min
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.pagination import TASK_ORDERING, TaskCursorPagination
+from tasks.ranking import RANK_GAP
+from tasks.sync import encode_token
+
+from .harness import latency, profile
+from .seed import clear_tasks, seed_tasks
+
+REQUESTS = 100
+WARMUP = 10
+PROFILED = 5
+
+REORDER_SIZE = 50
+
+
+def _deep_page_url(size):
+    # The page starting halfway down the list.
+    middle = Task.objects.order_by(*(key.field for key in TASK_ORDERING))[
+        size // 2
+    ]
+    paginator = TaskCursorPagination()
+    paginator.base_url = reverse("tasks-list")
+    return paginator.encode_cursor(
+        [getattr(middle, key.field) for key in TASK_ORDERING], False
+    )
+
+
+def run(client, size=10000, repeat=3):
+    clear_tasks()
+    seed_tasks(size)
+    bounds = Task.objects.aggregate(first=Min("id"), last=Max("id"))
+    count = REQUESTS * repeat
+    calls = WARMUP + count + PROFILED
+    # Destroy needs a distinct task per request; the other cases reuse
+    # the same sample.
+    if size <= calls:
+        raise RuntimeError(f"The api workload needs more than {calls} tasks.")
+    rng = random.Random(size)
+    ids = rng.sample(range(bounds["first"], bounds["last"] + 1), calls + 1)
+
+    def task_id(i):
+        return ids[i]
+
+    def detail(i):
+        return reverse("tasks-detail", kwargs={"pk": task_id(i)})
+
+    list_url = reverse("tasks-list")
+    changes_url = reverse("tasks-changes")
+    deep_url = _deep_page_url(size)
+    since = encode_token(timezone.now())
+
+    def reorder(i):
+        chosen = [ids[(i + k) % len(ids)] for k in range(REORDER_SIZE)]
+        orders = [
+            {"id": pk, "sort_order": rng.randrange(size) * RANK_GAP}
+            for pk in chosen
+        ]
+        return client.post(
+            reverse("tasks-reorder"), {"task_orders": orders}, format="json"
+        )
+
+    cases = [
+        ("list", lambda i: client.get(list_url), 200),
+        ("list_deep_page", lambda i: client.get(deep_url), 200),
+        (
+            "list_filtered",
+            lambda i: client.get(
+                list_url,
+                {
+                    "priority": "high",
+                    "completed": "false",
+                    "ordering": "due_date",
+                },
+            ),
+            200,
+        ),
+        ("search", lambda i: client.get(list_url, {"search": "deploy"}), 200),
+        ("retrieve", lambda i: client.get(detail(i)), 200),
+        (
+            "create",
+            lambda i: client.post(
+                list_url, {"title": f"Created {i}"}, format="json"
+            ),
+            201,
+        ),
+        (
+            "update",
+            lambda i: client.put(
+                detail(i),
+                {"title": f"Updated {i}", "priority": "low"},
+                format="json",
+            ),
+            200,
+        ),
+        (
+            "partial_update",
+            lambda i: client.patch(
+                detail(i), {"completed": i % 2 == 0}, format="json"
+            ),
+            200,
+        ),
+        (
+            "move",
+            lambda i: client.post(
+                reverse("tasks-move", kwargs={"pk": task_id(i)}),
+                {"after": task_id(i + 1)},
+                format="json",
+            ),
+            200,
+        ),
+        ("reorder", reorder, 200),
+        ("changes", lambda i: client.get(changes_url, {"since": since}), 200),
+        ("destroy", lambda i: client.delete(detail(i)), 204),
+    ]
+
+    results = []
+    for name, request, expected in cases:
+
+        def call(i, name=name, request=request, expected=expected):
+            response = request(i)
+            if response.status_code != expected:
+                raise RuntimeError(
+                    f"{name} returned {response.status_code}: "
+                    f"{response.content[:200]!r}"
+                )
+
+        for i in range(WARMUP):
+            call(i)
+        durations = []
+        for i in range(WARMUP, WARMUP + count):
+            start = time.perf_counter()
+            call(i)
+            durations.append(time.perf_counter() - start)
+        result = latency("api", name, durations)
+        result["size"] = size
+        result.update(profile(lambda i: call(WARMUP + count + i), PROFILED))
+        results.append(result)
+
+    clear_tasks()
+    return results
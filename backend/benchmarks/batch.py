@@ -0,0 +1,99 @@
+"""Single-item requests against the batch endpoints."""
+
+from django.urls import reverse
+
+from tasks.batch import MAX_BATCH_SIZE
+from tasks.models import Task
+
+from .harness import measure, throughput
+
+
+def _chunks(items):
+    for start in range(0, len(items), MAX_BATCH_SIZE):
+        yield items[start : start + MAX_BATCH_SIZE]
+
+
+def _check(response, expected):
+    if response.status_code != expected:
+        raise RuntimeError(
+            f"{response.request['REQUEST_METHOD']} "
+            f"{response.request['PATH_INFO']} returned "
+            f"{response.status_code}: {response.content[:200]!r}"
+        )
+
+
+def run(client, size=500, repeat=3):
+    list_url = reverse("tasks-list")
+    batch_url = reverse("tasks-batch")
+    payloads = [
+        {"title": f"Task {i}", "priority": "medium"} for i in range(size)
+    ]
+    ids = []
+
+    def reset():
+        Task.objects.all().delete()
+
+    def seed():
+        reset()
+        ids[:] = [
+            task.id
+            for task in Task.objects.bulk_create(
+                Task(title=f"Task {i}", sort_order=i) for i in range(size)
+            )
+        ]
+
+    def create_single():
+        for payload in payloads:
+            _check(client.post(list_url, payload, format="json"), 201)
+
+    def create_batch():
+        for chunk in _chunks(payloads):
+            _check(
+                client.post(batch_url, {"tasks": chunk}, format="json"), 201
+            )
+
+    def update_single():
+        for task_id in ids:
+            _check(
+                client.patch(
+                    reverse("tasks-detail", kwargs={"pk": task_id}),
+                    {"completed": True},
+                    format="json",
+                ),
+                200,
+            )
+
+    def update_batch():
+        for chunk in _chunks(ids):
+            tasks = [{"id": task_id, "completed": True} for task_id in chunk]
+            _check(
+                client.patch(batch_url, {"tasks": tasks}, format="json"), 200
+            )
+
+    def delete_single():
+        for task_id in ids:
+            _check(
+                client.delete(reverse("tasks-detail", kwargs={"pk": task_id})),
+                204,
+            )
+
+    def delete_batch():
+        for chunk in _chunks(ids):
+            _check(
+                client.delete(batch_url, {"ids": chunk}, format="json"), 200
+            )
+
+    cases = [
+        ("create_single", create_single, reset),
+        ("create_batch", create_batch, reset),
+        ("update_single", update_single, seed),
+        ("update_batch", update_batch, seed),
+        ("delete_single", delete_single, seed),
+        ("delete_batch", delete_batch, seed),
+    ]
+    results = [
+        throughput("batch", name, measure(fn, setup, repeat), size)
+        for name, fn, setup in cases
+    ]
+    reset()
+    return results
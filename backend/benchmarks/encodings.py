@@ -0,0 +1,104 @@
+"""
+A large task list page in each response format (JSON, MessagePack) and
+content coding (none, gzip, zstd, brotli) the server supports, against a
+table of ``size`` tasks.
+
+Each result carries the response size and the client's median time to
+decode it (decompress, then parse) next to the latency.
+"""
+
+import gzip
+import json
+import statistics
+import time
+
+from django.test import override_settings
+from django.urls import reverse
+
+from tasks import compression
+
+from .harness import latency, measure
+from .seed import clear_tasks, seed_tasks
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+REQUESTS = 100
+WARMUP = 10
+DECODES = 20
+
+PAGE_SIZE = 1000
+
+FORMATS = {"json": ("application/json", json.loads)}
+if msgpack is not None:
+    FORMATS["msgpack"] = ("application/msgpack", msgpack.unpackb)
+
+DECOMPRESSORS = {
+    "identity": lambda data: data,
+    "gzip": gzip.decompress,
+    "zstd": lambda data: (
+        zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    ),
+    "br": lambda data: brotli.decompress(data),
+}
+
+CODINGS = ["identity", *compression.CODINGS]
+
+
+def run(client, size=10000, repeat=3):
+    clear_tasks()
+    seed_tasks(size)
+    url = reverse("tasks-list")
+    params = {"page_size": PAGE_SIZE}
+
+    results = []
+    # Compress every response, as the threshold would for this page.
+    with override_settings(RESPONSE_COMPRESSION_MIN_BYTES=0):
+        for name, (media_type, parse) in FORMATS.items():
+            for coding in CODINGS:
+                durations = []
+                for i in range(WARMUP + REQUESTS * repeat):
+                    start = time.perf_counter()
+                    response = client.get(
+                        url,
+                        params,
+                        HTTP_ACCEPT=media_type,
+                        HTTP_ACCEPT_ENCODING=coding,
+                    )
+                    elapsed = time.perf_counter() - start
+                    if response.status_code != 200:
+                        raise RuntimeError(
+                            f"{url} returned {response.status_code}"
+                        )
+                    if i >= WARMUP:
+                        durations.append(elapsed)
+                if response.get("Content-Encoding", "identity") != coding:
+                    raise RuntimeError(f"{url} was not encoded as {coding}")
+
+                decompress = DECOMPRESSORS[coding]
+                content = response.content
+                decodes = measure(
+                    lambda: parse(decompress(content)), repeat=DECODES
+                )
+                result = latency("encodings", f"{name}_{coding}", durations)
+                result["size"] = size
+                result["response_bytes"] = len(content)
+                result["decode_ms"] = round(
+                    statistics.median(decodes) * 1000, 3
+                )
+                results.append(result)
+
+    clear_tasks()
+    return results
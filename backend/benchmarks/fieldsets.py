@@ -0,0 +1,63 @@
+"""
+Task list pages with multi-kilobyte descriptions, in full, as the
+summary view and as a sparse fieldset, against a table of ``size`` tasks.
+
+Each result carries the response size next to the latency.
+"""
+
+import random
+import time
+
+from django.urls import reverse
+
+from tasks.models import Task
+
+from .harness import latency
+from .seed import WORDS, clear_tasks, seed_tasks
+
+REQUESTS = 100
+WARMUP = 10
+
+# About 4 KB of text per task.
+DESCRIPTION_WORDS = 600
+
+REPRESENTATIONS = [
+    ("full", {}),
+    ("summary", {"view": "summary"}),
+    ("fields", {"fields": "id,title,priority,due_date,completed"}),
+]
+
+PAGES = [("first_page", {}), ("large_page", {"page_size": 1000})]
+
+
+def run(client, size=10000, repeat=3):
+    clear_tasks()
+    seed_tasks(size)
+    rng = random.Random(0)
+    Task.objects.update(
+        description=" ".join(rng.choices(WORDS, k=DESCRIPTION_WORDS))
+    )
+    url = reverse("tasks-list")
+
+    results = []
+    for page, page_params in PAGES:
+        for name, params in REPRESENTATIONS:
+            params = {**page_params, **params}
+            durations = []
+            for i in range(WARMUP + REQUESTS * repeat):
+                start = time.perf_counter()
+                response = client.get(url, params)
+                elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f"{url} returned {response.status_code}"
+                    )
+                if i >= WARMUP:
+                    durations.append(elapsed)
+            result = latency("fieldsets", f"{page}_{name}", durations)
+            result["size"] = size
+            result["response_bytes"] = len(response.content)
+            results.append(result)
+
+    clear_tasks()
+    return results
@@ -0,0 +1,83 @@
+"""Timing helpers shared by benchmark workloads."""
+
+import math
+import statistics
+import time
+import tracemalloc
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def measure(fn, setup=None, repeat=3):
+    """Return the wall time of ``repeat`` calls to ``fn``, in seconds."""
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def throughput(workload, name, durations, items):
+    """Summarize ``durations`` for ``items`` processed per run."""
+    median = statistics.median(durations)
+    return {
+        "workload": workload,
+        "name": name,
+        "items": items,
+        "runs": len(durations),
+        "median_seconds": round(median, 6),
+        "items_per_second": round(items / median, 1) if median else None,
+    }
+
+
+def percentile(durations, fraction):
+    """Nearest-rank percentile of ``durations``."""
+    ordered = sorted(durations)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def latency(workload, name, durations):
+    """Summarize per-request ``durations`` as throughput and percentiles."""
+    total = sum(durations)
+    return {
+        "workload": workload,
+        "name": name,
+        "requests": len(durations),
+        "requests_per_second": (
+            round(len(durations) / total, 1) if total else None
+        ),
+        "p50_ms": round(percentile(durations, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(durations, 0.99) * 1000, 3),
+    }
+
+
+def profile(fn, calls, using="default"):
+    """
+    Call ``fn(i)`` for ``i`` in ``range(calls)`` and return the mean SQL
+    queries per call and the peak Python memory allocated meanwhile.
+
+    Tracing memory slows everything down, so this is kept apart from the
+    timed runs.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        with CaptureQueriesContext(connections[using]) as queries:
+            for i in range(calls):
+                fn(i)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return {
+        "queries_per_request": round(len(queries) / calls, 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
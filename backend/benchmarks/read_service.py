@@ -0,0 +1,89 @@
+"""DRF TaskViewSet against the FastAPI read service for hot reads."""
+
+import time
+
+from django.db import connection
+from django.urls import reverse
+
+from tasks.models import Task
+
+from .harness import latency
+
+# Requests timed per case and run; a few more warm up each service.
+REQUESTS = 100
+WARMUP = 10
+
+
+def _timed(get, url, count):
+    durations = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url)
+        durations.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+    return durations
+
+
+def run(client, size=10000, repeat=3):
+    if connection.vendor != "postgresql":
+        raise RuntimeError("The read service benchmark needs PostgreSQL.")
+    # Optional dependencies of the read service.
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    Task.objects.all().delete()
+    tasks = Task.objects.bulk_create(
+        (
+            Task(
+                title=f"Task {i}",
+                description="Benchmark task " * 4,
+                priority=["low", "medium", "high"][i % 3],
+                completed=i % 2 == 0,
+                sort_order=i,
+            )
+            for i in range(size)
+        ),
+        batch_size=1000,
+    )
+    middle = tasks[len(tasks) // 2].id
+    cases = [
+        ("list_page", "?page_size=50"),
+        ("list_filtered", "?priority=high&completed=false&page_size=50"),
+    ]
+    urls = [
+        (name, reverse("tasks-list") + query, "/tasks" + query)
+        for name, query in cases
+    ]
+    urls.append(
+        (
+            "retrieve",
+            reverse("tasks-detail", kwargs={"pk": middle}),
+            f"/tasks/{middle}",
+        )
+    )
+
+    results = []
+    with TestClient(app) as service:
+        for name, django_url, service_url in urls:
+            _timed(client.get, django_url, WARMUP)
+            _timed(service.get, service_url, WARMUP)
+            count = REQUESTS * repeat
+            django = latency(
+                "read_service",
+                f"{name}_django",
+                _timed(client.get, django_url, count),
+            )
+            fastapi = latency(
+                "read_service",
+                f"{name}_fastapi",
+                _timed(service.get, service_url, count),
+            )
+            fastapi["speedup"] = round(
+                fastapi["requests_per_second"] / django["requests_per_second"],
+                1,
+            )
+            results.extend([django, fastapi])
+    Task.objects.all().delete()
+    return results
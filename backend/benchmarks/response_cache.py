@@ -0,0 +1,79 @@
+"""
+Task list pages from the shared response cache against a table of
+``size`` tasks.
+
+Each page is requested with the cache off (``*_uncached``), on and warm
+(``*_hit``), and on after every write (``*_miss``: the version is bumped
+before each, untimed, so every request rebuilds and stores its entry).
+Entries are kept in a ``FileCache`` in a temporary directory, as the
+workers of one host share them.
+"""
+
+import tempfile
+import time
+
+from django.test import override_settings
+from django.urls import reverse
+
+from tasks.versions import bump_version
+
+from .harness import latency
+from .seed import clear_tasks, seed_tasks
+
+REQUESTS = 100
+WARMUP = 10
+
+PAGES = [
+    ("first_page", {}),
+    ("large_page", {"page_size": 1000}),
+    ("filtered", {"priority": "high", "completed": "false"}),
+]
+
+
+def _time(client, url, params, before=None, count=REQUESTS):
+    durations = []
+    for i in range(WARMUP + count):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        response = client.get(url, params)
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+        if i >= WARMUP:
+            durations.append(elapsed)
+    return durations
+
+
+def run(client, size=10000, repeat=3):
+    clear_tasks()
+    seed_tasks(size)
+    url = reverse("tasks-list")
+    count = REQUESTS * repeat
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        caches = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            },
+            "responses": {
+                "BACKEND": "tasks.response_cache.FileCache",
+                "LOCATION": directory,
+            },
+        }
+        for name, params in PAGES:
+            cases = [
+                ("uncached", {"RESPONSE_CACHE": False}, None),
+                ("hit", {"RESPONSE_CACHE": True}, None),
+                ("miss", {"RESPONSE_CACHE": True}, bump_version),
+            ]
+            for mode, overrides, before in cases:
+                with override_settings(CACHES=caches, **overrides):
+                    durations = _time(client, url, params, before, count)
+                result = latency("response_cache", f"{name}_{mode}", durations)
+                result["size"] = size
+                results.append(result)
+
+    clear_tasks()
+    return results
@@ -0,0 +1,96 @@
+"""
+Synthetic task data for benchmarks.
+
+Rows are generated from a seeded random number generator, so the same
+``count`` and ``seed`` always produce the same table. PostgreSQL is
+loaded with ``COPY``, other databases with batched ``bulk_create``.
+"""
+
+import datetime
+import random
+from itertools import islice
+
+from django.db import connections
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.ranking import RANK_GAP
+
+PRIORITIES = [value for value, _ in Task.PRIORITY_CHOICES]
+
+WORDS = (
+    "review deploy write update plan fix test design release call email "
+    "report budget meeting invoice backup migrate refactor document audit"
+).split()
+
+COLUMNS = (
+    "title",
+    "description",
+    "priority",
+    "due_date",
+    "completed",
+    "sort_order",
+    "created_at",
+    "updated_at",
+)
+
+BATCH_SIZE = 10000
+
+
+def generate_rows(count, seed=0, start=0):
+    """Yield ``count`` tuples of ``COLUMNS`` values, in list order."""
+    rng = random.Random(seed)
+    today = datetime.date(2026, 1, 1)
+    now = timezone.now()
+    for i in range(start, start + count):
+        words = rng.sample(WORDS, 3)
+        created = now - datetime.timedelta(seconds=rng.randrange(10**7))
+        yield (
+            f"{words[0].capitalize()} {words[1]} {i}",
+            " ".join(rng.choices(WORDS, k=rng.randrange(12))),
+            rng.choice(PRIORITIES),
+            (
+                None
+                if rng.random() < 0.25
+                else today + datetime.timedelta(days=rng.randrange(-90, 365))
+            ),
+            rng.random() < 0.4,
+            (i + 1) * RANK_GAP,
+            created,
+            created,
+        )
+
+
+def clear_tasks(using="default"):
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE tasks_task")
+    else:
+        Task.objects.using(using).all().delete()
+
+
+def seed_tasks(count, seed=0, using="default"):
+    """
+    Append ``count`` synthetic tasks after the existing ones.
+
+    Returns the number of rows written.
+    """
+    connection = connections[using]
+    start = Task.objects.using(using).count()
+    rows = generate_rows(count, seed=seed, start=start)
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            with cursor.copy(
+                f"COPY tasks_task ({', '.join(COLUMNS)}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row(row)
+    else:
+        # bulk_create materializes its input, so feed it a batch at a time.
+        # auto_now fields are stamped with the current time here.
+        while batch := list(islice(rows, BATCH_SIZE)):
+            Task.objects.using(using).bulk_create(
+                Task(**dict(zip(COLUMNS, row))) for row in batch
+            )
+    return count
@@ -0,0 +1,65 @@
+"""TaskSerializer against the fast list path."""
+
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from tasks.models import Task
+from tasks.renderers import FastJSONRenderer
+from tasks.rows import get_row_encoder
+from tasks.serializers import TaskSerializer
+
+from .harness import measure, throughput
+
+
+def run(client, size=10000, repeat=3):
+    Task.objects.all().delete()
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=f"Task {i}",
+                description="Benchmark task " * 4,
+                priority=["low", "medium", "high"][i % 3],
+                completed=i % 2 == 0,
+                sort_order=i,
+            )
+            for i in range(size)
+        ),
+        batch_size=1000,
+    )
+    queryset = Task.objects.order_by("sort_order", "created_at", "id")
+    encoder = get_row_encoder(TaskSerializer)
+    output = {}
+
+    def standard():
+        data = TaskSerializer(queryset.all(), many=True).data
+        output["standard"] = JSONRenderer().render(data)
+
+    def fast():
+        data = encoder.encode(encoder.rows(queryset.all()))
+        output["fast"] = FastJSONRenderer().render(data)
+
+    def endpoint():
+        response = client.get(reverse("tasks-list"), {"all": "true"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Task list returned {response.status_code}")
+
+    standard_times = measure(standard, repeat=repeat)
+    fast_times = measure(fast, repeat=repeat)
+    if output["standard"] != output["fast"]:
+        raise RuntimeError("Fast list output differs from TaskSerializer.")
+
+    results = [
+        throughput("serialization", "serializer", standard_times, size),
+        throughput("serialization", "fast_path", fast_times, size),
+        throughput(
+            "serialization",
+            "list_endpoint",
+            measure(endpoint, None, repeat),
+            size,
+        ),
+    ]
+    results[1]["speedup"] = round(
+        results[0]["median_seconds"] / results[1]["median_seconds"], 1
+    )
+    Task.objects.all().delete()
+    return results
@@ -0,0 +1,214 @@
+"""
+The WSGI and ASGI server modes of ``start.sh`` under concurrent load.
+
+Each mode runs gunicorn with ``config/gunicorn.py`` on the benchmark
+database, with ``WORKERS`` workers, while ``CONCURRENCY`` clients issue
+``REQUESTS * repeat`` requests per case over HTTP. Latencies are per
+request; requests per second is over the wall time of a case. Other
+server settings, such as ``DB_POOL``, are taken from the environment.
+"""
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max, Min
+from django.urls import reverse
+
+from tasks.models import Task
+
+from .harness import latency
+from .seed import clear_tasks, seed_tasks
+
+MODES = ["wsgi", "asgi"]
+WORKERS = 2
+CONCURRENCY = 32
+REQUESTS = 200
+WARMUP = 20
+STARTUP_SECONDS = 30
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_environment(mode, metrics_dir):
+    database = connection.settings_dict
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("DATABASE_URL", "TEST_DATABASE_URL")
+    }
+    env.update(
+        SERVER_MODE=mode,
+        WEB_CONCURRENCY=str(WORKERS),
+        PROMETHEUS_MULTIPROC_DIR=metrics_dir,
+        # Measure the servers themselves, not how much load they shed or
+        # how many responses they reuse.
+        ADMISSION_CONTROL="false",
+        RESPONSE_CACHE="false",
+    )
+    for key in ["NAME", "USER", "PASSWORD", "HOST", "PORT"]:
+        if database[key]:
+            env[f"DB_{key}"] = str(database[key])
+    return env
+
+
+class Server:
+    """Gunicorn in ``mode``, started and stopped as a context manager."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        import httpx
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = open(os.path.join(self.directory.name, "server.log"), "w+")
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "--config",
+                "config/gunicorn.py",
+                "--bind",
+                f"127.0.0.1:{self.port}",
+            ],
+            cwd=settings.BASE_DIR,
+            env=_server_environment(self.mode, self.directory.name),
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + STARTUP_SECONDS
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if httpx.get(self.base_url + reverse("health")).is_success:
+                    return self
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"The {self.mode} server did not start.")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
+        self.log.close()
+        self.directory.cleanup()
+
+
+async def _load(base_url, request, first, count):
+    """Send ``count`` requests from ``CONCURRENCY`` clients."""
+    import httpx
+
+    durations = []
+    numbers = iter(range(first, first + count))
+    # Sync workers close every connection after the response.
+    limits = httpx.Limits(
+        max_connections=CONCURRENCY, max_keepalive_connections=0
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+
+        async def user():
+            for i in numbers:
+                start = time.perf_counter()
+                response = await request(client, i)
+                durations.append(time.perf_counter() - start)
+                if not response.is_success:
+                    raise RuntimeError(
+                        f"{response.request.url} returned "
+                        f"{response.status_code}"
+                    )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+        return durations, time.perf_counter() - start
+
+
+def run(client, size=10000, repeat=3):
+    if connection.vendor != "postgresql":
+        raise RuntimeError("The servers benchmark needs PostgreSQL.")
+    clear_tasks()
+    seed_tasks(size)
+    bounds = Task.objects.aggregate(first=Min("id"), last=Max("id"))
+    rng = random.Random(size)
+    ids = [rng.randint(bounds["first"], bounds["last"]) for _ in range(100)]
+    list_url = reverse("tasks-list")
+
+    cases = [
+        ("list", lambda client, i: client.get(list_url)),
+        (
+            "list_filtered",
+            lambda client, i: client.get(
+                list_url,
+                params={
+                    "priority": "high",
+                    "completed": "false",
+                    "ordering": "due_date",
+                },
+            ),
+        ),
+        (
+            "search",
+            lambda client, i: client.get(
+                list_url, params={"search": "deploy"}
+            ),
+        ),
+        (
+            "retrieve",
+            lambda client, i: client.get(
+                reverse("tasks-detail", kwargs={"pk": ids[i % len(ids)]})
+            ),
+        ),
+        (
+            "create",
+            lambda client, i: client.post(
+                list_url, json={"title": f"New {i}"}
+            ),
+        ),
+    ]
+
+    count = REQUESTS * repeat
+    results = []
+    for mode in MODES:
+        with Server(mode) as server:
+            for name, request in cases:
+                asyncio.run(_load(server.base_url, request, 0, WARMUP))
+                durations, wall = asyncio.run(
+                    _load(server.base_url, request, WARMUP, count)
+                )
+                result = latency("servers", f"{name}_{mode}", durations)
+                result.update(
+                    size=size,
+                    mode=mode,
+                    workers=WORKERS,
+                    concurrency=CONCURRENCY,
+                    requests_per_second=round(count / wall, 1),
+                )
+                results.append(result)
+
+    by_name = {result["name"]: result for result in results}
+    for name, _ in cases:
+        asgi = by_name[f"{name}_asgi"]
+        asgi["speedup"] = round(
+            asgi["requests_per_second"]
+            / by_name[f"{name}_wsgi"]["requests_per_second"],
+            2,
+        )
+    clear_tasks()
+    return results
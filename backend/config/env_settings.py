@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
@@ -25,5 +25,111 @@ class Settings(BaseSettings):
     allowed_hosts: List[str] = []
     cors_allowed_origins: List[str] = []
 
+    # Live task events: tasks.events.LocalBroadcaster for one process,
+    # tasks.events.PostgresBroadcaster to fan out across workers.
+    task_events_broadcaster: str = "tasks.events.LocalBroadcaster"
+
+    # Request timing: fraction of requests instrumented, and the thresholds
+    # above which an instrumented request is logged as slow. Instrumented
+    # responses show their database time to the client.
+    request_timing_sample_rate: float = 0.01
+    request_timing_slow_ms: float = 500.0
+    request_timing_slow_queries: int = 50
+
+    # Admission control (tasks.admission), per worker process. A client
+    # rate of 0 turns off per-client limits; clients are told apart by
+    # address, or by the first address in a header such as
+    # X-Forwarded-For set by a trusted proxy. Concurrency defaults to the
+    # database pool size; queue timeouts are in seconds.
+    admission_control: bool = True
+    admission_client_rate: float = 0.0
+    admission_client_burst: int = 20
+    admission_client_header: Optional[str] = None
+    admission_max_clients: int = 10000
+    admission_max_concurrency: int = 4
+    admission_heavy_share: float = 0.5
+    admission_queue_timeout: float = 2.0
+    admission_heavy_queue_timeout: float = 0.5
+
+    # Admin changelist: tables at least this large get estimated counts
+    # and keyset pages (tasks.admin); cached filter choices expire after
+    # this many seconds.
+    admin_large_table_rows: int = 100000
+    admin_filter_cache_seconds: int = 300
+
+    # Shared cache of rendered task list responses (tasks.response_cache):
+    # a directory the workers on a host share (under /dev/shm to keep it in
+    # memory; by default one in the temporary directory), or a redis://
+    # URL (needs the redis extra). Entries expire after
+    # response_cache_timeout seconds, bodies over response_cache_max_bytes
+    # are not stored, and a worker waits up to response_cache_wait seconds
+    # for another to rebuild an entry before building it itself.
+    response_cache: bool = True
+    response_cache_location: Optional[str] = None
+    response_cache_timeout: int = 300
+    response_cache_max_bytes: int = 4194304
+    response_cache_wait: float = 1.0
+
+    # Compression of API responses (tasks.compression): zstd or brotli
+    # with the compression extra, gzip otherwise. Bodies smaller than
+    # response_compression_min_bytes are sent as they are.
+    response_compression: bool = True
+    response_compression_min_bytes: int = 1024
+
+    # Readiness probe database timeout, in seconds.
+    readiness_db_timeout_seconds: float = 2.0
+
+    # PostgreSQL connection pool of each worker process (psycopg_pool).
+    # Sizes are per worker unless db_pool_total_max_size is set, which is
+    # split between the web_concurrency workers so the total is capped.
+    db_pool: bool = False
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 4
+    db_pool_total_max_size: Optional[int] = None
+    # Seconds a request waits for a free connection before failing.
+    db_pool_timeout: float = 10.0
+    # Check connections with a round trip when they are checked out
+    # (CONN_HEALTH_CHECKS).
+    db_pool_check: bool = True
+    # Seconds before idle connections above min size, and any connection,
+    # are closed.
+    db_pool_max_idle: float = 600.0
+    db_pool_max_lifetime: float = 3600.0
+
+    # Read replica for task list and detail reads, and the seconds a
+    # client that wrote keeps reading from the primary.
+    replica_database_url: Optional[str] = None
+    replica_pin_seconds: int = 5
+
+    # Completed tasks untouched for this many days are moved to the
+    # archive table (tasks.archive), this many per transaction.
+    task_archive_after_days: int = 90
+    task_archive_batch_size: int = 1000
+
+    # Gunicorn worker processes (start.sh).
+    web_concurrency: int = 2
+    # wsgi: synchronous workers. asgi: uvicorn workers, with the task list
+    # and detail routes served by async views (tasks.async_views).
+    server_mode: Literal["wsgi", "asgi"] = "wsgi"
+
+    # Connection pool of the FastAPI read service (main.py), per process.
+    api_pool_min_size: int = 1
+    api_pool_max_size: int = 10
+
+    def db_pool_options(self):
+        """Return the ``ConnectionPool`` arguments of one worker's pool."""
+        max_size = self.db_pool_max_size
+        if self.db_pool_total_max_size is not None:
+            max_size = max(
+                1, self.db_pool_total_max_size // self.web_concurrency
+            )
+        return {
+            "min_size": min(self.db_pool_min_size, max_size),
+            "max_size": max_size,
+            "timeout": self.db_pool_timeout,
+            "max_idle": self.db_pool_max_idle,
+            "max_lifetime": self.db_pool_max_lifetime,
+        }
+
 
 settings = Settings()
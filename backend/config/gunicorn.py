@@ -0,0 +1,29 @@
+"""
+Gunicorn settings.
+
+``SERVER_MODE`` selects the application: ``wsgi`` (default) runs
+synchronous workers over ``config.wsgi``; ``asgi`` runs uvicorn workers
+over ``config.asgi``, where the task API is served by async views.
+``WEB_CONCURRENCY`` sets the number of workers.
+
+Workers write Prometheus metrics to ``PROMETHEUS_MULTIPROC_DIR`` (set and
+emptied by ``start.sh``); files of exited workers are marked dead so
+their in-flight gauges stop counting.
+"""
+
+import os
+
+if os.environ.get("SERVER_MODE", "wsgi") == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "sync"
+
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
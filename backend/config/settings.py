@@ -2,6 +2,7 @@
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 from .env_settings import settings
@@ -15,12 +16,29 @@ DEBUG = settings.debug
 TESTING = "pytest" in sys.modules or "test" in sys.argv
 
 if TESTING:
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": ":memory:",
+    # TEST_DATABASE_URL runs the suite against PostgreSQL, which enables
+    # the Postgres-only query plan tests.
+    test_database_url = os.environ.get("TEST_DATABASE_URL")
+    # "replica" is a second, independent database for the replica routing
+    # tests, created only for the tests that use it.
+    if test_database_url:
+        import dj_database_url
+
+        DATABASES = {
+            alias: dj_database_url.parse(test_database_url)
+            for alias in ["default", "replica"]
+        }
+        DATABASES["replica"]["TEST"] = {
+            "NAME": f"test_{DATABASES['replica']['NAME']}_replica"
+        }
+    else:
+        DATABASES = {
+            alias: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+            for alias in ["default", "replica"]
         }
-    }
 else:
     # Check if DATABASE_URL is provided (Railway/Heroku style)
     database_url = os.environ.get("DATABASE_URL")
@@ -46,6 +64,36 @@ else:
             }
         }
 
+    # Read replica for TaskViewSet reads (tasks.replicas), configured like
+    # the primary.
+    if settings.replica_database_url:
+        import dj_database_url
+
+        DATABASES["replica"] = dj_database_url.parse(
+            settings.replica_database_url,
+            conn_max_age=DATABASES["default"].get("CONN_MAX_AGE", 0),
+        )
+        # Benchmarks and tests create their database on the primary only.
+        DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+for database in DATABASES.values():
+    if settings.server_mode == "asgi":
+        # Requests run their queries on threads of their own, so persistent
+        # connections would pile up, one per thread; use DB_POOL instead.
+        database["CONN_MAX_AGE"] = 0
+
+    if (
+        settings.db_pool
+        and database["ENGINE"] == "django.db.backends.postgresql"
+    ):
+        # Every worker keeps a pool and returns its connection to it at the
+        # end of each request, so connections are not held open by the
+        # worker.
+        database["CONN_MAX_AGE"] = 0
+        # Checks run on checkout from the pool.
+        database["CONN_HEALTH_CHECKS"] = settings.db_pool_check
+        database.setdefault("OPTIONS", {})["pool"] = settings.db_pool_options()
+
 # Allow all hosts if DATABASE_URL is set (Railway environment)
 # Otherwise use configured allowed_hosts
 if os.environ.get("DATABASE_URL"):
@@ -73,6 +121,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so metrics and Server-Timing cover the whole stack.
+    "tasks.middleware.MetricsMiddleware",
+    # Before anything that costs time, so shed requests cost little.
+    "tasks.middleware.AdmissionMiddleware",
+    "tasks.middleware.RequestTimingMiddleware",
+    # Before middleware that reads or changes response bodies.
+    "tasks.middleware.CompressionMiddleware",
+    "tasks.middleware.ReplicaMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -95,6 +151,112 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [],
 }
 
+# Task ordering: rebalance sort_order gaps on a background thread, except
+# under tests where the in-memory database is per-connection.
+TASK_RANK_REBALANCE_ASYNC = not TESTING
+
+# Delta sync: tombstones for deleted tasks are kept this long; older sync
+# tokens get 410 Gone and must resync from scratch.
+TASK_TOMBSTONE_RETENTION_DAYS = 30
+
+# Hot/cold storage (tasks.archive): completed tasks not updated for this
+# many days are moved out of tasks_task by archive_tasks, in batches.
+TASK_ARCHIVE_AFTER_DAYS = settings.task_archive_after_days
+TASK_ARCHIVE_BATCH_SIZE = settings.task_archive_batch_size
+
+# Task admin (tasks.admin): estimated counts and keyset pagination once
+# tasks_task has this many rows, and how long filter choices are cached.
+ADMIN_LARGE_TABLE_ROWS = settings.admin_large_table_rows
+ADMIN_FILTER_CACHE_SECONDS = settings.admin_filter_cache_seconds
+
+# Caches: the default one is per process (admin filter choices);
+# "responses" holds rendered task lists for every worker
+# (tasks.response_cache), in RESPONSE_CACHE_LOCATION, a directory or a
+# redis:// URL. Entries of old task list versions expire after
+# RESPONSE_CACHE_TIMEOUT seconds; bodies over RESPONSE_CACHE_MAX_BYTES are
+# not stored; workers wait RESPONSE_CACHE_WAIT seconds for another's
+# rebuild. Off under tests, which inspect the data of responses; cached
+# responses only have bytes.
+RESPONSE_CACHE = settings.response_cache and not TESTING
+RESPONSE_CACHE_TIMEOUT = settings.response_cache_timeout
+RESPONSE_CACHE_MAX_BYTES = settings.response_cache_max_bytes
+RESPONSE_CACHE_WAIT = settings.response_cache_wait
+
+response_cache_location = settings.response_cache_location or os.path.join(
+    tempfile.gettempdir(), "taskflow-responses"
+)
+if TESTING:
+    responses_cache = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "responses",
+    }
+elif response_cache_location.startswith(("redis://", "rediss://")):
+    responses_cache = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": response_cache_location,
+    }
+else:
+    responses_cache = {
+        "BACKEND": "tasks.response_cache.FileCache",
+        "LOCATION": response_cache_location,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": responses_cache,
+}
+
+# Response compression (tasks.compression): negotiated from
+# Accept-Encoding for API responses of at least
+# RESPONSE_COMPRESSION_MIN_BYTES.
+RESPONSE_COMPRESSION = settings.response_compression
+RESPONSE_COMPRESSION_MIN_BYTES = settings.response_compression_min_bytes
+
+# Live task events (Server-Sent Events, served over ASGI).
+TASK_EVENTS_BROADCASTER = settings.task_events_broadcaster
+TASK_EVENTS_HEARTBEAT_SECONDS = 15
+
+# Admission control (tasks.admission), per worker process: client token
+# buckets (requests per second and burst; a rate of 0 disables them),
+# keyed by REMOTE_ADDR or the first address in ADMISSION_CLIENT_HEADER,
+# and the requests served at once, of which heavy reads may hold
+# ADMISSION_HEAVY_SHARE. Requests waiting longer than their queue
+# timeout, in seconds, get 503.
+ADMISSION_CONTROL = settings.admission_control
+ADMISSION_CLIENT_RATE = settings.admission_client_rate
+ADMISSION_CLIENT_BURST = settings.admission_client_burst
+ADMISSION_CLIENT_HEADER = settings.admission_client_header
+ADMISSION_MAX_CLIENTS = settings.admission_max_clients
+ADMISSION_MAX_CONCURRENCY = settings.admission_max_concurrency
+ADMISSION_HEAVY_SHARE = settings.admission_heavy_share
+ADMISSION_QUEUE_TIMEOUT = settings.admission_queue_timeout
+ADMISSION_HEAVY_QUEUE_TIMEOUT = settings.admission_heavy_queue_timeout
+
+# Per-request Server-Timing headers and the slow-request log
+# (tasks.middleware).
+REQUEST_TIMING_SAMPLE_RATE = settings.request_timing_sample_rate
+REQUEST_TIMING_SLOW_MS = settings.request_timing_slow_ms
+REQUEST_TIMING_SLOW_QUERIES = settings.request_timing_slow_queries
+
+# Read replica routing (tasks.replicas): the alias that safe TaskViewSet
+# reads use, if any, and how long a client that wrote reads from the
+# primary.
+REPLICA_DATABASE = (
+    "replica" if settings.replica_database_url and not TESTING else None
+)
+REPLICA_PIN_SECONDS = settings.replica_pin_seconds
+DATABASE_ROUTERS = ["tasks.replicas.ReplicaRouter"]
+
+# Route the task API to async views (tasks.async_urls) in ASGI workers.
+ASYNC_TASK_VIEWS = settings.server_mode == "asgi"
+
+# Readiness probe (/api/ready/): seconds allowed to connect to the
+# database, and again to answer.
+READINESS_DB_TIMEOUT_SECONDS = settings.readiness_db_timeout_seconds
+
 ROOT_URLCONF = "config.urls"
 
 # Disable trailing slash redirects to work with Next.js
@@ -15,10 +15,16 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/", include("tasks.urls")),
+    path(
+        "api/",
+        include(
+            "tasks.async_urls" if settings.ASYNC_TASK_VIEWS else "tasks.urls"
+        ),
+    ),
 ]
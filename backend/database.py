@@ -0,0 +1,56 @@
+"""
+Async PostgreSQL connection pool for the FastAPI read service.
+
+Connection parameters come from Django's ``DATABASES`` so both services
+always point at the same database.
+"""
+
+from contextlib import asynccontextmanager
+
+from django.db import connections
+from fastapi import FastAPI, Request
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from config.env_settings import settings
+
+
+def conninfo(alias="default"):
+    """Build a libpq connection string from a Django database alias."""
+    database = connections[alias].settings_dict
+    params = {
+        "dbname": database["NAME"],
+        "user": database.get("USER"),
+        "password": database.get("PASSWORD"),
+        "host": database.get("HOST"),
+        "port": database.get("PORT"),
+    }
+    return make_conninfo(
+        **{key: value for key, value in params.items() if value}
+    )
+
+
+def create_pool(alias="default"):
+    # Reads only: autocommit saves a BEGIN/COMMIT round trip per request,
+    # and UTC sessions return timestamps in the form DRF renders them.
+    return AsyncConnectionPool(
+        conninfo(alias),
+        min_size=settings.api_pool_min_size,
+        max_size=settings.api_pool_max_size,
+        kwargs={"autocommit": True, "options": "-c TimeZone=UTC"},
+        open=False,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.pool = create_pool()
+    await app.state.pool.open(wait=True)
+    try:
+        yield
+    finally:
+        await app.state.pool.close()
+
+
+def get_pool(request: Request) -> AsyncConnectionPool:
+    return request.app.state.pool
@@ -1,7 +1,23 @@
-from fastapi import FastAPI
+"""
+FastAPI read service for hot task endpoints.
 
-from .routers import tasks
+Serves list, retrieve and delta sync reads straight from ``tasks_task``
+through an async psycopg pool; writes stay in the Django application.
+Run with ``uvicorn main:app`` from this directory.
+"""
 
-app = FastAPI(title="TaskFlow API")
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from fastapi import FastAPI  # noqa: E402
+
+from database import lifespan  # noqa: E402
+from routers import tasks  # noqa: E402
+
+app = FastAPI(title="TaskFlow API", lifespan=lifespan)
 
 app.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
@@ -0,0 +1,272 @@
+"""
+Hot task reads (list, retrieve, delta sync) served from ``tasks_task``.
+
+The responses, filters, orderings and cursors match the DRF
+``TaskViewSet``, so a client can page with cursors from either service.
+Writes stay in Django.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from database import get_pool
+from schemas import Task, TaskChanges, TaskPage
+from tasks.filters import PRIORITIES, TASK_ORDERINGS
+from tasks.pagination import TaskCursorPagination
+from tasks.search import SEARCH_CONFIG
+from tasks.sync import (
+    SyncTokenError,
+    SyncTokenExpired,
+    encode_token,
+    sync_start,
+)
+
+router = APIRouter()
+
+COLUMNS = ", ".join(Task.model_fields)
+
+TSQUERY = f"websearch_to_tsquery('{SEARCH_CONFIG}', %(search)s)"
+
+# SQL for each ordering key; ``due_key`` matches the expression indexed
+# by ``task_due_order_idx``.
+ORDER_EXPRESSIONS = {
+    "sort_order": "sort_order",
+    "created_at": "created_at",
+    "id": "id",
+    "due_key": "COALESCE(due_date, '9999-12-31'::date)",
+    "search_rank": f"ts_rank(search_vector, {TSQUERY})::float8",
+}
+
+# Parse a cursor value the way the model field's ``to_python`` would.
+CURSOR_PARSERS = {
+    "sort_order": int,
+    "id": int,
+    "created_at": datetime.datetime.fromisoformat,
+    "due_key": datetime.date.fromisoformat,
+    "search_rank": float,
+}
+
+Ordering = Literal[tuple(TASK_ORDERINGS)]
+
+
+def _bad_request(name, message):
+    return HTTPException(status_code=400, detail={name: [message]})
+
+
+def _decode_cursor(token, ordering):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        values = payload["v"]
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError(values)
+        parsed = []
+        for key, value in zip(ordering, values):
+            if not isinstance(value, (str, int, float)):
+                raise ValueError(value)
+            parsed.append(CURSOR_PARSERS[key.field](value))
+        return parsed, bool(payload.get("r"))
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=404,
+            detail=TaskCursorPagination.invalid_cursor_message,
+        )
+
+
+def _cursor_link(request, row, ordering, reverse):
+    payload = {"v": [row[key.field] for key in ordering]}
+    if reverse:
+        payload["r"] = 1
+    raw = json.dumps(payload, default=str, separators=(",", ":"))
+    token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+    return str(request.url.include_query_params(cursor=token))
+
+
+def _keyset_condition(ordering, values, reverse, params):
+    """SQL for rows strictly after ``values``; see ``keyset_filter``."""
+    alternatives = []
+    equal = []
+    for index, (key, value) in enumerate(zip(ordering, values)):
+        name = f"cursor_{index}"
+        params[name] = value
+        column = ORDER_EXPRESSIONS[key.field]
+        operator = "<" if key.descending != reverse else ">"
+        alternatives.append(
+            " AND ".join([*equal, f"{column} {operator} %({name})s"])
+        )
+        equal.append(f"{column} = %({name})s")
+    first = ordering[0]
+    bound = "<=" if first.descending != reverse else ">="
+    return (
+        f"{ORDER_EXPRESSIONS[first.field]} {bound} %(cursor_0)s "
+        f"AND ({' OR '.join(f'({clause})' for clause in alternatives)})"
+    )
+
+
+def _order_by(ordering, reverse=False):
+    return ", ".join(
+        ORDER_EXPRESSIONS[key.field]
+        + (" DESC" if key.descending != reverse else " ASC")
+        for key in ordering
+    )
+
+
+@router.get("", response_model=Union[TaskPage, List[Task]])
+async def list_tasks(
+    request: Request,
+    priority: Optional[str] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime.date] = None,
+    due_before: Optional[datetime.date] = None,
+    search: str = "",
+    ordering: Optional[Ordering] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    all_: bool = Query(False, alias="all"),
+    pool: AsyncConnectionPool = Depends(get_pool),
+):
+    """List tasks like ``GET /api/tasks`` on the Django service."""
+    conditions = []
+    params = {}
+    if priority:
+        priorities = priority.split(",")
+        unknown = set(priorities) - PRIORITIES
+        if unknown:
+            raise _bad_request(
+                "priority", f"Unknown priority: {sorted(unknown)}."
+            )
+        conditions.append("priority = ANY(%(priority)s)")
+        params["priority"] = priorities
+    if completed is not None:
+        conditions.append("completed = %(completed)s")
+        params["completed"] = completed
+    if due_after:
+        conditions.append("due_date >= %(due_after)s")
+        params["due_after"] = due_after
+    if due_before:
+        conditions.append("due_date <= %(due_before)s")
+        params["due_before"] = due_before
+    search = search.strip()
+    if search:
+        conditions.append(f"search_vector @@ {TSQUERY}")
+        params["search"] = search
+    ordering = ordering or ("rank" if search else "position")
+    if ordering == "rank" and not search:
+        raise _bad_request("ordering", "Ordering by rank requires search.")
+    ordering = TASK_ORDERINGS[ordering]
+
+    keys = "".join(
+        f", {ORDER_EXPRESSIONS[key.field]} AS {key.field}"
+        for key in ordering
+        if key.field not in Task.model_fields
+    )
+    if all_:
+        where = " AND ".join(conditions) or "TRUE"
+        query = (
+            f"SELECT {COLUMNS} FROM tasks_task WHERE {where} "
+            f"ORDER BY {_order_by(ordering)}"
+        )
+        async with pool.connection() as connection:
+            cur = connection.cursor(row_factory=dict_row)
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+    if page_size is None or page_size <= 0:
+        page_size = TaskCursorPagination.page_size
+    page_size = min(page_size, TaskCursorPagination.max_page_size)
+    values, reverse = None, False
+    if cursor:
+        values, reverse = _decode_cursor(cursor, ordering)
+        conditions.append(_keyset_condition(ordering, values, reverse, params))
+    where = " AND ".join(conditions) or "TRUE"
+    query = (
+        f"SELECT {COLUMNS}{keys} FROM tasks_task WHERE {where} "
+        f"ORDER BY {_order_by(ordering, reverse)} LIMIT {page_size + 1}"
+    )
+    async with pool.connection() as connection:
+        cur = connection.cursor(row_factory=dict_row)
+        await cur.execute(query, params)
+        rows = await cur.fetchall()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+    has_next = has_more if not reverse else values is not None
+    has_previous = values is not None if not reverse else has_more
+
+    next_link = previous_link = None
+    if has_next and rows:
+        next_link = _cursor_link(request, rows[-1], ordering, False)
+    if has_previous:
+        if rows:
+            previous_link = _cursor_link(request, rows[0], ordering, True)
+        else:
+            previous_link = str(request.url.remove_query_params("cursor"))
+    return {"next": next_link, "previous": previous_link, "results": rows}
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def task_changes(
+    since: Optional[str] = None,
+    pool: AsyncConnectionPool = Depends(get_pool),
+):
+    """Delta sync like ``GET /api/tasks/changes``."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with pool.connection() as connection:
+        cur = connection.cursor(row_factory=dict_row)
+        if not since:
+            await cur.execute(
+                f"SELECT {COLUMNS} FROM tasks_task "
+                "ORDER BY sort_order, created_at, id"
+            )
+            changed = await cur.fetchall()
+            return {
+                "token": encode_token(now),
+                "changed": changed,
+                "deleted": [],
+            }
+
+        try:
+            params = {"since": sync_start(since, now)}
+        except SyncTokenExpired as exc:
+            raise HTTPException(status_code=410, detail=str(exc))
+        except SyncTokenError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        await cur.execute(
+            f"SELECT {COLUMNS} FROM tasks_task "
+            "WHERE updated_at > %(since)s ORDER BY updated_at, id",
+            params,
+        )
+        changed = await cur.fetchall()
+        await cur.execute(
+            "SELECT DISTINCT task_id FROM tasks_tasktombstone "
+            "WHERE deleted_at > %(since)s ORDER BY task_id",
+            params,
+        )
+        deleted = [row["task_id"] for row in await cur.fetchall()]
+    return {"token": encode_token(now), "changed": changed, "deleted": deleted}
+
+
+@router.get("/{task_id}", response_model=Task)
+async def get_task(
+    task_id: int, pool: AsyncConnectionPool = Depends(get_pool)
+):
+    async with pool.connection() as connection:
+        cur = connection.cursor(row_factory=dict_row)
+        await cur.execute(
+            f"SELECT {COLUMNS} FROM tasks_task WHERE id = %s", [task_id]
+        )
+        row = await cur.fetchone()
+    if row is None:
+        raise HTTPException(
+            status_code=404, detail="No Task matches the given query."
+        )
+    return row
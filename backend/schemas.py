@@ -0,0 +1,33 @@
+"""Pydantic response models for the FastAPI read service."""
+
+import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class Task(BaseModel):
+    """A task, with the fields and order ``TaskSerializer`` renders."""
+
+    id: int
+    title: str
+    description: str
+    priority: Literal["low", "medium", "high"]
+    due_date: Optional[datetime.date]
+    completed: bool
+    sort_order: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    version: int
+
+
+class TaskPage(BaseModel):
+    next: Optional[str]
+    previous: Optional[str]
+    results: List[Task]
+
+
+class TaskChanges(BaseModel):
+    token: str
+    changed: List[Task]
+    deleted: List[int]
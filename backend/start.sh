@@ -3,15 +3,24 @@ set -e
 
 echo "=== Starting Django Application ==="
 echo "PORT: ${PORT:-8000}"
+echo "SERVER_MODE: ${SERVER_MODE:-wsgi}"
 echo "DATABASE_URL: ${DATABASE_URL:0:30}..."
 
 echo "=== Running Migrations ==="
 python manage.py migrate
 
+# Workers share Prometheus metrics through files in this directory; stale
+# files from a previous run would be summed in.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 echo "=== Starting Gunicorn ==="
-exec gunicorn config.wsgi:application \
+# config/gunicorn.py picks the application and worker class from
+# SERVER_MODE (wsgi or asgi) and the worker count from WEB_CONCURRENCY.
+exec gunicorn \
+    --config config/gunicorn.py \
     --bind 0.0.0.0:${PORT:-8000} \
-    --workers 2 \
     --log-level debug \
     --access-logfile - \
     --error-logfile - \
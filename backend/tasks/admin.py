@@ -1,15 +1,290 @@
+"""
+Admin for tasks, kept fast on tables of millions of rows.
+
+Once ``tasks_task`` holds ``ADMIN_LARGE_TABLE_ROWS`` rows or more (the
+planner's estimate on PostgreSQL, see ``tasks.estimates``), the changelist
+switches to a mode that never reads more than a page of tasks:
+
+- counts are planner estimates, exact only below the threshold;
+- the default ordering, newest first, is paginated by keyset: "Next
+  page" links carry the id of the last task shown rather than a page
+  number, so every page is an index range scan;
+- search results come newest first instead of by rank, which would mean
+  ranking every match.
+
+In both modes the due month filter's choices are cached for
+``ADMIN_FILTER_CACHE_SECONDS`` and found with one index probe per month,
+facet counts are off, and the "completed" actions mark a selection with
+one ``UPDATE``.
+"""
+
+import calendar
+import datetime
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from tasks.estimates import estimate_count, table_rows
 from tasks.models import Task
+from tasks.search import search_tasks
+from tasks.signals import CREATED, DELETED, UPDATED, tasks_changed
+
+# Query string parameter of keyset pages: the id the page starts below.
+CURSOR_VAR = "cursor"
+
+DUE_MONTHS_CACHE_KEY = "tasks.admin.due_months"
+
+
+def _next_month(month):
+    return month + datetime.timedelta(
+        days=calendar.monthrange(month.year, month.month)[1]
+    )
+
+
+def due_months():
+    """
+    Return the first day of every month some task is due in, finding
+    each with a single probe of the due date index rather than scanning
+    the tasks.
+    """
+    months = []
+    first = Task.objects.aggregate(first=Min("due_date"))["first"]
+    while first is not None:
+        months.append(first.replace(day=1))
+        first = Task.objects.filter(
+            due_date__gte=_next_month(months[-1])
+        ).aggregate(first=Min("due_date"))["first"]
+    return months
+
+
+class DueMonthFilter(admin.SimpleListFilter):
+    """Tasks due in a month, from a cached list of months."""
+
+    title = "due month"
+    parameter_name = "due_month"
+
+    def lookups(self, request, model_admin):
+        months = cache.get_or_set(
+            DUE_MONTHS_CACHE_KEY,
+            due_months,
+            settings.ADMIN_FILTER_CACHE_SECONDS,
+        )
+        return [
+            (month.strftime("%Y-%m"), month.strftime("%B %Y"))
+            for month in reversed(months)
+        ]
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            month = datetime.datetime.strptime(self.value(), "%Y-%m").date()
+        except ValueError as exc:
+            raise IncorrectLookupParameters(exc)
+        return queryset.filter(
+            due_date__gte=month, due_date__lt=_next_month(month)
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Counts by planner estimate at or above ``estimate_above`` rows."""
+
+    def __init__(self, *args, estimate_above=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimate_above = estimate_above
+        self.estimated = False
+
+    @cached_property
+    def count(self):
+        if self.estimate_above is not None:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_above:
+                self.estimated = True
+                return estimate
+        return super().count
+
+
+class TaskChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.large = table_rows(Task) >= settings.ADMIN_LARGE_TABLE_ROWS
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Links that change the filters or ordering start from the top.
+        if CURSOR_VAR not in (new_params or {}):
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        # Best matches first unless a column header was clicked. The rank
+        # only exists once the search has been applied, after ordering.
+        if (
+            "search_rank" in queryset.query.annotations
+            and ORDER_VAR not in self.params
+            and not self.large
+        ):
+            queryset = queryset.order_by("-search_rank", "-pk")
+        return queryset
+
+    @property
+    def keyset(self):
+        """Whether pages are fetched by keyset rather than by number."""
+        return self.large and self.queryset.query.order_by == ("-pk",)
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(
+            request,
+            self.queryset,
+            self.list_per_page,
+            estimate_above=(
+                settings.ADMIN_LARGE_TABLE_ROWS if self.large else None
+            ),
+        )
+        self.result_count = paginator.count
+        self.estimated_count = paginator.estimated
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.paginator = paginator
+        self.next_page_url = None
+        if self.keyset:
+            self.can_show_all = False
+            self.result_list = self.get_keyset_page()
+            self.multi_page = bool(self.cursor or self.next_page_url)
+            return
+        self.can_show_all = self.result_count <= self.list_max_show_all
+        self.multi_page = self.result_count > self.list_per_page
+        if (self.show_all and self.can_show_all) or not self.multi_page:
+            self.result_list = self.queryset._clone()
+        else:
+            try:
+                self.result_list = paginator.page(self.page_num).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+
+    def get_keyset_page(self):
+        queryset = self.queryset
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(pk__lt=int(self.cursor))
+            except ValueError as exc:
+                raise IncorrectLookupParameters(exc)
+        rows = list(queryset[: self.list_per_page + 1])
+        if len(rows) > self.list_per_page:
+            rows = rows[: self.list_per_page]
+            self.next_page_url = self.get_query_string(
+                {CURSOR_VAR: rows[-1].pk}
+            )
+        return rows
 
 
 class TaskAdmin(admin.ModelAdmin):
     list_display = ("title", "priority", "due_date", "completed", "created_at")
-    list_filter = ("priority", "completed", "created_at", "due_date")
+    list_filter = (
+        "priority",
+        "completed",
+        "created_at",
+        "due_date",
+        DueMonthFilter,
+    )
     search_fields = ("title", "description")
-    list_editable = ("completed",)
-    readonly_fields = ("created_at",)
-    date_hierarchy = "due_date"
+    readonly_fields = ("created_at", "updated_at", "version")
+    actions = ["mark_completed", "mark_open"]
+    # Each of these would count tasks on every page load.
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text search through the index instead of icontains scans.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return search_tasks(queryset, search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return TaskChangeList
+
+    def get_paginator(
+        self,
+        request,
+        queryset,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        estimate_above=None,
+    ):
+        return EstimatedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            estimate_above=estimate_above,
+        )
+
+    @transaction.atomic
+    def _set_completed(self, request, queryset, completed):
+        changed = queryset.exclude(completed=completed)
+        # Only a page of tasks can be selected one by one.
+        select_across = request.POST.get("select_across") == "1"
+        ids = (
+            None
+            if select_across
+            else list(changed.values_list("id", flat=True))
+        )
+        count = changed.update(
+            completed=completed,
+            updated_at=timezone.now(),
+            version=F("version") + 1,
+        )
+        if count:
+            tasks_changed.send(sender=Task, action=UPDATED, ids=ids)
+        state = "completed" if completed else "open"
+        self.message_user(request, f"Marked {count} task(s) as {state}.")
+
+    @admin.action(description="Mark selected tasks as completed")
+    def mark_completed(self, request, queryset):
+        self._set_completed(request, queryset, True)
+
+    @admin.action(description="Mark selected tasks as open")
+    def mark_open(self, request, queryset):
+        self._set_completed(request, queryset, False)
+
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        if change:
+            obj.version = F("version") + 1
+        super().save_model(request, obj, form, change)
+        if change:
+            obj.refresh_from_db(fields=["version"])
+        action = UPDATED if change else CREATED
+        tasks_changed.send(sender=Task, action=action, ids=[obj.id])
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        task_id = obj.id
+        super().delete_model(request, obj)
+        tasks_changed.send(sender=Task, action=DELETED, ids=[task_id])
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        ids = list(queryset.values_list("id", flat=True))
+        super().delete_queryset(request, queryset)
+        tasks_changed.send(sender=Task, action=DELETED, ids=ids)
 
 
 admin.site.register(Task, TaskAdmin)
@@ -0,0 +1,259 @@
+"""
+Admission control: turn overload away early instead of queueing it.
+
+Every request gets a priority class. Health, readiness and metrics are
+``CRITICAL`` and always admitted, so probes keep answering under load.
+Writes come next, then reads, then ``HEAVY`` reads such as the task list
+(``HEAVY_ROUTES``). ``AdmissionMiddleware`` then applies, per worker
+process:
+
+- a token bucket per client (``ADMISSION_CLIENT_RATE`` requests per
+  second, bursts of ``ADMISSION_CLIENT_BURST``): over it is ``429``;
+- a queue deadline: a request that a proxy stamped with
+  ``X-Request-Start`` and that already waited longer than its class may
+  (``ADMISSION_QUEUE_TIMEOUT``, ``ADMISSION_HEAVY_QUEUE_TIMEOUT``) is
+  ``503``, since its client has likely given up;
+- a concurrency limit (``ADMISSION_MAX_CONCURRENCY`` requests, of which
+  heavy reads may hold ``ADMISSION_HEAVY_SHARE``). Requests beyond it wait
+  for a slot, higher classes first, until their deadline; if the queue
+  ahead and recent service times say the wait would be longer, they are
+  ``503`` at once.
+
+Rejections carry ``Retry-After``. Decisions are counted in
+``admission_decisions_total`` (``tasks.monitoring``).
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+from collections import OrderedDict
+
+from django.urls import Resolver404, resolve
+
+CRITICAL, WRITE, READ, HEAVY = range(4)
+PRIORITY_NAMES = ["critical", "write", "read", "heavy"]
+
+CRITICAL_ROUTES = {"health", "ready", "metrics"}
+HEAVY_ROUTES = {
+    "tasks-list",
+    "tasks-export",
+    "tasks-changes",
+    "archived-tasks-list",
+}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Weight of the latest request in the running mean service time.
+SERVICE_TIME_WEIGHT = 0.1
+
+
+def classify(request):
+    """
+    Return the priority class of ``request``. Sets ``resolver_match``,
+    so requests turned away are still labelled by route.
+    """
+    try:
+        match = resolve(request.path_info, getattr(request, "urlconf", None))
+    except Resolver404:
+        match = None
+    request.resolver_match = match
+    name = match.view_name if match else None
+    if name in CRITICAL_ROUTES:
+        return CRITICAL
+    if request.method not in SAFE_METHODS:
+        return WRITE
+    if name in HEAVY_ROUTES:
+        return HEAVY
+    return READ
+
+
+def queue_time(request, now):
+    """
+    Return the seconds ``request`` waited before reaching the worker, from
+    an ``X-Request-Start`` header in seconds, milliseconds or microseconds
+    (``t=`` prefixed or not), or None without one.
+    """
+    value = request.headers.get("X-Request-Start", "")
+    try:
+        start = float(value.removeprefix("t="))
+    except ValueError:
+        return None
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+    return max(now - start, 0.0)
+
+
+class RateLimiter:
+    """
+    Token buckets for up to ``max_clients`` clients, least recently seen
+    dropped first.
+    """
+
+    def __init__(self, rate, burst, max_clients):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def acquire(self, client, now):
+        """
+        Take a token for ``client``; return 0, or the seconds until one is
+        available if there is none.
+        """
+        with self.lock:
+            tokens, last = self.buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self.buckets[client] = (tokens, now)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+            return wait
+
+
+class _Waiter:
+    __slots__ = ("priority", "granted", "wake")
+
+    def __init__(self, priority, wake):
+        self.priority = priority
+        self.granted = False
+        self.wake = wake
+
+
+class ConcurrencyLimiter:
+    """
+    At most ``limit`` requests at once, ``heavy_limit`` of them ``HEAVY``.
+    Freed slots go to waiting requests by class, then arrival.
+
+    ``acquire`` returns ``(decision, wait)``: ``"admitted"`` or
+    ``"queued"`` once a slot is held, ``"overloaded"`` if the estimated
+    wait was over the timeout or ``"timed_out"`` if it ran out, with
+    ``wait`` the estimated wait in seconds. ``depth``, a gauge, follows
+    the number of waiting requests.
+    """
+
+    def __init__(self, limit, heavy_limit, depth=None):
+        self.limit = limit
+        self.heavy_limit = heavy_limit
+        self.depth = depth
+        self.active = 0
+        self.heavy_active = 0
+        self.waiting = []
+        self.order = itertools.count()
+        self.service_time = 0.0
+        self.lock = threading.Lock()
+
+    def _fits(self, priority):
+        return self.active < self.limit and (
+            priority != HEAVY or self.heavy_active < self.heavy_limit
+        )
+
+    def _take(self, priority):
+        self.active += 1
+        if priority == HEAVY:
+            self.heavy_active += 1
+
+    def _changed(self):
+        if self.depth is not None:
+            self.depth.set(len(self.waiting))
+
+    def expected_wait(self, priority):
+        """Estimate how long a new request of ``priority`` would wait."""
+        ahead = sum(1 for entry in self.waiting if entry[0] <= priority)
+        slots = self.heavy_limit if priority == HEAVY else self.limit
+        return (ahead + 1) * self.service_time / max(slots, 1)
+
+    def _enqueue(self, priority, timeout, wake):
+        # Requests only overtake waiting ones of lower classes.
+        if self._fits(priority) and not (
+            self.waiting and self.waiting[0][0] <= priority
+        ):
+            self._take(priority)
+            return "admitted", 0.0
+        wait = self.expected_wait(priority)
+        if wait > timeout:
+            return "overloaded", wait
+        waiter = _Waiter(priority, wake)
+        heapq.heappush(self.waiting, (priority, next(self.order), waiter))
+        self._changed()
+        return waiter, wait
+
+    def _leave(self, waiter):
+        if waiter.granted:
+            return "queued", 0.0
+        self.waiting = [
+            entry for entry in self.waiting if entry[2] is not waiter
+        ]
+        heapq.heapify(self.waiting)
+        self._changed()
+        return "timed_out", self.expected_wait(waiter.priority)
+
+    def acquire(self, priority, timeout):
+        """Wait up to ``timeout`` seconds for a slot."""
+        event = threading.Event()
+        with self.lock:
+            waiter, wait = self._enqueue(priority, timeout, event.set)
+        if not isinstance(waiter, _Waiter):
+            return waiter, wait
+        event.wait(timeout)
+        with self.lock:
+            return self._leave(waiter)
+
+    async def aacquire(self, priority, timeout):
+        """``acquire`` for async requests, waiting on the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            # Slots are released from any thread.
+            loop.call_soon_threadsafe(
+                lambda: future.done() or future.set_result(None)
+            )
+
+        with self.lock:
+            waiter, wait = self._enqueue(priority, timeout, wake)
+        if not isinstance(waiter, _Waiter):
+            return waiter, wait
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self.lock:
+            return self._leave(waiter)
+
+    def release(self, priority, duration):
+        """Free a slot held for ``duration`` seconds and hand it on."""
+        with self.lock:
+            self.service_time += SERVICE_TIME_WEIGHT * (
+                duration - self.service_time
+            )
+            self.active -= 1
+            if priority == HEAVY:
+                self.heavy_active -= 1
+            skipped = []
+            while self.waiting and self.active < self.limit:
+                entry = heapq.heappop(self.waiting)
+                waiter = entry[2]
+                if not self._fits(waiter.priority):
+                    # A heavy read while heavy reads hold their share.
+                    skipped.append(entry)
+                    continue
+                self._take(waiter.priority)
+                waiter.granted = True
+                waiter.wake()
+            for entry in skipped:
+                heapq.heappush(self.waiting, entry)
+            self._changed()
+
+
+def retry_after(seconds):
+    """``Retry-After`` value for a wait of ``seconds``: whole, at least 1."""
+    return str(max(1, math.ceil(seconds)))
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        from . import (  # noqa: F401
+            events,
+            monitoring,
+            search,
+            stats,
+            sync,
+            versions,
+        )
@@ -0,0 +1,141 @@
+"""
+Hot/cold storage for completed tasks.
+
+Completed tasks not updated for ``TASK_ARCHIVE_AFTER_DAYS`` are moved from
+``tasks_task`` into ``ArchivedTask`` by ``python manage.py archive_tasks``,
+so the task list, its indexes and every query on it only see tasks that
+are still in use. Tasks move ``TASK_ARCHIVE_BATCH_SIZE`` at a time, each
+batch in its own short transaction, so a pass can run alongside traffic;
+on PostgreSQL a batch is a single statement that skips rows locked by
+other writers.
+
+Archived tasks leave the list the way deleted ones do, with tombstones
+for delta sync. They keep their ids and fields, are served by
+``/api/tasks/archive`` and can be restored to the list.
+"""
+
+import datetime
+import time
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from .models import ArchivedTask, Task, TaskTombstone
+from .signals import ARCHIVED, CREATED, tasks_changed
+
+# The columns an archived task copies from its task.
+_COLUMNS = [
+    field.column
+    for field in ArchivedTask._meta.concrete_fields
+    if field.name != "archived_at"
+]
+
+
+def archive_cutoff(now=None):
+    """Return the time before which completed tasks are archived."""
+    now = now or timezone.now()
+    return now - datetime.timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+
+
+def _move_postgresql(using, cutoff, batch_size, now):
+    columns = ", ".join(_COLUMNS)
+    moved = ", ".join(f"tasks_task.{column}" for column in _COLUMNS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH batch AS (
+                SELECT id FROM tasks_task
+                WHERE completed AND updated_at < %s
+                ORDER BY updated_at, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ), moved AS (
+                DELETE FROM tasks_task USING batch
+                WHERE tasks_task.id = batch.id
+                RETURNING {moved}
+            )
+            INSERT INTO tasks_archivedtask ({columns}, archived_at)
+            SELECT {columns}, %s FROM moved
+            RETURNING id
+            """,
+            [cutoff, batch_size, now],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _move(using, cutoff, batch_size, now):
+    ids = list(
+        Task.objects.using(using)
+        .filter(completed=True, updated_at__lt=cutoff)
+        .order_by("updated_at", "id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    tasks = Task.objects.using(using).filter(id__in=ids)
+    ArchivedTask.objects.using(using).bulk_create(
+        ArchivedTask(**values, archived_at=now)
+        for values in tasks.values(*_COLUMNS)
+    )
+    tasks.delete()
+    return ids
+
+
+def archive_batch(cutoff, batch_size=None, using="default"):
+    """
+    Move up to ``batch_size`` completed tasks last updated before
+    ``cutoff`` to the archive, oldest first; returns their ids.
+    """
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    move = (
+        _move_postgresql
+        if connections[using].vendor == "postgresql"
+        else _move
+    )
+    with transaction.atomic(using=using):
+        ids = move(using, cutoff, batch_size, timezone.now())
+        if ids:
+            tasks_changed.send(sender=Task, action=ARCHIVED, ids=ids)
+    return ids
+
+
+def archive_tasks(
+    cutoff=None, batch_size=None, pause=0.0, max_batches=None, using="default"
+):
+    """
+    Archive every task due for it, a batch at a time, sleeping ``pause``
+    seconds between batches. Returns ``(tasks, batches)`` moved.
+    """
+    cutoff = cutoff or archive_cutoff()
+    count = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = archive_batch(cutoff, batch_size, using)
+        if not ids:
+            break
+        count += len(ids)
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return count, batches
+
+
+@transaction.atomic
+def restore_task(task_id):
+    """
+    Move an archived task back to the task list and return it.
+
+    It is stamped as updated now, so delta sync reports it again. Raises
+    ``ArchivedTask.DoesNotExist`` if there is no such archived task.
+    """
+    archived = ArchivedTask.objects.select_for_update().get(id=task_id)
+    columns = [column for column in _COLUMNS if column != "updated_at"]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO tasks_task ({', '.join(columns)}, updated_at) "
+            f"SELECT {', '.join(columns)}, %s FROM tasks_archivedtask "
+            "WHERE id = %s",
+            [timezone.now(), task_id],
+        )
+    archived.delete()
+    TaskTombstone.objects.filter(task_id=task_id).delete()
+    tasks_changed.send(sender=Task, action=CREATED, ids=[task_id])
+    return Task.objects.get(id=task_id)
@@ -0,0 +1,16 @@
+"""
+Task API routes for ``SERVER_MODE=asgi``: the async views first, then
+every route of ``tasks.urls`` for the actions they do not cover.
+"""
+
+from django.urls import path
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("tasks", async_views.task_list, name="tasks-list"),
+    path("tasks/changes", async_views.task_changes, name="tasks-changes"),
+    path("tasks/<int:pk>", async_views.task_detail, name="tasks-detail"),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,254 @@
+"""
+Async equivalents of the ``TaskViewSet`` actions clients call most.
+
+With ``SERVER_MODE=asgi`` (see ``start.sh``) the task list, detail and
+``changes`` routes are served from here (``tasks.async_urls``); the
+remaining actions are the DRF views, which Django runs on a thread.
+Requests and responses are negotiated from ``TaskViewSet``'s parsers and
+renderers, so both server modes speak JSON and MessagePack alike and
+responses match the DRF views'; the browsable API is not offered.
+
+Reads use the async ORM, so a worker keeps serving other requests while
+their queries run. The async ORM has no transactions yet, so writes run
+the same transactional code as ``TaskViewSet`` on a thread.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotFound
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .fieldsets import list_fields, list_serializer_class
+from .models import Task
+from .response_cache import (
+    CACHED_FORMATS,
+    Entry,
+    aget_or_build,
+    list_key,
+    to_response,
+)
+from .rows import get_row_encoder
+from .serializers import TaskSerializer
+from .signals import CREATED, DELETED, tasks_changed
+from .sync import SyncTokenError, SyncTokenExpired, changes_since
+from .updates import NOT_FOUND, expected_versions, if_match, update_task
+from .versions import (
+    acurrent_version,
+    add_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from .views import TaskViewSet
+
+_negotiator = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS()
+
+# The browsable API renders through a DRF view.
+_renderers = [
+    renderer()
+    for renderer in TaskViewSet.renderer_classes
+    if not issubclass(renderer, BrowsableAPIRenderer)
+]
+
+
+def _negotiate(request):
+    # As APIView.perform_content_negotiation: when nothing is acceptable,
+    # the error is rendered with the first renderer.
+    request.accepted_renderer = _renderers[0]
+    request.accepted_media_type = _renderers[0].media_type
+    renderer, media_type = _negotiator.select_renderer(request, _renderers)
+    request.accepted_renderer = renderer
+    request.accepted_media_type = media_type
+
+
+def _render(request, data, status=status.HTTP_200_OK):
+    renderer = request.accepted_renderer
+    return HttpResponse(
+        renderer.render(data, request.accepted_media_type),
+        status=status,
+        content_type=renderer.media_type,
+    )
+
+
+def _api_view(methods):
+    """
+    Wrap an async view taking a DRF ``Request``: answer other methods with
+    405 and API exceptions as DRF's exception handler would.
+    """
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            request = Request(
+                request,
+                parsers=[parser() for parser in TaskViewSet.parser_classes],
+                negotiator=_negotiator,
+            )
+            try:
+                _negotiate(request)
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+                return await view(request, *args, **kwargs)
+            except APIException as exc:
+                detail = exc.detail
+                if not isinstance(detail, (list, dict)):
+                    detail = {"detail": detail}
+                return _render(request, detail, exc.status_code)
+
+        return wrapped
+
+    return decorator
+
+
+def _replica_reads(view):
+    # As for TaskViewSet; see tasks.replicas.
+    view.replica_reads = True
+    return view
+
+
+@transaction.atomic
+def _save(serializer, action):
+    task = serializer.save()
+    tasks_changed.send(sender=Task, action=action, ids=[task.id])
+    return task
+
+
+@transaction.atomic
+def _delete(pk):
+    deleted, _ = Task.objects.filter(pk=pk).delete()
+    if deleted:
+        tasks_changed.send(sender=Task, action=DELETED, ids=[pk])
+    return deleted
+
+
+async def _write(request, serializer, action, status_code):
+    serializer.is_valid(raise_exception=True)
+    task = await sync_to_async(_save)(serializer, action)
+    return _render(request, TaskSerializer(task).data, status_code)
+
+
+@_replica_reads
+@_api_view(["GET", "POST"])
+async def task_list(request):
+    if request.method == "POST":
+        serializer = TaskSerializer(data=request.data)
+        return await _write(
+            request, serializer, CREATED, status.HTTP_201_CREATED
+        )
+
+    # As TaskViewSet.list; see tasks.versions.
+    version = await acurrent_version()
+    renderer = request.accepted_renderer
+    etag = make_etag(version, renderer.format)
+    if is_not_modified(request, etag):
+        return not_modified(version, etag)
+    key = None
+    if settings.RESPONSE_CACHE and renderer.format in CACHED_FORMATS:
+        # Shared with TaskViewSet.list; see tasks.response_cache.
+        key = list_key(version, request, request.accepted_media_type)
+    if key is None:
+        response = _render(request, await _list_data(request))
+    else:
+
+        async def build():
+            data = await _list_data(request)
+            return Entry(
+                request.accepted_media_type,
+                renderer.render(data, request.accepted_media_type),
+            )
+
+        response = to_response(await aget_or_build(key, build))
+    return add_validators(response, version, etag)
+
+
+async def _list_data(request):
+    view = TaskViewSet
+    serializer_class = list_serializer_class(request, TaskSerializer)
+    encoder = get_row_encoder(
+        serializer_class, list_fields(request, serializer_class)
+    )
+    queryset = view.queryset.all()
+    for backend in view.filter_backends:
+        queryset = backend().filter_queryset(request, queryset, view)
+    paginator = view.pagination_class()
+    # Cursors are built from the raw ordering values of the last row.
+    ordering = paginator.get_ordering(request, queryset, view)
+    page = await paginator.apaginate_queryset(
+        encoder.rows(queryset, keys=[key.field for key in ordering]),
+        request,
+        view,
+    )
+    if page is not None:
+        return paginator.get_paginated_data(encoder.encode(page))
+    return encoder.encode([row async for row in encoder.rows(queryset)])
+
+
+@_replica_reads
+@_api_view(["GET", "PUT", "PATCH", "DELETE"])
+async def task_detail(request, pk):
+    if request.method == "DELETE":
+        if not await sync_to_async(_delete)(pk):
+            raise NotFound(NOT_FOUND)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+    if request.method == "GET":
+        version = await acurrent_version()
+        etag = make_etag(version, request.accepted_renderer.format)
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+        encoder = get_row_encoder(TaskSerializer)
+        row = await encoder.rows(Task.objects.filter(pk=pk)).afirst()
+        if row is None:
+            raise NotFound(NOT_FOUND)
+        return add_validators(
+            _render(request, encoder.encode([row])[0]), version, etag
+        )
+
+    # As TaskViewSet.update; see tasks.updates.
+    serializer = TaskSerializer(
+        data=request.data, partial=request.method == "PATCH"
+    )
+    serializer.is_valid(raise_exception=True)
+    task = await sync_to_async(update_task)(
+        pk,
+        serializer.validated_data,
+        expected_versions(request),
+        if_match(request),
+        request.accepted_renderer.format,
+    )
+    return _render(request, TaskSerializer(task).data)
+
+
+@_api_view(["GET"])
+async def task_changes(request):
+    try:
+        # Tombstones are read right away, the changed tasks lazily.
+        changes = await sync_to_async(changes_since)(
+            request.query_params.get("since")
+        )
+    except SyncTokenExpired as exc:
+        return _render(request, {"detail": str(exc)}, status.HTTP_410_GONE)
+    except SyncTokenError as exc:
+        return _render(
+            request, {"detail": str(exc)}, status.HTTP_400_BAD_REQUEST
+        )
+    encoder = get_row_encoder(TaskSerializer)
+    return _render(
+        request,
+        {
+            "token": changes.token,
+            "changed": encoder.encode(
+                [row async for row in encoder.rows(changes.changed)]
+            ),
+            "deleted": changes.deleted,
+        },
+    )
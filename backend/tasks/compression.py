@@ -0,0 +1,197 @@
+"""
+Negotiated compression of API responses.
+
+``compress_response`` encodes a response with the coding the client
+prefers among those it accepts (``Accept-Encoding``, with q-values),
+breaking ties by ``CODINGS`` order: zstd and brotli when their modules
+are installed (the ``compression`` extra), then gzip. Levels are the
+fast ones suited to dynamic content.
+
+Only API data is compressed (``COMPRESSIBLE_TYPES``): not HTML pages,
+which hold CSRF tokens that compression would leak (BREACH), nor event
+streams. Whole responses under ``RESPONSE_COMPRESSION_MIN_BYTES`` are
+sent as they are, as are those compression does not shrink. Streaming
+responses (exports) are compressed as they stream, each chunk flushed
+so clients receive it as soon as it is produced. A strong ``ETag`` is
+made weak: the encoded bytes differ, the representation does not.
+"""
+
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "text/csv",
+}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 4
+
+
+class _Gzip:
+    def __init__(self):
+        self._compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _Zstd:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+# In order of preference.
+CODINGS = {
+    name: coder
+    for name, coder, available in [
+        ("zstd", _Zstd, zstandard is not None),
+        ("br", _Brotli, brotli is not None),
+        ("gzip", _Gzip, True),
+    ]
+    if available
+}
+
+
+def negotiate(accept_encoding):
+    """
+    Return the coding of ``CODINGS`` to answer ``accept_encoding`` with,
+    or None to send the response as it is.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for name in CODINGS:
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def compress(coding, data):
+    """Return ``data`` encoded with ``coding``."""
+    coder = CODINGS[coding]()
+    return coder.compress(data) + coder.finish()
+
+
+def _compress_stream(coding, chunks):
+    coder = CODINGS[coding]()
+    for chunk in chunks:
+        data = coder.compress(chunk) + coder.flush()
+        if data:
+            yield data
+    yield coder.finish()
+
+
+async def _acompress_stream(coding, chunks):
+    coder = CODINGS[coding]()
+    async for chunk in chunks:
+        data = coder.compress(chunk) + coder.flush()
+        if data:
+            yield data
+    yield coder.finish()
+
+
+def _is_compressible(response):
+    content_type = response.get("Content-Type", "")
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type in COMPRESSIBLE_TYPES
+        and not response.has_header("Content-Encoding")
+        and "no-transform" not in response.get("Cache-Control", "")
+    )
+
+
+def compress_response(request, response):
+    """Compress ``response`` as ``request`` accepts; see the module."""
+    if not _is_compressible(response) or (
+        not response.streaming
+        and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES
+    ):
+        return response
+    patch_vary_headers(response, ["Accept-Encoding"])
+    coding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if coding is None:
+        return response
+
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = _acompress_stream(
+                coding, response.streaming_content
+            )
+        else:
+            response.streaming_content = _compress_stream(
+                coding, response.streaming_content
+            )
+        # The length is unknown until the stream ends.
+        del response.headers["Content-Length"]
+    else:
+        compressed = compress(coding, response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = coding
+    return response
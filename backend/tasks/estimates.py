@@ -0,0 +1,53 @@
+"""
+Row counts from PostgreSQL planner statistics.
+
+``COUNT(*)`` reads every matching row, which on a table of millions takes
+seconds. The planner keeps an estimate of each table's size in
+``pg_class`` (updated by ``ANALYZE`` and autovacuum) and estimates the
+rows of any query from column statistics; both cost a catalog lookup.
+Other databases have no such statistics, so their counts are exact.
+"""
+
+import json
+
+from django.db import connections
+
+
+def table_rows(model, using="default"):
+    """
+    Return the number of rows in ``model``'s table: the planner's
+    estimate on PostgreSQL once the table has been analyzed, an exact
+    count otherwise.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            (rows,) = cursor.fetchone()
+        # -1 until the table is first analyzed.
+        if rows >= 0:
+            return rows
+    return model._default_manager.using(using).count()
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's estimate of the rows in ``queryset``, or None
+    where there is no planner estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    if not queryset.query.where:
+        return table_rows(queryset.model, queryset.db)
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        (plan,) = cursor.fetchone()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,195 @@
+"""
+Live task change events for Server-Sent Event streams.
+
+Writes publish a small event (action and ids) after their transaction
+commits; each open stream holds one bounded queue, so an idle connection
+costs a suspended coroutine and little else. Clients react to an event by
+fetching ``/api/tasks/changes`` with their sync token.
+
+``LocalBroadcaster`` fans out within one process. ``PostgresBroadcaster``
+sends events through ``pg_notify`` and keeps one ``LISTEN`` connection
+per process, so every worker's streams see writes made by any worker.
+Select one with the ``TASK_EVENTS_BROADCASTER`` setting.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .signals import tasks_changed
+
+logger = logging.getLogger(__name__)
+
+# Larger id lists are sent as ``ids: null`` ("resync"); this keeps events
+# under the 8000 byte NOTIFY payload limit.
+MAX_EVENT_IDS = 500
+
+
+class Subscription:
+    """A bounded queue of events for one stream."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def put(self, event):
+        # Runs on the subscriber's event loop.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind resyncs instead of being buffered.
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        """Return the next event, or None once the subscriber overflowed."""
+        return await self.queue.get()
+
+
+class LocalBroadcaster:
+    """Fan events out to the streams open in this process."""
+
+    queue_size = 64
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def publish(self, event):
+        """Send ``event`` to every subscriber; safe from any thread."""
+        self.deliver(event)
+
+    def deliver(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The subscriber's loop has closed.
+                self._discard(subscription)
+
+    def _discard(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    async def start(self):
+        """Hook for broadcasters that need a background listener."""
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self):
+        await self.start()
+        subscription = Subscription(
+            asyncio.get_running_loop(), self.queue_size
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._discard(subscription)
+
+
+class PostgresBroadcaster(LocalBroadcaster):
+    """Relay events between processes with LISTEN/NOTIFY."""
+
+    channel = "task_events"
+    reconnect_delay = 1.0
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [self.channel, json.dumps(event)]
+            )
+
+    def _connection_params(self):
+        params = connection.get_connection_params()
+        for key in ("cursor_factory", "context", "prepare_threshold"):
+            params.pop(key, None)
+        return params
+
+    async def _listen(self):
+        import psycopg
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    autocommit=True, **self._connection_params()
+                ) as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    async for notify in conn.notifies():
+                        self.deliver(json.loads(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Task event listener failed; reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(
+                self._listen()
+            )
+
+
+@lru_cache(maxsize=None)
+def get_broadcaster():
+    return import_string(settings.TASK_EVENTS_BROADCASTER)()
+
+
+def make_event(action, ids):
+    if ids is not None and len(ids) > MAX_EVENT_IDS:
+        ids = None
+    return {"action": action, "ids": ids}
+
+
+@receiver(tasks_changed, dispatch_uid="tasks.events.publish_task_event")
+def publish_task_event(sender, action, ids, **kwargs):
+    event = make_event(action, list(ids) if ids is not None else None)
+    transaction.on_commit(lambda: get_broadcaster().publish(event))
+
+
+def format_event(event):
+    """Encode an event as a Server-Sent Events message."""
+    return f"event: {event['action']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def event_stream(subscription, heartbeat):
+    """
+    Yield Server-Sent Events for ``subscription``.
+
+    A comment line is sent every ``heartbeat`` seconds of silence so
+    proxies keep the connection open. If the subscriber falls behind, a
+    final ``resync`` event tells the client to reload and reconnect.
+    """
+    yield "retry: 5000\n\n"
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.get(), heartbeat)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        if event is None:
+            yield format_event({"action": "resync", "ids": None})
+            return
+        yield format_event(event)
@@ -0,0 +1,64 @@
+"""
+Sparse fieldsets and the summary representation of task lists.
+
+``?fields=id,title,completed`` limits list items to the fields named, in
+the usual order; ``?view=summary`` represents tasks with
+``TaskSummarySerializer``, whose description is cut to
+``SUMMARY_DESCRIPTION_LENGTH`` characters. Both reach the query: the row
+encoder selects only the columns it encodes (what ``only()`` would do
+for model instances) and cuts the description with ``LEFT()``, so
+omitted columns are never read and a multi-kilobyte description costs a
+preview's worth of transfer and encoding.
+"""
+
+from functools import lru_cache
+
+from rest_framework.exceptions import ValidationError
+
+from .serializers import TaskSummarySerializer
+
+FIELDS_PARAM = "fields"
+VIEW_PARAM = "view"
+
+# None is the view's own serializer.
+VIEWS = {"full": None, "summary": TaskSummarySerializer}
+
+
+@lru_cache(maxsize=None)
+def _readable(serializer_class):
+    return tuple(
+        name
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    )
+
+
+def list_serializer_class(request, default):
+    """
+    Return the serializer class of the ``view`` a list asks for, the
+    ``default`` for the full one.
+    """
+    name = request.query_params.get(VIEW_PARAM) or "full"
+    if name not in VIEWS:
+        raise ValidationError(
+            {VIEW_PARAM: [f"Must be one of {sorted(VIEWS)}."]}
+        )
+    return VIEWS[name] or default
+
+
+def list_fields(request, serializer_class):
+    """
+    Return the fields named by ``fields`` as a tuple in serializer order,
+    or None for all of them.
+    """
+    value = request.query_params.get(FIELDS_PARAM, "")
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    if not names:
+        return None
+    readable = _readable(serializer_class)
+    unknown = names.difference(readable)
+    if unknown:
+        raise ValidationError(
+            {FIELDS_PARAM: [f"Unknown field: {sorted(unknown)}."]}
+        )
+    return tuple(name for name in readable if name in names)
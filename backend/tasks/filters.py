@@ -0,0 +1,123 @@
+"""Query parameter filtering and ordering for the task list."""
+
+import datetime
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import DUE_DATE_SORT_KEY, Task
+from .pagination import TASK_ORDERING, TRUE_VALUES, OrderKey, order_by_args
+from .search import search_tasks
+
+FALSE_VALUES = {"0", "false", "no", "off"}
+
+# Every ordering ends in ``id`` so it is total, which keyset pagination
+# relies on. Each one is backed by an index declared on ``Task.Meta``.
+TASK_ORDERINGS = {
+    "position": TASK_ORDERING,
+    "due_date": (OrderKey("due_key", False), OrderKey("id", False)),
+    "-due_date": (OrderKey("due_key", True), OrderKey("id", True)),
+    "created_at": (OrderKey("created_at", False), OrderKey("id", False)),
+    "-created_at": (OrderKey("created_at", True), OrderKey("id", True)),
+    # Best matches first; only valid together with ``search``.
+    "rank": (OrderKey("search_rank", True), OrderKey("id", False)),
+}
+
+# Expressions that orderings refer to by name.
+ORDERING_ANNOTATIONS = {"due_key": DUE_DATE_SORT_KEY}
+
+PRIORITIES = {value for value, _ in Task.PRIORITY_CHOICES}
+
+
+def _parse_bool(name, value):
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: ["Must be true or false."]})
+
+
+def _parse_date(name, value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: ["Must be a date in YYYY-MM-DD."]})
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filter tasks by ``priority``, ``completed`` and a ``due_date`` range.
+
+    ``priority`` accepts a comma-separated list. ``due_after`` and
+    ``due_before`` are inclusive. ``search`` runs a full-text search over
+    title and description. ``ordering`` selects one of ``TASK_ORDERINGS``,
+    defaulting to ``rank`` when searching; the paginator reuses it for its
+    cursors.
+    """
+
+    ordering_param = "ordering"
+    search_param = "search"
+
+    def get_filters(self, request):
+        params = request.query_params
+        filters = {}
+        if params.get("priority"):
+            priorities = params["priority"].split(",")
+            unknown = set(priorities) - PRIORITIES
+            if unknown:
+                raise ValidationError(
+                    {"priority": [f"Unknown priority: {sorted(unknown)}."]}
+                )
+            filters["priority__in"] = priorities
+        if params.get("completed"):
+            filters["completed"] = _parse_bool(
+                "completed", params["completed"]
+            )
+        if params.get("due_after"):
+            filters["due_date__gte"] = _parse_date(
+                "due_after", params["due_after"]
+            )
+        if params.get("due_before"):
+            filters["due_date__lte"] = _parse_date(
+                "due_before", params["due_before"]
+            )
+        return filters
+
+    def get_search(self, request):
+        return request.query_params.get(self.search_param, "").strip()
+
+    def get_ordering(self, request, queryset, view):
+        searching = bool(self.get_search(request))
+        name = request.query_params.get(self.ordering_param) or (
+            "rank" if searching else "position"
+        )
+        if name == "rank" and not searching:
+            raise ValidationError(
+                {self.ordering_param: ["Ordering by rank requires search."]}
+            )
+        try:
+            return TASK_ORDERINGS[name]
+        except KeyError:
+            raise ValidationError(
+                {
+                    self.ordering_param: [
+                        f"Must be one of {sorted(TASK_ORDERINGS)}."
+                    ]
+                }
+            )
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.filter(**self.get_filters(request))
+        search = self.get_search(request)
+        if search:
+            queryset = search_tasks(queryset, search)
+        annotations = {
+            key.field: ORDERING_ANNOTATIONS[key.field]
+            for key in ordering
+            if key.field in ORDERING_ANNOTATIONS
+        }
+        return queryset.annotate(**annotations).order_by(
+            *order_by_args(ordering)
+        )
@@ -0,0 +1,56 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.archive import archive_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed tasks not updated for TASK_ARCHIVE_AFTER_DAYS to "
+        "the archive, in batches of TASK_ARCHIVE_BATCH_SIZE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help="Archive tasks not updated for this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_ARCHIVE_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to wait between batches, to spread the load.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches; the next run continues.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] <= 0:
+            raise CommandError(
+                "days must not be negative and batch-size must be positive."
+            )
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        count, batches = archive_tasks(
+            cutoff,
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {count} task(s) in {batches} batch(es)."
+            )
+        )
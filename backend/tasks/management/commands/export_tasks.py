@@ -0,0 +1,46 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from tasks.models import Task
+from tasks.renderers import CSVRenderer, NDJSONRenderer
+from tasks.transfer import EXPORT_CHUNK_SIZE, stream_export
+
+RENDERERS = {
+    renderer.format: renderer for renderer in [NDJSONRenderer, CSVRenderer]
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Write every task as NDJSON or CSV, streamed from a server-side "
+        "cursor so memory use stays constant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(RENDERERS), default="ndjson"
+        )
+        parser.add_argument(
+            "--output", "-o", help="File to write; standard output if not set."
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=EXPORT_CHUNK_SIZE
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        queryset = (
+            Task.objects.using(options["database"])
+            .all()
+            .order_by("sort_order", "created_at", "id")
+        )
+        renderer = RENDERERS[options["format"]]()
+        chunks = stream_export(queryset, renderer, options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.buffer.writelines(chunks)
+            sys.stdout.buffer.flush()
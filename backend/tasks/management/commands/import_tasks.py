@@ -0,0 +1,55 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import ParseError, ValidationError
+
+from tasks.parsers import CSVParser, NDJSONParser
+from tasks.transfer import import_tasks
+
+PARSERS = {"ndjson": NDJSONParser, "csv": CSVParser}
+
+
+class Command(BaseCommand):
+    help = (
+        "Create tasks from an NDJSON or CSV file, validated as the API "
+        "validates them and loaded with COPY on PostgreSQL. Nothing is "
+        "written if any record is invalid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="File to read, or - for standard input."
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(PARSERS),
+            help="Defaults to csv for .csv files and ndjson otherwise.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        name = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "ndjson"
+        )
+        parser = PARSERS[name]()
+        if path == "-":
+            count = self._import(parser, sys.stdin.buffer, options)
+        else:
+            with open(path, "rb") as stream:
+                count = self._import(parser, stream, options)
+        self.stdout.write(self.style.SUCCESS(f"Imported {count} task(s)."))
+
+    def _import(self, parser, stream, options):
+        try:
+            return import_tasks(
+                parser.parse(stream), using=options["database"]
+            )
+        except ParseError as exc:
+            raise CommandError(exc.detail)
+        except ValidationError as exc:
+            for line, errors in exc.detail["lines"].items():
+                self.stderr.write(f"Line {line}: {json.dumps(errors)}")
+            raise CommandError("No tasks were imported.")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tasks.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete task tombstones older than the retention period."
+
+    def handle(self, *args, **options):
+        count = purge_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {count} task tombstone(s).")
+        )
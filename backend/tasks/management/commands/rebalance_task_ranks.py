@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.ranking import RANK_GAP, rebalance
+
+
+class Command(BaseCommand):
+    help = "Renumber task sort_order values to evenly spaced ranks."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebalance()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebalanced {count} task(s) to a gap of {RANK_GAP}."
+            )
+        )
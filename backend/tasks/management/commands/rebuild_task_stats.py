@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from tasks.stats import rebuild_stats, verify_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the task stats summary against a full recount and rebuild "
+        "it if they differ."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report differences, failing if there are any.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild even if the counts match.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        differences = verify_stats(using)
+        for priority, completed, due_date, stored, actual in differences:
+            self.stdout.write(
+                f"priority={priority} completed={completed} "
+                f"due_date={due_date}: stored {stored}, actual {actual}"
+            )
+        if options["check"]:
+            if differences:
+                raise CommandError(
+                    f"Task stats differ in {len(differences)} group(s)."
+                )
+            self.stdout.write(
+                self.style.SUCCESS("Task stats match a full recount.")
+            )
+            return
+        if not differences and not options["force"]:
+            self.stdout.write(
+                self.style.SUCCESS("Task stats match a full recount.")
+            )
+            return
+        count = rebuild_stats(using)
+        if verify_stats(using):
+            raise CommandError("Task stats still differ after rebuilding.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task stats: {count} group(s).")
+        )
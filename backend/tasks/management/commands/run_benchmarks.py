@@ -0,0 +1,108 @@
+import datetime
+import json
+import os
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.utils.module_loading import import_string
+from rest_framework.test import APIClient
+
+from benchmarks import WORKLOADS
+
+
+class Command(BaseCommand):
+    help = (
+        "Run API benchmarks against a throwaway test database and print "
+        "the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "workloads",
+            nargs="*",
+            help=f"Workloads to run (default: all of {sorted(WORKLOADS)}).",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            nargs="+",
+            help=(
+                "Rows per workload; several sizes run every workload at "
+                "each (default: each workload's own)."
+            ),
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--output", help="Write results to this file.")
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Reuse the test database between runs.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["workloads"] or sorted(WORKLOADS)
+        unknown = set(names) - set(WORKLOADS)
+        if unknown:
+            raise CommandError(f"Unknown workload(s): {sorted(unknown)}.")
+
+        setup_test_environment()
+        old_config = setup_databases(
+            verbosity=0, interactive=False, keepdb=options["keepdb"]
+        )
+        try:
+            environment = self.environment()
+            results = []
+            # Workloads time the views; the response_cache workload turns
+            # the cache on.
+            with override_settings(RESPONSE_CACHE=False):
+                for size in options["size"] or [None]:
+                    for name in names:
+                        run = import_string(WORKLOADS[name])
+                        kwargs = {"repeat": options["repeat"]}
+                        if size:
+                            kwargs["size"] = size
+                        results.extend(run(APIClient(), **kwargs))
+        finally:
+            teardown_databases(
+                old_config, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        output = json.dumps(
+            {"environment": environment, "results": results}, indent=2
+        )
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def environment(self):
+        """Describe the run so result files can be compared."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT sqlite_version()"
+                if connection.vendor == "sqlite"
+                else "SELECT version()"
+            )
+            (database_version,) = cursor.fetchone()
+        return {
+            "started_at": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "database_version": database_version,
+            "cpus": os.cpu_count(),
+            "platform": platform.platform(),
+        }
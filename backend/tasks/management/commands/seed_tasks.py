@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from benchmarks.seed import clear_tasks, seed_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert synthetic tasks for benchmarking, with COPY on PostgreSQL "
+        "and batched bulk inserts elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Tasks to insert.")
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete every existing task first.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; the same seed gives the same rows.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["count"] < 0:
+            raise CommandError("count must not be negative.")
+        using = options["database"]
+        start = time.perf_counter()
+        with transaction.atomic(using=using):
+            if options["clear"]:
+                clear_tasks(using)
+            count = seed_tasks(
+                options["count"], seed=options["seed"], using=using
+            )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(f"Inserted {count} task(s) in {elapsed:.1f}s.")
+        )
@@ -0,0 +1,528 @@
+"""
+Request middleware: Prometheus metrics, admission control,
+``Server-Timing``, response compression and replica routing.
+
+``MetricsMiddleware`` counts and times every request by route (see
+``tasks.monitoring``).
+
+``AdmissionMiddleware`` rate limits clients and sheds load under overload
+(see ``tasks.admission``).
+
+``CompressionMiddleware`` compresses API responses with the best coding
+the client accepts (see ``tasks.compression``).
+
+``ReplicaMiddleware`` routes reads to a read replica (see
+``tasks.replicas``).
+
+``RequestTimingMiddleware`` instruments a sampled fraction of requests
+(``REQUEST_TIMING_SAMPLE_RATE``): it records their SQL queries and the
+time spent in the view, the database, rendering the response and the
+rest of the middleware stack. Sampled requests that exceed
+``REQUEST_TIMING_SLOW_MS`` or ``REQUEST_TIMING_SLOW_QUERIES`` are logged
+as JSON to the ``tasks.middleware`` logger, with their slowest
+statements. Unsampled requests pay for one random number.
+"""
+
+import json
+import logging
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MethodType
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+
+from .admission import (
+    CRITICAL,
+    HEAVY,
+    PRIORITY_NAMES,
+    ConcurrencyLimiter,
+    RateLimiter,
+    classify,
+    queue_time,
+    retry_after,
+)
+from .compression import compress_response
+from .monitoring import (
+    ADMISSION_QUEUE,
+    ADMISSIONS,
+    EXCEPTIONS,
+    IN_PROGRESS,
+    LATENCY,
+    REQUESTS,
+)
+from .replicas import (
+    allows_replica_reads,
+    is_pinned,
+    pin,
+    reads_from_replica,
+    use_replica,
+)
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Statements included in a slow-request log entry, slowest first.
+SLOW_LOG_QUERIES = 10
+
+# The sampled request being handled. Context variables follow a request
+# onto the threads its async views query from.
+_current_timing = ContextVar("request_timing", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timing = _current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def _install_query_timer(connection):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+@receiver(connection_created, dispatch_uid="tasks.middleware.query_timer")
+def install_query_timer(sender, connection, **kwargs):
+    # Threads running async ORM queries connect after startup.
+    _install_query_timer(connection)
+
+
+def _use_coroutine_hooks(middleware, *names):
+    # Django sends plain hooks of an async middleware to a thread on
+    # every request; coroutine wrappers run on the event loop instead.
+    markcoroutinefunction(middleware)
+    for name in names:
+        hook = getattr(middleware, name)
+
+        async def adapted(self, *args, hook=hook):
+            return hook(*args)
+
+        # Bound, as Django names the middleware in its error messages.
+        setattr(middleware, name, MethodType(adapted, middleware))
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Count requests and observe their latency by route, and track the
+    requests in flight. Place it first in ``MIDDLEWARE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            _use_coroutine_hooks(self, "process_exception")
+
+    def _observe(self, request, response, start):
+        route = _route(request)
+        LATENCY.labels(route, request.method).observe(
+            time.perf_counter() - start
+        )
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with IN_PROGRESS.track_inprogress():
+            response = self.get_response(request)
+        return self._observe(request, response, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with IN_PROGRESS.track_inprogress():
+            response = await self.get_response(request)
+        return self._observe(request, response, start)
+
+    def process_exception(self, request, exception):
+        EXCEPTIONS.labels(_route(request), type(exception).__name__).inc()
+        return None
+
+
+class AdmissionMiddleware:
+    """
+    Admit requests by priority within per-client rate limits and a
+    concurrency limit, answering ``429`` or ``503`` with ``Retry-After``
+    when they cannot be served in time. Place it right after
+    ``MetricsMiddleware``. Not used without ``ADMISSION_CONTROL``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.ADMISSION_CONTROL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.rates = (
+            RateLimiter(
+                settings.ADMISSION_CLIENT_RATE,
+                settings.ADMISSION_CLIENT_BURST,
+                settings.ADMISSION_MAX_CLIENTS,
+            )
+            if settings.ADMISSION_CLIENT_RATE > 0
+            else None
+        )
+        limit = settings.ADMISSION_MAX_CONCURRENCY
+        self.slots = ConcurrencyLimiter(
+            limit,
+            max(1, math.floor(limit * settings.ADMISSION_HEAVY_SHARE)),
+            depth=ADMISSION_QUEUE,
+        )
+
+    def _client(self, request):
+        header = settings.ADMISSION_CLIENT_HEADER
+        if header and request.headers.get(header):
+            return request.headers[header].split(",")[0].strip()
+        return request.META.get("REMOTE_ADDR", "")
+
+    def _reject(self, priority, decision, status, detail, wait):
+        ADMISSIONS.labels(PRIORITY_NAMES[priority], decision).inc()
+        response = JsonResponse({"detail": detail}, status=status)
+        response["Retry-After"] = retry_after(wait)
+        return response
+
+    def _check(self, request):
+        """
+        Return the request's priority, a rejection response or None, and
+        the seconds it may still wait for a slot.
+        """
+        priority = classify(request)
+        if priority == CRITICAL:
+            return priority, None, None
+        if self.rates is not None:
+            wait = self.rates.acquire(self._client(request), time.monotonic())
+            if wait:
+                return (
+                    priority,
+                    self._reject(
+                        priority,
+                        "rate_limited",
+                        429,
+                        "Request was throttled. Expected available in "
+                        f"{math.ceil(wait)} seconds.",
+                        wait,
+                    ),
+                    None,
+                )
+        timeout = (
+            settings.ADMISSION_HEAVY_QUEUE_TIMEOUT
+            if priority == HEAVY
+            else settings.ADMISSION_QUEUE_TIMEOUT
+        )
+        waited = queue_time(request, time.time())
+        if waited is not None and waited > timeout:
+            # Queued in front of the worker for longer than the client
+            # will wait; its answer would go unread.
+            return (
+                priority,
+                self._reject(
+                    priority,
+                    "queue_deadline",
+                    503,
+                    "Server is overloaded; try again later.",
+                    self.slots.expected_wait(priority),
+                ),
+                None,
+            )
+        return priority, None, timeout - (waited or 0.0)
+
+    def _admitted(self, priority, decision, wait):
+        if decision in ("admitted", "queued"):
+            ADMISSIONS.labels(PRIORITY_NAMES[priority], decision).inc()
+            return None
+        return self._reject(
+            priority,
+            decision,
+            503,
+            "Server is overloaded; try again later.",
+            wait,
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        priority, rejection, timeout = self._check(request)
+        if rejection is not None:
+            return rejection
+        if priority == CRITICAL:
+            ADMISSIONS.labels(PRIORITY_NAMES[priority], "admitted").inc()
+            return self.get_response(request)
+        rejection = self._admitted(
+            priority, *self.slots.acquire(priority, timeout)
+        )
+        if rejection is not None:
+            return rejection
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            self.slots.release(priority, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        priority, rejection, timeout = self._check(request)
+        if rejection is not None:
+            return rejection
+        if priority == CRITICAL:
+            ADMISSIONS.labels(PRIORITY_NAMES[priority], "admitted").inc()
+            return await self.get_response(request)
+        rejection = self._admitted(
+            priority, *await self.slots.aacquire(priority, timeout)
+        )
+        if rejection is not None:
+            return rejection
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            self.slots.release(priority, time.perf_counter() - start)
+
+
+class RequestTiming:
+    """Timings collected for one request; durations in seconds."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.render_start = None
+        self.render_end = None
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # Called for every query while ``capture_queries`` is active.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @contextmanager
+    def capture_queries(self):
+        for alias in connections:
+            _install_query_timer(connections[alias])
+        token = _current_timing.set(self)
+        try:
+            yield
+        finally:
+            _current_timing.reset(token)
+
+    def finish(self):
+        end = time.perf_counter()
+        self.total = end - self.start
+        self.db = sum(duration for _, duration in self.queries)
+        if self.render_start is not None and self.render_end is not None:
+            self.serialize = self.render_end - self.render_start
+            view_end = self.render_start
+        else:
+            self.serialize = 0.0
+            view_end = end
+        self.view = (
+            view_end - self.view_start if self.view_start is not None else 0.0
+        )
+        self.middleware = max(self.total - self.view - self.serialize, 0.0)
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f"total;dur={self.total * 1000:.1f}",
+                f"view;dur={self.view * 1000:.1f}",
+                f'db;dur={self.db * 1000:.1f};desc="{len(self.queries)} '
+                f'queries"',
+                f"serialize;dur={self.serialize * 1000:.1f}",
+                f"middleware;dur={self.middleware * 1000:.1f}",
+            ]
+        )
+
+    def is_slow(self):
+        return (
+            self.total * 1000 >= settings.REQUEST_TIMING_SLOW_MS
+            or len(self.queries) >= settings.REQUEST_TIMING_SLOW_QUERIES
+        )
+
+    def log_entry(self, request, response):
+        slowest = sorted(self.queries, key=lambda query: -query[1])
+        return {
+            "event": "slow_request",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(self.total * 1000, 1),
+            "view_ms": round(self.view * 1000, 1),
+            "db_ms": round(self.db * 1000, 1),
+            "serialize_ms": round(self.serialize * 1000, 1),
+            "middleware_ms": round(self.middleware * 1000, 1),
+            "queries": len(self.queries),
+            "slowest_queries": [
+                {"sql": sql, "ms": round(duration * 1000, 2)}
+                for sql, duration in slowest[:SLOW_LOG_QUERIES]
+            ],
+        }
+
+
+class RequestTimingMiddleware:
+    """
+    Add ``Server-Timing`` to sampled responses and log slow requests.
+
+    Place it early in ``MIDDLEWARE`` so ``total`` covers the whole stack.
+    ``view`` includes ``db``; ``serialize`` is response rendering.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            _use_coroutine_hooks(
+                self, "process_view", "process_template_response"
+            )
+
+    def _sample(self, request):
+        if random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            return None
+        request.request_timing = RequestTiming()
+        return request.request_timing
+
+    def _finish(self, request, response, timing):
+        timing.finish()
+        response["Server-Timing"] = timing.server_timing()
+        if timing.is_slow():
+            entry = timing.log_entry(request, response)
+            logger.warning(json.dumps(entry), extra={"timing": entry})
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = self._sample(request)
+        if timing is None:
+            return self.get_response(request)
+        with timing.capture_queries():
+            response = self.get_response(request)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = self._sample(request)
+        if timing is None:
+            return await self.get_response(request)
+        with timing.capture_queries():
+            response = await self.get_response(request)
+        return self._finish(request, response, timing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, "request_timing", None)
+        if timing is not None:
+            timing.view_start = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns.
+        timing = getattr(request, "request_timing", None)
+        if timing is not None:
+            timing.render_start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: setattr(
+                    timing, "render_end", time.perf_counter()
+                )
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses as the client's ``Accept-Encoding`` allows,
+    unless ``RESPONSE_COMPRESSION`` is off. Place it before middleware
+    that reads or changes response bodies.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.RESPONSE_COMPRESSION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return compress_response(request, await self.get_response(request))
+
+
+class ReplicaMiddleware:
+    """
+    Let safe requests to views that opt in read from the replica, unless
+    the client is pinned to the primary, and pin clients that write (see
+    ``tasks.replicas``). Does nothing without ``REPLICA_DATABASE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            _use_coroutine_hooks(self, "process_view")
+
+    def _finish(self, request, response):
+        if request.method not in SAFE_METHODS:
+            pin(response)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if settings.REPLICA_DATABASE is None:
+            return self.get_response(request)
+        # The view's reads are routed from process_view; this scope ends
+        # the routing with the request.
+        with reads_from_replica(False):
+            response = self.get_response(request)
+        return self._finish(request, response)
+
+    async def __acall__(self, request):
+        if settings.REPLICA_DATABASE is None:
+            return await self.get_response(request)
+        with reads_from_replica(False):
+            response = await self.get_response(request)
+        return self._finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.REPLICA_DATABASE is not None
+            and request.method in SAFE_METHODS
+            and not is_pinned(request)
+            and allows_replica_reads(view_func, request.method)
+        ):
+            use_replica()
+        return None
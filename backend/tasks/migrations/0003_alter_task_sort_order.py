@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+def spread_ranks(apps, schema_editor):
+    # Existing orders are dense indexes; space them out so moves can
+    # insert between neighbours without renumbering.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE tasks_task
+            SET sort_order = ranked.position * 65536
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    ORDER BY sort_order, created_at, id
+                ) AS position
+                FROM tasks_task
+            ) AS ranked
+            WHERE tasks_task.id = ranked.id
+            """
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_task_sort_order"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="sort_order",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(spread_ranks, migrations.RunPython.noop),
+    ]
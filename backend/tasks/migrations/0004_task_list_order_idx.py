@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_alter_task_sort_order"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["sort_order", "created_at", "id"],
+                name="task_list_order_idx",
+            ),
+        ),
+    ]
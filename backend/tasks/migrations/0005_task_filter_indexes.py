@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:25
+
+import datetime
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_task_list_order_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date"], name="task_due_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    "due_date",
+                    models.Value(datetime.date(9999, 12, 31)),
+                    output_field=models.DateField(),
+                ),
+                models.F("id"),
+                name="task_due_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["created_at", "id"], name="task_created_at_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", False)),
+                fields=["priority", "due_date"],
+                name="task_open_priority_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            "UPDATE tasks_task SET updated_at = created_at",
+            migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# PostgreSQL only; SQLite gets an FTS5 index from tasks.search instead.
+ADD_SEARCH_VECTOR = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX task_search_vector_idx ON tasks_task
+    USING GIN (search_vector)
+    """,
+]
+
+DROP_SEARCH_VECTOR = [
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in ADD_SEARCH_VECTOR:
+            schema_editor.execute(statement)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_SEARCH_VECTOR:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_task_updated_at_tasktombstone"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:24
+
+from django.db import migrations, models
+
+# PostgreSQL only; SQLite gets row-level triggers from tasks.stats instead.
+# Statement-level triggers apply the net change of a whole statement,
+# bulk writes and COPY included, in one upsert. Groups are upserted in
+# order so concurrent writers lock them in the same order.
+UPSERT = """
+    INSERT INTO tasks_taskstats AS stats (priority, completed, due_key, count)
+    SELECT priority, completed, COALESCE(due_date, DATE '9999-12-31'),
+        SUM(delta)
+    FROM ({changes}) AS changes
+    GROUP BY 1, 2, 3
+    HAVING SUM(delta) <> 0
+    ORDER BY 1, 2, 3
+    ON CONFLICT (priority, completed, due_key)
+    DO UPDATE SET count = stats.count + EXCLUDED.count;
+"""
+
+ADDED = "SELECT priority, completed, due_date, 1 AS delta FROM new_rows"
+REMOVED = "SELECT priority, completed, due_date, -1 AS delta FROM old_rows"
+
+# Each branch reads only the transition tables its event provides.
+APPLY_CHANGES = f"""
+CREATE FUNCTION tasks_taskstats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM tasks_taskstats;
+    ELSIF TG_OP = 'INSERT' THEN
+        {UPSERT.format(changes=ADDED)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {UPSERT.format(changes=REMOVED)}
+    ELSE
+        {UPSERT.format(changes=f"{ADDED} UNION ALL {REMOVED}")}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+ADD_TRIGGERS = [
+    APPLY_CHANGES,
+    """
+    CREATE TRIGGER tasks_taskstats_insert AFTER INSERT ON tasks_task
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_update AFTER UPDATE ON tasks_task
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_delete AFTER DELETE ON tasks_task
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_truncate AFTER TRUNCATE ON tasks_task
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    "LOCK TABLE tasks_task IN SHARE MODE",
+    """
+    INSERT INTO tasks_taskstats (priority, completed, due_key, count)
+    SELECT priority, completed, COALESCE(due_date, DATE '9999-12-31'),
+        COUNT(*)
+    FROM tasks_task
+    GROUP BY 1, 2, 3
+    """,
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS tasks_taskstats_insert ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_update ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_delete ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_truncate ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_taskstats_apply()",
+]
+
+
+def add_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in ADD_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("priority", models.CharField(max_length=10)),
+                ("completed", models.BooleanField()),
+                ("due_key", models.DateField()),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("priority", "completed", "due_key"),
+                        name="task_stats_group",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(add_triggers, drop_triggers),
+    ]
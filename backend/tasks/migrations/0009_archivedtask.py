@@ -0,0 +1,135 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:36
+
+from django.db import migrations, models
+
+# PostgreSQL only; tasks.stats installs the SQLite equivalents. Task stats
+# count archived tasks too, so the archive gets the triggers of
+# tasks_task (0008), and truncating either table recounts both.
+RECOUNT = """
+CREATE FUNCTION tasks_taskstats_recount() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM tasks_taskstats;
+    INSERT INTO tasks_taskstats (priority, completed, due_key, count)
+    SELECT priority, completed, COALESCE(due_date, DATE '9999-12-31'),
+        COUNT(*)
+    FROM (
+        SELECT priority, completed, due_date FROM tasks_task
+        UNION ALL
+        SELECT priority, completed, due_date FROM tasks_archivedtask
+    ) AS tasks
+    GROUP BY 1, 2, 3;
+    RETURN NULL;
+END
+$$
+"""
+
+ADD_TRIGGERS = [
+    RECOUNT,
+    "DROP TRIGGER tasks_taskstats_truncate ON tasks_task",
+    """
+    CREATE TRIGGER tasks_taskstats_truncate AFTER TRUNCATE ON tasks_task
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_recount()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_insert
+    AFTER INSERT ON tasks_archivedtask
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_update
+    AFTER UPDATE ON tasks_archivedtask
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_delete
+    AFTER DELETE ON tasks_archivedtask
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    """
+    CREATE TRIGGER tasks_taskstats_truncate
+    AFTER TRUNCATE ON tasks_archivedtask
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_recount()
+    """,
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS tasks_taskstats_insert ON tasks_archivedtask",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_update ON tasks_archivedtask",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_delete ON tasks_archivedtask",
+    "DROP TRIGGER IF EXISTS tasks_taskstats_truncate ON tasks_archivedtask",
+    "DROP TRIGGER tasks_taskstats_truncate ON tasks_task",
+    """
+    CREATE TRIGGER tasks_taskstats_truncate AFTER TRUNCATE ON tasks_task
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_taskstats_apply()
+    """,
+    "DROP FUNCTION IF EXISTS tasks_taskstats_recount()",
+]
+
+
+def add_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in ADD_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_task_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "Low"),
+                            ("medium", "Medium"),
+                            ("high", "High"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("due_date", models.DateField(blank=True, null=True)),
+                ("completed", models.BooleanField()),
+                ("sort_order", models.BigIntegerField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", True)),
+                fields=["updated_at", "id"],
+                name="task_archivable_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["archived_at", "id"], name="archived_task_order_idx"
+            ),
+        ),
+        migrations.RunPython(add_triggers, drop_triggers),
+    ]
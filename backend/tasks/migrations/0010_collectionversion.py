@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_archivedtask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CollectionVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50, primary_key=True, serialize=False
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                (
+                    "changed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:11
+
+from django.db import migrations, models
+
+# PostgreSQL only; SQLite gets row-level triggers from tasks.versions
+# instead. Statement-level triggers bump the task list version once per
+# statement that changed rows, in the statement's transaction, so a
+# single-statement write needs no transaction of its own.
+BUMP = """
+    INSERT INTO tasks_collectionversion AS versions
+        (name, version, changed_at)
+    VALUES ('tasks', 1, clock_timestamp())
+    ON CONFLICT (name)
+    DO UPDATE SET version = versions.version + 1,
+        changed_at = EXCLUDED.changed_at;
+"""
+
+# Each branch reads only the transition tables its event provides;
+# statements that matched no rows change nothing.
+BUMP_VERSION = f"""
+CREATE FUNCTION tasks_collectionversion_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP <> 'TRUNCATE' THEN
+        IF NOT EXISTS (SELECT FROM new_rows) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    {BUMP}
+    RETURN NULL;
+END
+$$
+"""
+
+ADD_TRIGGERS = [
+    BUMP_VERSION,
+    """
+    CREATE TRIGGER tasks_collectionversion_insert AFTER INSERT ON tasks_task
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_collectionversion_bump()
+    """,
+    """
+    CREATE TRIGGER tasks_collectionversion_update AFTER UPDATE ON tasks_task
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_collectionversion_bump()
+    """,
+    """
+    CREATE TRIGGER tasks_collectionversion_delete AFTER DELETE ON tasks_task
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_collectionversion_bump()
+    """,
+    """
+    CREATE TRIGGER tasks_collectionversion_truncate
+    AFTER TRUNCATE ON tasks_task
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_collectionversion_bump()
+    """,
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS tasks_collectionversion_insert ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_collectionversion_update ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_collectionversion_delete ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_collectionversion_truncate ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_collectionversion_bump()",
+]
+
+
+def add_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in ADD_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0010_collectionversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedtask",
+            name="version",
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveBigIntegerField(db_default=1, default=1),
+        ),
+        migrations.RunPython(add_triggers, drop_triggers),
+    ]
@@ -1,5 +1,17 @@
 # tasks/models.py
+import datetime
+
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Tasks without a due date sort after every dated task. Ordering on this
+# non-null key keeps due date cursors a plain index range scan.
+DUE_DATE_SORT_KEY = Coalesce(
+    "due_date",
+    models.Value(datetime.date.max),
+    output_field=models.DateField(),
+)
 
 
 class Task(models.Model):
@@ -21,8 +33,122 @@ class Task(models.Model):
     )
     due_date = models.DateField(null=True, blank=True)
     completed = models.BooleanField(default=False)
-    sort_order = models.IntegerField(default=0)
+    sort_order = models.BigIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Counts the writes to the task, for optimistic concurrency (If-Match;
+    # see tasks.updates). A database default, for bulk loads too.
+    version = models.PositiveBigIntegerField(default=1, db_default=1)
+
+    class Meta:
+        indexes = [
+            # Matches the list ordering so keyset pages are range scans.
+            models.Index(
+                fields=["sort_order", "created_at", "id"],
+                name="task_list_order_idx",
+            ),
+            models.Index(fields=["due_date"], name="task_due_date_idx"),
+            models.Index(
+                DUE_DATE_SORT_KEY, models.F("id"), name="task_due_order_idx"
+            ),
+            models.Index(
+                fields=["created_at", "id"], name="task_created_at_idx"
+            ),
+            # Open tasks are the hot working set; filtering them by
+            # priority and due date never touches completed rows.
+            models.Index(
+                fields=["priority", "due_date"],
+                condition=models.Q(completed=False),
+                name="task_open_priority_due_idx",
+            ),
+            # Finds the completed tasks due for archiving (tasks.archive).
+            models.Index(
+                fields=["updated_at", "id"],
+                condition=models.Q(completed=True),
+                name="task_archivable_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.title)
+
+
+class TaskTombstone(models.Model):
+    """Records a deleted task so delta sync can report its removal."""
+
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self) -> str:
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of ``tasks_task`` by ``tasks.archive``,
+    keeping its id and every field.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    due_date = models.DateField(null=True, blank=True)
+    completed = models.BooleanField()
+    sort_order = models.BigIntegerField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    version = models.PositiveBigIntegerField(default=1)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # The archive list ordering, newest first.
+            models.Index(
+                fields=["archived_at", "id"], name="archived_task_order_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.title)
+
+
+class TaskStats(models.Model):
+    """
+    The number of tasks with a priority, status and due date, kept by
+    database triggers; see ``tasks.stats``.
+    """
+
+    priority = models.CharField(max_length=10)
+    completed = models.BooleanField()
+    # date.max for tasks without a due date, as in DUE_DATE_SORT_KEY.
+    due_key = models.DateField()
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["priority", "completed", "due_key"],
+                name="task_stats_group",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.count} {self.priority} task(s), "
+            f"completed={self.completed}, due {self.due_key}"
+        )
+
+
+class CollectionVersion(models.Model):
+    """
+    A counter bumped by every write to a collection, such as the task
+    list; see ``tasks.versions``.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"{self.name} version {self.version}"
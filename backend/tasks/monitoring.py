@@ -0,0 +1,263 @@
+"""
+Prometheus metrics and readiness checks.
+
+Under gunicorn every worker records into its own files in
+``PROMETHEUS_MULTIPROC_DIR`` and a scrape of any worker reports the sum
+over all of them (see ``config/gunicorn.py``). Without that variable the
+metrics of the current process are reported.
+
+Workers publish the statistics of their database connection pools (see
+``DB_POOL`` in ``config/env_settings.py``) at the end of every request.
+"""
+
+import math
+import os
+import time
+
+from django.core.signals import request_finished
+from django.db import DatabaseError, connections
+from django.dispatch import receiver
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route, method and status code.",
+    ["route", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and method.",
+    ["route", "method"],
+)
+EXCEPTIONS = Counter(
+    "http_request_exceptions_total",
+    "Unhandled exceptions raised by views, by route and type.",
+    ["route", "exception"],
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled.",
+    multiprocess_mode="livesum",
+)
+
+# Admission control (tasks.admission).
+ADMISSIONS = Counter(
+    "admission_decisions_total",
+    "Requests admitted or turned away by admission control, by priority "
+    "class and decision.",
+    ["priority", "decision"],
+)
+ADMISSION_QUEUE = Gauge(
+    "admission_queue_depth",
+    "Requests waiting for a concurrency slot.",
+    multiprocess_mode="livesum",
+)
+
+# Shared task list response cache (tasks.response_cache).
+RESPONSE_CACHE = Counter(
+    "response_cache_requests_total",
+    "Task list responses looked up in the shared response cache, by "
+    "result.",
+    ["result"],
+)
+RESPONSE_CACHE_REBUILD = Histogram(
+    "response_cache_rebuild_seconds",
+    "Time spent building task list responses missing from the response "
+    "cache.",
+)
+
+# psycopg_pool statistics: current measures as gauges summed over live
+# workers, counters as (metric, scale) totals.
+POOL_GAUGES = {
+    stat: Gauge(
+        name,
+        description,
+        ["database"],
+        multiprocess_mode="livesum",
+    )
+    for stat, name, description in [
+        ("pool_size", "db_pool_connections", "Connections open in pools."),
+        (
+            "pool_available",
+            "db_pool_idle_connections",
+            "Pooled connections waiting to be checked out.",
+        ),
+        (
+            "pool_max",
+            "db_pool_max_connections",
+            "Pool size limits; the cap on connections from all workers.",
+        ),
+        (
+            "requests_waiting",
+            "db_pool_waiting_requests",
+            "Requests waiting for a pooled connection.",
+        ),
+    ]
+}
+POOL_COUNTERS = {
+    stat: (Counter(name, description, ["database"]), scale)
+    for stat, name, description, scale in [
+        (
+            "requests_num",
+            "db_pool_checkouts_total",
+            "Connections requested from pools.",
+            1,
+        ),
+        (
+            "requests_queued",
+            "db_pool_checkouts_queued_total",
+            "Checkouts that had to wait for a connection.",
+            1,
+        ),
+        (
+            "requests_wait_ms",
+            "db_pool_checkout_wait_seconds_total",
+            "Time spent waiting for pooled connections.",
+            0.001,
+        ),
+        (
+            "requests_errors",
+            "db_pool_checkout_errors_total",
+            "Checkouts that timed out or failed.",
+            1,
+        ),
+        (
+            "connections_num",
+            "db_pool_connects_total",
+            "Connections opened by pools.",
+            1,
+        ),
+        (
+            "connections_errors",
+            "db_pool_connect_errors_total",
+            "Failed attempts to open pooled connections.",
+            1,
+        ),
+        (
+            "connections_lost",
+            "db_pool_connections_lost_total",
+            "Pooled connections found broken when checked out.",
+            1,
+        ),
+    ]
+}
+
+
+def publish_pool_stats(alias, pool):
+    """Record the statistics of ``pool`` since they were last recorded."""
+    stats = pool.pop_stats()
+    for stat, gauge in POOL_GAUGES.items():
+        gauge.labels(alias).set(stats.get(stat, 0))
+    for stat, (counter, scale) in POOL_COUNTERS.items():
+        if stats.get(stat):
+            counter.labels(alias).inc(stats[stat] * scale)
+
+
+@receiver(request_finished, dispatch_uid="tasks.monitoring.record_pools")
+def record_pools(sender, **kwargs):
+    # Connected after Django's own receiver, so the request's connection
+    # is already back in the pool.
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            publish_pool_stats(alias, pool)
+
+
+class DatabaseConnectionCollector:
+    """
+    Report connections to the application database, by state, and the
+    server's ``max_connections``, read from PostgreSQL at scrape time.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def collect(self):
+        connection = connections[self.alias]
+        if connection.vendor != "postgresql":
+            return
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COALESCE(state, 'unknown'), count(*) "
+                    "FROM pg_stat_activity "
+                    "WHERE datname = current_database() GROUP BY 1"
+                )
+                states = cursor.fetchall()
+                cursor.execute(
+                    "SELECT current_setting('max_connections')::int"
+                )
+                (maximum,) = cursor.fetchone()
+        except DatabaseError:
+            # The rest of the scrape is still useful; readiness reports
+            # the outage.
+            return
+        usage = GaugeMetricFamily(
+            "db_connections",
+            "Connections to the application database by state.",
+            labels=["state"],
+        )
+        for state, count in states:
+            usage.add_metric([state], count)
+        yield usage
+        yield GaugeMetricFamily(
+            "db_max_connections",
+            "The database server's connection limit.",
+            value=maximum,
+        )
+
+
+def render_metrics():
+    """Return the metrics of every worker in the text exposition format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        collectors = [registry]
+    else:
+        collectors = [REGISTRY]
+    database = CollectorRegistry()
+    database.register(DatabaseConnectionCollector())
+    return b"".join(generate_latest(c) for c in [*collectors, database])
+
+
+def check_database(timeout, alias="default"):
+    """
+    Run ``SELECT 1`` on a new connection, giving up after about
+    ``timeout`` seconds to connect and as long again to answer.
+
+    Returns the elapsed time in seconds; raises ``DatabaseError``.
+    """
+    connection = connections[alias]
+    start = time.perf_counter()
+    if connection.vendor == "postgresql":
+        # A fresh connection also notices max_connections being reached,
+        # and cannot hang on the worker's own connection.
+        params = connection.get_connection_params()
+        params["connect_timeout"] = max(2, math.ceil(timeout))
+        params["options"] = " ".join(
+            filter(
+                None,
+                [
+                    params.get("options"),
+                    f"-c statement_timeout={int(timeout * 1000)}",
+                ],
+            )
+        )
+        try:
+            with connection.Database.connect(**params) as probe:
+                probe.execute("SELECT 1")
+        except connection.Database.Error as exc:
+            raise DatabaseError(str(exc)) from exc
+    else:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    return time.perf_counter() - start
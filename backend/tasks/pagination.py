@@ -0,0 +1,244 @@
+"""Keyset (cursor) pagination for task lists."""
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+OrderKey = namedtuple("OrderKey", ["field", "descending"])
+
+TASK_ORDERING = (
+    OrderKey("sort_order", False),
+    OrderKey("created_at", False),
+    OrderKey("id", False),
+)
+
+# Most recently archived first; see ArchivedTask.Meta.
+ARCHIVE_ORDERING = (
+    OrderKey("archived_at", True),
+    OrderKey("id", True),
+)
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def order_by_args(ordering, reverse=False):
+    """Translate ``OrderKey``s into arguments for ``QuerySet.order_by``."""
+    args = []
+    for key in ordering:
+        expression = F(key.field)
+        descending = key.descending != reverse
+        args.append(expression.desc() if descending else expression.asc())
+    return args
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """
+    Build a ``Q`` selecting rows strictly after ``values`` in ``ordering``.
+
+    Expands the row comparison ``(a, b, c) > (x, y, z)`` into
+    ``a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`` and adds
+    the redundant bound ``a >= x`` so the database can start a range scan
+    on the composite index at the cursor instead of filtering from the
+    first row.
+    """
+    condition = Q()
+    equal = Q()
+    for key, value in zip(ordering, values):
+        descending = key.descending != reverse
+        lookup = "lt" if descending else "gt"
+        condition |= equal & Q(**{f"{key.field}__{lookup}": value})
+        equal &= Q(**{key.field: value})
+    first = ordering[0]
+    bound = "lte" if first.descending != reverse else "gte"
+    return Q(**{f"{first.field}__{bound}": values[0]}) & condition
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on the full list ordering.
+
+    Each cursor encodes the ordering values of the last row seen, so a
+    page is fetched with an indexed range scan regardless of depth and
+    inserts or moves elsewhere in the list never shift page boundaries.
+    Pass ``?all=true`` to disable pagination and return a plain list.
+    """
+
+    page_size = 50
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    all_query_param = "all"
+    ordering = TASK_ORDERING
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the query for the requested page plus one row, or None when
+        pagination is disabled.
+        """
+        if self.all_query_param in request.query_params and (
+            request.query_params[self.all_query_param].lower() in TRUE_VALUES
+        ):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.page_size = self.get_page_size(request)
+        self.cursor_values, self.reverse = self.decode_cursor(
+            request, queryset
+        )
+
+        queryset = queryset.order_by(
+            *order_by_args(self.ordering, reverse=self.reverse)
+        )
+        if self.cursor_values is not None:
+            queryset = queryset.filter(
+                keyset_filter(
+                    self.ordering, self.cursor_values, reverse=self.reverse
+                )
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        """Keep the page out of the rows fetched by ``get_page_queryset``."""
+        values, reverse = self.cursor_values, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        return rows
+
+    def get_ordering(self, request, queryset, view):
+        # Follow the ordering chosen by a filter backend, as DRF's own
+        # CursorPagination does with OrderingFilter.
+        for backend in getattr(view, "filter_backends", ()):
+            if hasattr(backend, "get_ordering"):
+                return backend().get_ordering(request, queryset, view)
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def _row_values(self, row):
+        if isinstance(row, dict):
+            return [row[key.field] for key in self.ordering]
+        return [getattr(row, key.field) for key in self.ordering]
+
+    def encode_cursor(self, values, reverse):
+        payload = {"v": values}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, default=str, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.rstrip("=")
+        )
+
+    def decode_cursor(self, request, queryset):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            values = payload["v"]
+            if not isinstance(values, list) or len(values) != len(
+                self.ordering
+            ):
+                raise ValueError(values)
+            values = [
+                self._to_python(queryset, key.field, value)
+                for key, value in zip(self.ordering, values)
+            ]
+            reverse = bool(payload.get("r"))
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def _to_python(self, queryset, name, value):
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise ValueError(value)
+        if name in queryset.query.annotations:
+            field = queryset.query.annotations[name].output_field
+        else:
+            field = queryset.model._meta.get_field(name)
+        return field.to_python(value)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._row_values(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._row_values(self.page[0]), True)
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+
+class ArchivedTaskCursorPagination(TaskCursorPagination):
+    ordering = ARCHIVE_ORDERING
@@ -0,0 +1,108 @@
+"""
+Parsers for task writes in other encodings than JSON.
+
+The NDJSON and CSV parsers stream bulk task imports. Both parse lazily:
+``request.data`` is an iterator of ``(line, record)`` pairs read from the
+request body as it is consumed, so an import of any size holds only the
+current record in memory. ``line`` is the 1-based line the record ends
+on, for error messages.
+
+``MessagePackParser`` reads request bodies encoded as
+``MessagePackRenderer`` renders them, for single and batch writes.
+"""
+
+import codecs
+import csv
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+_DecodeError = orjson.JSONDecodeError if orjson is not None else ValueError
+
+
+class NDJSONParser(BaseParser):
+    """One JSON object per line; blank lines are skipped."""
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return self.records(stream or ())
+
+    def records(self, stream):
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, _loads(text)
+            except (_DecodeError, UnicodeDecodeError) as exc:
+                raise ParseError(f"JSON parse error on line {line} - {exc}")
+
+
+class CSVParser(BaseParser):
+    """
+    CSV with a header row naming the fields. Cells are strings; empty
+    ones are left out, so those fields take their defaults (null for
+    nullable fields).
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        return self.records(stream or (), encoding)
+
+    def records(self, stream, encoding="utf-8"):
+        lines = codecs.iterdecode(stream, encoding)
+        reader = csv.reader(lines)
+        try:
+            header = next(reader, None)
+            if header is None:
+                return
+            for values in reader:
+                if not values:
+                    continue
+                if len(values) != len(header):
+                    raise ParseError(
+                        f"CSV parse error on line {reader.line_num} - "
+                        f"expected {len(header)} fields, got {len(values)}"
+                    )
+                yield reader.line_num, {
+                    name: value
+                    for name, value in zip(header, values)
+                    if value != ""
+                }
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ParseError(
+                f"CSV parse error on line {reader.line_num} - {exc}"
+            )
+
+
+class MessagePackParser(BaseParser):
+    """A MessagePack document, decoded as JSON would be."""
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            raise ParseError("MessagePack parse error - empty body")
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+# As tasks.renderers.BINARY_RENDERERS.
+BINARY_PARSERS = [MessagePackParser] if msgpack is not None else []
@@ -0,0 +1,248 @@
+"""
+Rank keys for manual task ordering.
+
+``Task.sort_order`` holds sparse integer ranks spaced ``RANK_GAP`` apart,
+so moving a task between two neighbours only rewrites the moved row with
+the midpoint of their ranks. When a gap is exhausted the whole list is
+renumbered in a single statement.
+
+Rank writes skip rows whose rank would not change, so ``updated_at``
+only moves for rows that did: a delta sync after a rebalance fetches
+the tasks that shifted, not the whole list.
+
+Rank changes are not edits: they leave ``Task.version`` alone, so a
+reorder or a background rebalance never fails a concurrent edit's
+``If-Match`` (``tasks.updates``).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import BigIntegerField, Case, Q, Value, When
+from django.utils import timezone
+
+from .models import Task
+from .signals import REORDERED, tasks_changed
+from .updates import write_fields
+
+logger = logging.getLogger(__name__)
+
+# Distance between neighbouring ranks after a rebalance. Sixteen bits
+# allows that many midpoint inserts into the same gap before it runs out.
+RANK_GAP = 1 << 16
+
+# Once a move leaves a gap narrower than this, a rebalance is scheduled
+# in the background so the next move into that gap stays a single write.
+RANK_LOW_WATER = 1 << 4
+
+ORDERING = ("sort_order", "created_at", "id")
+
+_REBALANCE_SQL = """
+UPDATE tasks_task
+SET sort_order = ranked.position * %s, updated_at = %s
+FROM (
+    SELECT id, ROW_NUMBER() OVER (
+        ORDER BY sort_order, created_at, id
+    ) AS position
+    FROM tasks_task
+) AS ranked
+WHERE tasks_task.id = ranked.id
+    AND tasks_task.sort_order <> ranked.position * %s
+"""
+
+_rebalance_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="task-rank-rebalance"
+)
+
+
+class RankError(ValueError):
+    """Raised when a move request does not describe a valid position."""
+
+
+def rebalance():
+    """
+    Renumber every task to ``RANK_GAP`` spacing in one statement and
+    return the number of rows whose rank changed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_REBALANCE_SQL, [RANK_GAP, timezone.now(), RANK_GAP])
+        count = cursor.rowcount
+    tasks_changed.send(sender=Task, action=REORDERED, ids=None)
+    return count
+
+
+def _rebalance_in_background():
+    close_old_connections()
+    try:
+        with transaction.atomic():
+            rebalance()
+    except Exception:  # pragma: no cover - logged and retried next move
+        logger.exception("Background task rank rebalance failed")
+    finally:
+        close_old_connections()
+
+
+def schedule_rebalance():
+    """Rebalance after the current transaction commits."""
+
+    def run():
+        if getattr(settings, "TASK_RANK_REBALANCE_ASYNC", True):
+            _rebalance_executor.submit(_rebalance_in_background)
+        else:
+            rebalance()
+
+    transaction.on_commit(run)
+
+
+def _after(task, exclude_id):
+    """Return the task immediately following ``task`` in list order."""
+    return (
+        Task.objects.select_for_update()
+        .exclude(id=exclude_id)
+        .filter(
+            Q(sort_order__gt=task.sort_order)
+            | Q(sort_order=task.sort_order, created_at__gt=task.created_at)
+            | Q(
+                sort_order=task.sort_order,
+                created_at=task.created_at,
+                id__gt=task.id,
+            )
+        )
+        .order_by(*ORDERING)
+        .first()
+    )
+
+
+def _before(task, exclude_id):
+    """Return the task immediately preceding ``task`` in list order."""
+    return (
+        Task.objects.select_for_update()
+        .exclude(id=exclude_id)
+        .filter(
+            Q(sort_order__lt=task.sort_order)
+            | Q(sort_order=task.sort_order, created_at__lt=task.created_at)
+            | Q(
+                sort_order=task.sort_order,
+                created_at=task.created_at,
+                id__lt=task.id,
+            )
+        )
+        .order_by(*[f"-{field}" for field in ORDERING])
+        .first()
+    )
+
+
+def _bounds(task, after_id, before_id):
+    # Neighbours are locked so a concurrent rebalance cannot renumber
+    # them between reading their ranks and writing the moved task.
+    ids = {i for i in (after_id, before_id) if i is not None}
+    if task.id in ids:
+        raise RankError("A task cannot be moved relative to itself.")
+    neighbours = Task.objects.select_for_update().in_bulk(ids)
+    missing = ids - set(neighbours)
+    if missing:
+        raise RankError(f"Unknown task id(s): {sorted(missing)}.")
+
+    after = neighbours.get(after_id)
+    before = neighbours.get(before_id)
+    if after is None and before is None:
+        raise RankError("Provide 'after', 'before' or both.")
+    if before is None:
+        before = _after(after, task.id)
+    elif after is None:
+        after = _before(before, task.id)
+
+    lower = after.sort_order if after is not None else None
+    upper = before.sort_order if before is not None else None
+    if lower is not None and upper is not None and lower > upper:
+        raise RankError("'after' must come before 'before' in list order.")
+    return lower, upper
+
+
+def _rank_between(lower, upper):
+    """Return a rank strictly between ``lower`` and ``upper``, or None."""
+    if lower is None:
+        return upper - RANK_GAP
+    if upper is None:
+        return lower + RANK_GAP
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+@transaction.atomic
+def move_task(task, after_id=None, before_id=None):
+    """
+    Place ``task`` between the tasks ``after_id`` and ``before_id`` and
+    return it as updated.
+
+    Either neighbour may be omitted to move the task to that end of the
+    list, or next to a single anchor. Only the moved row is written
+    unless the gap between the neighbours has run out.
+    """
+    lower, upper = _bounds(task, after_id, before_id)
+    rank = _rank_between(lower, upper)
+    if rank is None:
+        rebalance()
+        lower, upper = _bounds(task, after_id, before_id)
+        rank = _rank_between(lower, upper)
+    elif (
+        lower is not None
+        and upper is not None
+        and min(rank - lower, upper - rank) < RANK_LOW_WATER
+    ):
+        schedule_rebalance()
+
+    task = write_fields(task.id, {"sort_order": rank})
+    tasks_changed.send(sender=Task, action=REORDERED, ids=[task.id])
+    return task
+
+
+def _apply_order_values(orders, now):
+    rows = ", ".join(["(%s, %s)"] * len(orders))
+    params = [now] + [value for pair in orders.items() for value in pair]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE tasks_task
+            SET sort_order = new_order.sort_order, updated_at = %s
+            FROM (VALUES {rows}) AS new_order (id, sort_order)
+            WHERE tasks_task.id = new_order.id::bigint
+                AND tasks_task.sort_order <> new_order.sort_order
+            """,
+            params,
+        )
+        return cursor.rowcount
+
+
+@transaction.atomic
+def apply_order(orders):
+    """
+    Set ``sort_order`` for many tasks in a single ``UPDATE``.
+
+    ``orders`` maps task id to its new rank. Unknown ids and tasks
+    already at their rank are left alone. Returns the number of rows
+    updated.
+    """
+    if not orders:
+        return 0
+    now = timezone.now()
+    if connection.vendor == "postgresql":
+        count = _apply_order_values(orders, now)
+    else:
+        new_rank = Case(
+            *[
+                When(id=task_id, then=Value(rank))
+                for task_id, rank in orders.items()
+            ],
+            output_field=BigIntegerField(),
+        )
+        count = (
+            Task.objects.filter(id__in=orders)
+            .exclude(sort_order=new_rank)
+            .update(sort_order=new_rank, updated_at=now)
+        )
+    tasks_changed.send(sender=Task, action=REORDERED, ids=list(orders))
+    return count
@@ -0,0 +1,156 @@
+"""Renderers for task responses."""
+
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Types orjson formats differently from DRF's encoder are passed to
+# ``default``, which is left unset so they fall back to the stock path.
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+_LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes compact output with orjson.
+
+    The bytes are identical to the stock renderer's for task payloads,
+    which hold only strings, integers, booleans and nulls. Indented
+    output, non-string keys and types orjson would format differently
+    go through the stock encoder, as does everything when orjson is not
+    installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in _LINE_SEPARATORS:
+            ret = ret.replace(raw, escaped)
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one object per line, as ``FastJSONRenderer``
+    encodes it.
+
+    Streamed exports call ``render_header`` once and ``render_rows`` per
+    chunk of rows.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    _json = FastJSONRenderer()
+
+    def render_header(self, fields):
+        return b""
+
+    def render_rows(self, rows):
+        render = self._json.render
+        return b"".join([render(row) + b"\n" for row in rows])
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return self.render_rows(data if isinstance(data, list) else [data])
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack: the JSON representation in a compact binary encoding
+    that is faster to parse. Values JSON has no type for (dates,
+    decimals) are converted as DRF's JSON encoder converts them.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    _default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self._default)
+
+
+# Binary encodings whose optional modules are installed (the msgpack
+# extra); views list them after JSON.
+BINARY_RENDERERS = [MessagePackRenderer] if msgpack is not None else []
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row, for flat objects such as tasks. Nulls are empty
+    cells and booleans ``true``/``false``.
+
+    Streamed exports call ``render_header`` once and ``render_rows`` per
+    chunk of rows.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def _write(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+    def render_header(self, fields):
+        return self._write([fields])
+
+    def render_rows(self, rows):
+        return self._write(
+            [_csv_value(value) for value in row.values()] for row in rows
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not data:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return self.render_header(list(rows[0])) + self.render_rows(rows)
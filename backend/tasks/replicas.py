@@ -0,0 +1,96 @@
+"""
+Read-replica routing.
+
+When ``REPLICA_DATABASE`` names a database alias, ``ReplicaRouter`` sends
+the reads of views that opt in to it; everything else, including every
+write, uses the primary (``default``). ``ReplicaMiddleware`` decides per
+request: only safe methods of opted-in views read from the replica, and
+a client that sent a write is pinned to the primary for
+``REPLICA_PIN_SECONDS`` by a cookie, so it reads its own writes despite
+replication lag.
+
+Views opt in with a ``replica_reads`` attribute: True for function
+views, or the set of action names for viewsets.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "db_pin"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_alias():
+    """Return the alias to read from, or None for the primary."""
+    alias = settings.REPLICA_DATABASE
+    if alias is None or not _replica_reads.get():
+        return None
+    return alias
+
+
+def use_replica():
+    """
+    Route the rest of the current request's reads to the replica; see
+    ``ReplicaMiddleware``.
+    """
+    _replica_reads.set(True)
+
+
+@contextmanager
+def reads_from_replica(enabled=True):
+    """Route the reads of the enclosed code to the replica."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def allows_replica_reads(view_func, method):
+    """Return whether ``view_func`` may answer ``method`` from a replica."""
+    cls = getattr(view_func, "cls", None)
+    if cls is not None:
+        # A viewset: ``actions`` maps methods to action names.
+        actions = getattr(view_func, "actions", None) or {}
+        return actions.get(method.lower()) in getattr(cls, "replica_reads", ())
+    return getattr(view_func, "replica_reads", False) is True
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+def pin(response):
+    """Keep the client on the primary for ``REPLICA_PIN_SECONDS``."""
+    response.set_cookie(
+        PIN_COOKIE,
+        "1",
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
+
+
+class ReplicaRouter:
+    """Send opted-in reads to ``REPLICA_DATABASE`` and writes to default."""
+
+    def db_for_read(self, model, **hints):
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        # Instances read from the replica are saved to the primary.
+        if settings.REPLICA_DATABASE is not None:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,222 @@
+"""
+Rendered task list responses, shared by every worker.
+
+List responses (JSON and MessagePack) are stored as rendered bytes in
+the ``responses`` cache (``CACHES``): a ``FileCache`` directory that
+every worker on the host shares (``RESPONSE_CACHE_LOCATION``; under
+``/dev/shm`` it stays in memory), or Redis given a ``redis://`` URL,
+shared by every host.
+
+Keys hold the task list version of ``tasks.versions`` besides the URL
+and the negotiated media type. Every write to the tasks bumps the
+version in its own transaction, so invalidation is whole-collection:
+any write leaves every cached list unreachable, and nothing is served
+stale. That is deliberate: a write can move tasks into or out of any
+filtered, sorted or paginated list, and one counter keeps the check to
+a single primary-key read that the ETags share. Unreachable entries
+expire after ``RESPONSE_CACHE_TIMEOUT``. Before the first write
+counted by the triggers there is no version (rows may predate them), so
+lists are not cached.
+
+When an entry is missing, the worker that takes its lock in the cache
+rebuilds it and the others wait for it up to ``RESPONSE_CACHE_WAIT``
+seconds before building the response themselves. Bodies over
+``RESPONSE_CACHE_MAX_BYTES`` are not stored: a marker sends requests
+for them straight to the database.
+
+Lookups are counted by result in ``response_cache_requests_total`` and
+rebuilds timed in ``response_cache_rebuild_seconds``.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from collections import namedtuple
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.http import HttpResponse
+from django.utils.http import urlencode
+
+from .monitoring import RESPONSE_CACHE, RESPONSE_CACHE_REBUILD
+
+ALIAS = "responses"
+
+# Renderer formats whose output depends only on the URL and the media
+# type; browsable API pages hold per-user forms and tokens.
+CACHED_FORMATS = {"json", "msgpack"}
+
+# Longer than any rebuild; frees the lock of a worker that died.
+LOCK_SECONDS = 30
+
+_POLL_SECONDS = 0.01
+
+Entry = namedtuple("Entry", ["content_type", "content"])
+
+
+class FileCache(FileBasedCache):
+    """
+    ``FileBasedCache`` whose ``add`` is atomic across processes, so it
+    can hold the rebuild locks.
+    """
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            for _ in range(2):
+                try:
+                    # Fails if the file exists, unlike a rename.
+                    os.link(tmp_path, fname)
+                    return True
+                except FileExistsError:
+                    # Removes an expired file, then try again.
+                    if self.has_key(key, version):
+                        return False
+            return False
+        finally:
+            os.remove(tmp_path)
+
+
+def list_key(version, request, media_type):
+    """
+    Return the cache key of a task list response, or None if the list
+    may not be cached.
+    """
+    if version.changed_at is None:
+        return None
+    # Page links are absolute; parameter order does not matter.
+    url = request.build_absolute_uri(request.path)
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    digest = hashlib.sha256(f"{media_type} {url}?{query}".encode())
+    return (
+        f"tasks.list:{version.version}:{version.changed_at.timestamp()}:"
+        f"{digest.hexdigest()}"
+    )
+
+
+def _stored(entry):
+    # Too large: a marker without content.
+    if len(entry.content) > settings.RESPONSE_CACHE_MAX_BYTES:
+        return Entry(entry.content_type, None)
+    return entry
+
+
+def get_or_build(key, build):
+    """
+    Return the ``Entry`` cached under ``key``, or call ``build`` to make
+    and store it, one worker at a time.
+    """
+    cache = caches[ALIAS]
+    entry = cache.get(key)
+    if entry is None:
+        lock = f"{key}:lock"
+        if cache.add(lock, True, LOCK_SECONDS):
+            try:
+                return _rebuild(cache, key, build, "miss")
+            finally:
+                cache.delete(lock)
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT
+        while entry is None and time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            entry = cache.get(key)
+        if entry is None:
+            return _rebuild(cache, key, build, "wait_timeout")
+        result = "waited"
+    else:
+        result = "hit"
+    if entry.content is None:
+        return _rebuild(cache, key, build, "bypass", store=False)
+    RESPONSE_CACHE.labels(result).inc()
+    return entry
+
+
+def _rebuild(cache, key, build, result, store=True):
+    start = time.perf_counter()
+    entry = build()
+    RESPONSE_CACHE_REBUILD.observe(time.perf_counter() - start)
+    RESPONSE_CACHE.labels(result).inc()
+    if store:
+        cache.set(key, _stored(entry), settings.RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+async def aget_or_build(key, build):
+    """Async ``get_or_build``, with an async ``build``."""
+    cache = caches[ALIAS]
+    entry = await cache.aget(key)
+    if entry is None:
+        lock = f"{key}:lock"
+        if await cache.aadd(lock, True, LOCK_SECONDS):
+            try:
+                return await _arebuild(cache, key, build, "miss")
+            finally:
+                await cache.adelete(lock)
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT
+        while entry is None and time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            entry = await cache.aget(key)
+        if entry is None:
+            return await _arebuild(cache, key, build, "wait_timeout")
+        result = "waited"
+    else:
+        result = "hit"
+    if entry.content is None:
+        return await _arebuild(cache, key, build, "bypass", store=False)
+    RESPONSE_CACHE.labels(result).inc()
+    return entry
+
+
+async def _arebuild(cache, key, build, result, store=True):
+    start = time.perf_counter()
+    entry = await build()
+    RESPONSE_CACHE_REBUILD.observe(time.perf_counter() - start)
+    RESPONSE_CACHE.labels(result).inc()
+    if store:
+        await cache.aset(key, _stored(entry), settings.RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+def to_response(entry):
+    return HttpResponse(entry.content, content_type=entry.content_type)
+
+
+def cached_list(view):
+    """
+    Serve a ``TaskViewSet`` list from the response cache; applied inside
+    ``tasks.versions.conditional``, which reads the version.
+    """
+
+    @wraps(view)
+    def wrapped(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        key = None
+        if settings.RESPONSE_CACHE and renderer.format in CACHED_FORMATS:
+            key = list_key(
+                self.collection_version, request, request.accepted_media_type
+            )
+        if key is None:
+            return view(self, request, *args, **kwargs)
+
+        def build():
+            # Lists answer 200 or raise.
+            response = view(self, request, *args, **kwargs)
+            content = renderer.render(
+                response.data,
+                request.accepted_media_type,
+                self.get_renderer_context(),
+            )
+            return Entry(request.accepted_media_type, content)
+
+        return to_response(get_or_build(key, build))
+
+    return wrapped
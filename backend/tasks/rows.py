@@ -0,0 +1,224 @@
+"""
+Fast serialization of task lists.
+
+``ModelSerializer`` builds a model instance per row and converts it field
+by field through the serializer machinery. For list responses the same
+representation is produced here from ``values_list`` tuples by a row
+encoder that is generated once per serializer class, so each row costs a
+single dict display. Fields without a known fast conversion fall back to
+the serializer field's own ``to_representation``.
+
+Only the columns of the fields encoded are selected: an encoder for a
+subset of the fields (sparse fieldsets, ``tasks.fieldsets``) leaves the
+other columns in the database, and ``TruncatedCharField`` columns are
+cut by the query.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import CharField, F, Func
+from django.db.models.functions import Left
+from django.utils import timezone
+from rest_framework import ISO_8601, fields
+from rest_framework.settings import api_settings
+
+from .serializers import TruncatedCharField
+
+# Serializer fields whose representation of a database value is the
+# value itself.
+_IDENTITY_FIELDS = (
+    fields.IntegerField,
+    fields.CharField,
+    fields.BooleanField,
+)
+
+
+def _iso_datetime(value, tz):
+    # Mirrors DateTimeField.to_representation for aware values. Strings
+    # were already formatted by the database (see ``UTCISOFormat``).
+    if value is None or value.__class__ is str:
+        return value
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class UTCISOFormat(Func):
+    """
+    Format a datetime column as ``DateTimeField`` represents it in UTC.
+
+    Parsing timestamps into ``datetime`` objects only to format them again
+    is most of the cost of reading a large list, so the database produces
+    the final string instead.
+    """
+
+    output_field = CharField()
+    vendors = {"postgresql", "sqlite"}
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        # isoformat() leaves out the fraction when it is zero.
+        template = (
+            "CASE WHEN mod(date_part('microseconds', %(expressions)s)"
+            "::bigint, 1000000) = 0 "
+            "THEN to_char(%(expressions)s AT TIME ZONE 'UTC', "
+            '\'YYYY-MM-DD"T"HH24:MI:SS"Z"\') '
+            "ELSE to_char(%(expressions)s AT TIME ZONE 'UTC', "
+            '\'YYYY-MM-DD"T"HH24:MI:SS.US"Z"\') END'
+        )
+        return self.as_sql(
+            compiler, connection, template=template, **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Stored as UTC text in str(datetime) form.
+        template = "REPLACE(%(expressions)s, ' ', 'T') || 'Z'"
+        return self.as_sql(
+            compiler, connection, template=template, **extra_context
+        )
+
+
+def _iso_date(value):
+    return None if value is None else value.isoformat()
+
+
+def _is_iso(field, default):
+    output_format = getattr(field, "format", default)
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def _expression(field, index, namespace):
+    value = f"row[{index}]"
+    kind = type(field)
+    if kind in _IDENTITY_FIELDS:
+        return value
+    if kind is TruncatedCharField:
+        # Cut by the query.
+        return value
+    if kind is fields.ChoiceField and all(
+        isinstance(key, str) for key in field.choices
+    ):
+        return value
+    if kind is fields.DateField and _is_iso(field, api_settings.DATE_FORMAT):
+        return f"_iso_date({value})"
+    if (
+        kind is fields.DateTimeField
+        and settings.USE_TZ
+        and not hasattr(field, "timezone")
+        and _is_iso(field, api_settings.DATETIME_FORMAT)
+    ):
+        return f"_iso_datetime({value}, tz)"
+    name = f"_field_{index}"
+    namespace[name] = field.to_representation
+    return f"(None if {value} is None else {name}({value}))"
+
+
+class RowEncoder:
+    """
+    Encode ``values_list`` rows exactly as ``serializer_class`` would.
+
+    ``columns`` are the model fields to select, in the order the encoder
+    expects them; ``formatted`` are the datetime columns the database can
+    format itself and ``truncated`` maps the columns it cuts to their
+    length.
+    """
+
+    def __init__(self, serializer_class, columns, readable):
+        self.serializer_class = serializer_class
+        self.columns = columns
+        self.truncated = {
+            column: field.length
+            for column, field in zip(columns, readable)
+            if type(field) is TruncatedCharField
+        }
+        namespace = {
+            "_iso_date": _iso_date,
+            "_iso_datetime": _iso_datetime,
+        }
+        expressions = [
+            _expression(field, index, namespace)
+            for index, field in enumerate(readable)
+        ]
+        self.formatted = {
+            column
+            for column, expression in zip(columns, expressions)
+            if expression.startswith("_iso_datetime(")
+        }
+        items = ", ".join(
+            f"{field.field_name!r}: {expression}"
+            for field, expression in zip(readable, expressions)
+        )
+        source = (
+            f"def encode(rows, tz):\n    return [{{{items}}} for row in rows]"
+        )
+        exec(
+            compile(source, f"<{serializer_class.__name__} rows>", "exec"),
+            namespace,
+        )
+        self._encode = namespace["encode"]
+
+    def rows(self, queryset, keys=()):
+        """
+        Select the encoder's columns from ``queryset`` as named tuples.
+
+        Annotations (such as ordering keys) and the raw values of ``keys``
+        are appended after them so keyset pagination can read them by
+        name.
+        """
+        aliases = {column: f"{column}_left" for column in self.truncated}
+        expressions = {
+            aliases[column]: Left(F(column), length)
+            for column, length in self.truncated.items()
+        }
+        vendor = connections[queryset.db].vendor
+        if (
+            self.formatted
+            and vendor in UTCISOFormat.vendors
+            and timezone.get_current_timezone_name() == "UTC"
+        ):
+            for column in self.formatted:
+                aliases[column] = f"{column}_iso"
+                expressions[aliases[column]] = UTCISOFormat(F(column))
+        if expressions:
+            queryset = queryset.annotate(**expressions)
+        names = [aliases.get(column, column) for column in self.columns]
+        for name in [*queryset.query.annotations, *keys]:
+            if name not in names:
+                names.append(name)
+        return queryset.values_list(*names, named=True)
+
+    def encode(self, rows):
+        """Return the representation of every row as a list of dicts."""
+        return self._encode(rows, timezone.get_current_timezone())
+
+
+@lru_cache(maxsize=None)
+def get_row_encoder(serializer_class, fields=None):
+    """
+    Return a ``RowEncoder`` for ``serializer_class``, limited to the
+    ``fields`` named (a tuple) if given, or None when one of its fields is
+    not a plain model column.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    readable = [
+        field
+        for field in serializer.fields.values()
+        if not field.write_only
+        and (fields is None or field.field_name in fields)
+    ]
+    columns = []
+    for field in readable:
+        if field.source == "*" or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.is_relation or not model_field.concrete:
+            return None
+        columns.append(model_field.attname)
+    return RowEncoder(serializer_class, tuple(columns), readable)
@@ -0,0 +1,124 @@
+"""
+Full-text search over task titles and descriptions.
+
+On PostgreSQL tasks carry a generated ``search_vector`` column (title
+weighted above description) with a GIN index, added by migration 0007.
+SQLite, used by the test suite, gets an FTS5 index kept in sync by
+triggers. Both stem English words and match every term in the query;
+results are annotated with ``search_rank``, higher for better matches.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+SEARCH_CONFIG = "english"
+
+_TSQUERY = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+
+_FTS_TABLE = "tasks_task_fts"
+
+# SQLite rebuilds a table for most schema changes, which drops its
+# triggers, so these are (re)installed after every migrate instead of by
+# a migration.
+_FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5(
+        title, description,
+        content='tasks_task', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_insert
+    AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {_FTS_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_delete
+    AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {_FTS_TABLE} ({_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_update
+    AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO {_FTS_TABLE} ({_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {_FTS_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"INSERT INTO {_FTS_TABLE} ({_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def _fts5_query(text):
+    # Quote every word so user input is never parsed as FTS5 syntax.
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+def search_tasks(queryset, text):
+    """
+    Filter ``queryset`` to tasks matching ``text``.
+
+    Adds a ``search_rank`` annotation; order by it descending for the
+    best matches first.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        # float8 so ranks round-trip exactly through pagination cursors.
+        rank = RawSQL(
+            f"ts_rank(tasks_task.search_vector, {_TSQUERY})::float8",
+            [text],
+            output_field=FloatField(),
+        )
+        match = RawSQL(
+            f"tasks_task.search_vector @@ {_TSQUERY}",
+            [text],
+            output_field=BooleanField(),
+        )
+        return queryset.annotate(search_rank=rank).filter(match)
+
+    if vendor == "sqlite":
+        query = _fts5_query(text)
+        if not query:
+            return queryset.annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            ).none()
+        rank = RawSQL(
+            f"SELECT -bm25({_FTS_TABLE}, 4.0, 1.0) FROM {_FTS_TABLE} "
+            f"WHERE {_FTS_TABLE} MATCH %s "
+            f"AND {_FTS_TABLE}.rowid = tasks_task.id",
+            [query],
+            output_field=FloatField(),
+        )
+        matches = RawSQL(
+            f"SELECT rowid FROM {_FTS_TABLE} WHERE {_FTS_TABLE} MATCH %s",
+            [query],
+        )
+        return queryset.annotate(search_rank=rank).filter(id__in=matches)
+
+    condition = Q()
+    for word in text.split():
+        condition &= Q(title__icontains=word) | Q(description__icontains=word)
+    return queryset.annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    ).filter(condition)
+
+
+@receiver(post_migrate, dispatch_uid="tasks.search.install_sqlite_index")
+def install_sqlite_index(sender, using, **kwargs):
+    connection = connections[using]
+    if sender.label != "tasks" or connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for statement in _FTS_SCHEMA:
+            cursor.execute(statement)
@@ -1,9 +1,134 @@
 from rest_framework import serializers
+from rest_framework.fields import empty
 
-from .models import Task
+from .batch import MAX_BATCH_SIZE
+from .models import ArchivedTask, Task
+
+# Characters of the description in the summary representation.
+SUMMARY_DESCRIPTION_LENGTH = 200
+
+
+class TruncatedCharField(serializers.CharField):
+    """
+    Read-only text cut to its first ``length`` characters. Lists cut it
+    in the query, so the rest never leaves the database (``tasks.rows``).
+    """
+
+    def __init__(self, length, **kwargs):
+        self.length = length
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return super().to_representation(value)[: self.length]
 
 
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = "__all__"
+        # Incremented by every edit; see tasks.updates.
+        read_only_fields = ["version"]
+
+
+class TaskSummarySerializer(TaskSerializer):
+    """Tasks with a preview of the description, for lists (``?view=``)."""
+
+    description = TruncatedCharField(SUMMARY_DESCRIPTION_LENGTH)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedTask
+        fields = "__all__"
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Neighbours to place a task between; either may be omitted."""
+
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+
+class TaskBatchCreateSerializer(serializers.Serializer):
+    tasks = TaskSerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+
+
+class TaskBatchUpdateSerializer(serializers.Serializer):
+    """
+    Partial updates for many tasks, each identified by ``id``.
+
+    Errors are keyed by item position, as DRF reports them for nested
+    lists.
+    """
+
+    tasks = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+    def validate_tasks(self, items):
+        id_field = serializers.IntegerField()
+        ids = []
+        for item in items:
+            try:
+                ids.append(id_field.run_validation(item.get("id", empty)))
+            except serializers.ValidationError as exc:
+                ids.append(exc.detail)
+        tasks = Task.objects.select_for_update().in_bulk(
+            [task_id for task_id in ids if isinstance(task_id, int)]
+        )
+
+        # One serializer validates every item; building its fields per
+        # item would dominate the cost of a large batch.
+        item_serializer = TaskSerializer(partial=True)
+        changes = []
+        errors = {}
+        seen = set()
+        for index, (item, task_id) in enumerate(zip(items, ids)):
+            if not isinstance(task_id, int):
+                errors[index] = {"id": task_id}
+                continue
+            if task_id in seen:
+                errors[index] = {"id": ["Duplicate task id."]}
+                continue
+            seen.add(task_id)
+            if task_id not in tasks:
+                errors[index] = {"id": ["Task not found."]}
+                continue
+            data = {key: value for key, value in item.items() if key != "id"}
+            try:
+                data = item_serializer.run_validation(data)
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+                continue
+            changes.append((tasks[task_id], data))
+        if errors:
+            raise serializers.ValidationError(errors)
+        return changes
+
+
+class TaskBatchDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+    def validate_ids(self, ids):
+        existing = set(
+            Task.objects.select_for_update()
+            .filter(id__in=ids)
+            .values_list("id", flat=True)
+        )
+        errors = {
+            index: ["Task not found."]
+            for index, task_id in enumerate(ids)
+            if task_id not in existing
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        return list(dict.fromkeys(ids))
@@ -0,0 +1,16 @@
+"""Signals sent when tasks change."""
+
+from django.dispatch import Signal
+
+CREATED = "create"
+UPDATED = "update"
+DELETED = "delete"
+REORDERED = "reorder"
+ARCHIVED = "archive"
+
+# Sent inside the writing transaction after tasks are created, updated,
+# deleted, reordered or archived (moved out of the task list, see
+# tasks.archive). Receivers get ``action`` (one of the constants
+# above) and ``ids``, the affected primary keys, or ``None`` when every
+# task may have changed.
+tasks_changed = Signal()
@@ -0,0 +1,199 @@
+"""
+Task counts by priority, status and due date for dashboards.
+
+``TaskStats`` holds one row per (priority, completed, due date) with the
+number of tasks in it, archived ones included, so counts are read from a
+few hundred rows rather than by scanning the tasks. Triggers keep it
+current in the same transaction as every write to ``tasks_task`` and
+``tasks_archivedtask``, bulk statements and PostgreSQL ``COPY`` included:
+statement-level triggers on PostgreSQL (migrations 0008 and 0009) apply
+each statement's net change in one upsert, and row-level triggers on
+SQLite. Keeping due dates rather than an overdue
+count lets "overdue" move with the calendar without touching a row.
+
+``python manage.py rebuild_task_stats`` recounts the table and checks it.
+"""
+
+import datetime
+
+from django.db import connections, transaction
+from django.db.models import Q, Sum
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ArchivedTask, Task, TaskStats
+
+_TABLE = TaskStats._meta.db_table
+# The counted tables and the prefix of their SQLite trigger names.
+_COUNTED = {
+    Task._meta.db_table: _TABLE,
+    ArchivedTask._meta.db_table: f"{_TABLE}_archived",
+}
+_NO_DUE_DATE = datetime.date.max.isoformat()
+
+_ALL_TASKS = " UNION ALL ".join(
+    f"SELECT priority, completed, due_date FROM {table}" for table in _COUNTED
+)
+
+_RECOUNT = f"""
+    SELECT priority, completed,
+        COALESCE(due_date, '{_NO_DUE_DATE}') AS due_key, COUNT(*) AS count
+    FROM ({_ALL_TASKS}) AS tasks
+    GROUP BY 1, 2, 3
+"""
+
+_UPSERT = f"""
+    INSERT INTO {_TABLE} (priority, completed, due_key, count)
+    VALUES ({{row}}.priority, {{row}}.completed,
+        COALESCE({{row}}.due_date, '{_NO_DUE_DATE}'), {{delta}})
+    ON CONFLICT (priority, completed, due_key)
+    DO UPDATE SET count = count + excluded.count;
+"""
+
+# SQLite rebuilds a table for most schema changes, which drops its
+# triggers, so these are (re)installed after every migrate; see
+# tasks.search.
+_SQLITE_TRIGGERS = [
+    statement
+    for table, name in _COUNTED.items()
+    for statement in [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_insert
+        AFTER INSERT ON {table} BEGIN
+            {_UPSERT.format(row="new", delta=1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_delete
+        AFTER DELETE ON {table} BEGIN
+            {_UPSERT.format(row="old", delta=-1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_update
+        AFTER UPDATE OF priority, completed, due_date ON {table} BEGIN
+            {_UPSERT.format(row="old", delta=-1)}
+            {_UPSERT.format(row="new", delta=1)}
+        END
+        """,
+    ]
+]
+
+
+def _rebuild(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Waits for in-flight writers and holds off new ones; reads
+            # carry on.
+            cursor.execute(f"LOCK TABLE {', '.join(_COUNTED)} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {_TABLE} (priority, completed, due_key, count) "
+            + _RECOUNT
+        )
+        return cursor.rowcount
+
+
+def rebuild_stats(using="default"):
+    """
+    Replace ``TaskStats`` with a full recount of the tasks.
+
+    Writes to tasks wait until it is done. Returns the number of rows.
+    """
+    with transaction.atomic(using=using):
+        return _rebuild(connections[using])
+
+
+def verify_stats(using="default"):
+    """
+    Compare ``TaskStats`` with a full recount, in a single statement so
+    both sides see the same tasks.
+
+    Returns the differing groups as ``(priority, completed, due_date,
+    stored, actual)``; an empty list means the counts are right.
+    """
+    sql = f"""
+        SELECT priority, completed, due_key, SUM(stored), SUM(actual)
+        FROM (
+            SELECT priority, completed, due_key, count AS stored,
+                0 AS actual
+            FROM {_TABLE}
+            UNION ALL
+            SELECT priority, completed, due_key, 0, count
+            FROM ({_RECOUNT}) AS recount
+        ) AS counts
+        GROUP BY priority, completed, due_key
+        HAVING SUM(stored) <> SUM(actual)
+        ORDER BY priority, completed, due_key
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+    field = TaskStats._meta.get_field("due_key")
+    differences = []
+    for priority, completed, due_key, stored, actual in rows:
+        due_key = field.to_python(due_key)
+        differences.append(
+            (
+                priority,
+                bool(completed),
+                None if due_key == datetime.date.max else due_key,
+                stored,
+                actual,
+            )
+        )
+    return differences
+
+
+def task_stats(queryset=None, today=None):
+    """
+    Return open, completed and overdue counts, overall and by priority.
+
+    Overdue tasks are open ones due before ``today``, the current date by
+    default.
+    """
+    if queryset is None:
+        queryset = TaskStats.objects.all()
+    if today is None:
+        today = timezone.localdate()
+    rows = queryset.values("priority", "completed").annotate(
+        tasks=Sum("count"),
+        overdue=Sum("count", filter=Q(due_key__lt=today)),
+    )
+    by_priority = {
+        priority: {"open": 0, "completed": 0, "overdue": 0}
+        for priority, _ in Task.PRIORITY_CHOICES
+    }
+    for row in rows:
+        counts = by_priority.setdefault(
+            row["priority"], {"open": 0, "completed": 0, "overdue": 0}
+        )
+        if row["completed"]:
+            counts["completed"] += row["tasks"]
+        else:
+            counts["open"] += row["tasks"]
+            counts["overdue"] += row["overdue"] or 0
+    totals = {
+        key: sum(counts[key] for counts in by_priority.values())
+        for key in ["open", "completed", "overdue"]
+    }
+    return {
+        "total": totals["open"] + totals["completed"],
+        **totals,
+        "by_priority": by_priority,
+    }
+
+
+@receiver(post_migrate, dispatch_uid="tasks.stats.install_sqlite_triggers")
+def install_sqlite_triggers(sender, using, **kwargs):
+    connection = connections[using]
+    if sender.label != "tasks" or connection.vendor != "sqlite":
+        return
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            for statement in _SQLITE_TRIGGERS:
+                cursor.execute(statement)
+        # Writes made while the triggers were missing are not counted.
+        _rebuild(connection)
@@ -0,0 +1,106 @@
+"""
+Delta sync: report tasks changed or deleted since a client's last sync.
+
+A sync token is the server time, in microseconds, at which a sync was
+answered. Rows are matched on ``Task.updated_at`` and
+``TaskTombstone.deleted_at`` with a small overlap window, because a row is
+stamped before its transaction commits and may become visible only after
+a sync that started later. Clients apply changes by id, so replaying the
+overlap is harmless.
+"""
+
+import datetime
+from collections import namedtuple
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Task, TaskTombstone
+from .signals import ARCHIVED, DELETED, tasks_changed
+
+SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+Changes = namedtuple("Changes", ["token", "changed", "deleted"])
+
+
+class SyncTokenError(ValueError):
+    """Raised for a sync token that cannot be parsed."""
+
+
+class SyncTokenExpired(SyncTokenError):
+    """Raised when tombstones older than the token have been purged."""
+
+
+def tombstone_retention():
+    return datetime.timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+
+
+def encode_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_token(token):
+    try:
+        micros = int(token)
+        return datetime.datetime.fromtimestamp(
+            micros / 1_000_000, tz=datetime.timezone.utc
+        )
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise SyncTokenError("Invalid sync token.")
+
+
+def sync_start(token, now):
+    """
+    Return the time to report changes from for ``token``, including the
+    overlap window.
+    """
+    since = decode_token(token)
+    if since < now - tombstone_retention():
+        raise SyncTokenExpired(
+            "Sync token is older than the tombstone retention period."
+        )
+    return since - SYNC_OVERLAP
+
+
+def changes_since(token=None):
+    """
+    Return the tasks changed and ids deleted since ``token``.
+
+    Without a token every task is returned, in list order, together with
+    a token to pass on the next call.
+    """
+    now = timezone.now()
+    if not token:
+        changed = Task.objects.order_by("sort_order", "created_at", "id")
+        return Changes(encode_token(now), changed, [])
+
+    since = sync_start(token, now)
+    changed = Task.objects.filter(updated_at__gt=since).order_by(
+        "updated_at", "id"
+    )
+    deleted = list(
+        TaskTombstone.objects.filter(deleted_at__gt=since)
+        .order_by("task_id")
+        .values_list("task_id", flat=True)
+        .distinct()
+    )
+    return Changes(encode_token(now), changed, deleted)
+
+
+def purge_tombstones():
+    """Delete tombstones past the retention period."""
+    cutoff = timezone.now() - tombstone_retention()
+    deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+@receiver(tasks_changed, dispatch_uid="tasks.sync.record_tombstones")
+def record_tombstones(sender, action, ids, **kwargs):
+    # Archived tasks leave the list too, so clients drop them the same way.
+    if action not in (DELETED, ARCHIVED) or not ids:
+        return
+    now = timezone.now()
+    TaskTombstone.objects.bulk_create(
+        [TaskTombstone(task_id=task_id, deleted_at=now) for task_id in ids]
+    )
@@ -0,0 +1,161 @@
+"""
+Streaming export and bulk import of tasks.
+
+Exports read tasks through a server-side cursor (``iterator``), encode
+them a chunk at a time with the row encoder and hand each chunk to a
+renderer as soon as it is ready, so memory use does not grow with the
+number of tasks. Imports validate each record as ``TaskSerializer`` would
+create it and stream the valid rows into PostgreSQL with ``COPY`` (batched
+``bulk_create`` elsewhere) in one transaction: if any record is invalid,
+nothing is written.
+"""
+
+from itertools import islice
+
+from django.db import connections, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Task
+from .rows import get_row_encoder
+from .serializers import TaskSerializer
+from .signals import CREATED, tasks_changed
+
+EXPORT_CHUNK_SIZE = 2000
+
+IMPORT_BATCH_SIZE = 5000
+
+# An import stops reading after this many invalid records.
+MAX_IMPORT_ERRORS = 100
+
+
+def export_fields():
+    """Return the field names of an exported task, in order."""
+    return [
+        name
+        for name, field in TaskSerializer().fields.items()
+        if not field.write_only
+    ]
+
+
+def _pinned(queryset):
+    # The response is streamed after the view has returned, outside the
+    # request's database routing; keep the database chosen for it.
+    return queryset.using(queryset.db)
+
+
+def export_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the representation of every task in lists of ``chunk_size``."""
+    encoder = get_row_encoder(TaskSerializer)
+    rows = encoder.rows(_pinned(queryset)).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield encoder.encode(chunk)
+
+
+async def aexport_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Async ``export_chunks``, for responses served over ASGI."""
+    encoder = get_row_encoder(TaskSerializer)
+    rows = encoder.rows(_pinned(queryset))
+    chunk = []
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield encoder.encode(chunk)
+            chunk = []
+    if chunk:
+        yield encoder.encode(chunk)
+
+
+def stream_export(queryset, renderer, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield ``queryset`` rendered by ``renderer``, a chunk at a time."""
+    yield renderer.render_header(export_fields())
+    for chunk in export_chunks(queryset, chunk_size):
+        yield renderer.render_rows(chunk)
+
+
+async def astream_export(queryset, renderer, chunk_size=EXPORT_CHUNK_SIZE):
+    """Async ``stream_export``."""
+    yield renderer.render_header(export_fields())
+    async for chunk in aexport_chunks(queryset, chunk_size):
+        yield renderer.render_rows(chunk)
+
+
+class _Columns:
+    """The columns an import writes and their values for one task."""
+
+    def __init__(self, serializer):
+        fields = [
+            Task._meta.get_field(field.source)
+            for field in serializer.fields.values()
+            if not field.read_only
+        ]
+        self.defaults = [
+            (field.attname, field.get_default()) for field in fields
+        ]
+        self.names = [name for name, _ in self.defaults] + [
+            "created_at",
+            "updated_at",
+        ]
+
+    def values(self, data, now):
+        return [data.get(name, default) for name, default in self.defaults] + [
+            now,
+            now,
+        ]
+
+
+def import_tasks(records, using="default"):
+    """
+    Create a task from each ``(line, data)`` record; returns the count.
+
+    Records are validated as ``TaskSerializer`` validates a create, with
+    read-only fields such as ``id`` ignored. Raises ``ValidationError``
+    with the errors by line if any record is invalid, in which case no
+    task is written.
+    """
+    with transaction.atomic(using=using):
+        return _import(records, connections[using])
+
+
+def _import(records, connection):
+    serializer = TaskSerializer()
+    columns = _Columns(serializer)
+    now = timezone.now()
+    errors = {}
+    count = 0
+
+    def rows():
+        nonlocal count
+        for line, data in records:
+            try:
+                data = serializer.run_validation(data)
+            except serializers.ValidationError as exc:
+                errors[line] = exc.detail
+                if len(errors) >= MAX_IMPORT_ERRORS:
+                    return
+                continue
+            if not errors:
+                count += 1
+                yield columns.values(data, now)
+
+    if connection.vendor == "postgresql":
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            with cursor.copy(
+                f"COPY {quote(Task._meta.db_table)} "
+                f"({', '.join(map(quote, columns.names))}) FROM STDIN"
+            ) as copy:
+                for row in rows():
+                    copy.write_row(row)
+    else:
+        batches = rows()
+        while batch := list(islice(batches, IMPORT_BATCH_SIZE)):
+            Task.objects.using(connection.alias).bulk_create(
+                Task(**dict(zip(columns.names, row))) for row in batch
+            )
+    if errors:
+        raise serializers.ValidationError({"lines": errors})
+    if count:
+        # COPY does not return the new ids.
+        tasks_changed.send(sender=Task, action=CREATED, ids=None)
+    return count
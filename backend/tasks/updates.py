@@ -0,0 +1,171 @@
+"""
+Single-statement task updates with optimistic concurrency.
+
+``update_task`` writes the submitted fields, validated without reading
+the task, in one ``UPDATE ... RETURNING`` that stamps ``updated_at``,
+increments the task's ``version`` and returns the updated row. A PATCH
+that flips ``completed`` costs that one statement on ``tasks_task``
+instead of a ``SELECT`` and an ``UPDATE`` of every column,
+``description`` included. The task list version is bumped by a trigger
+on the same statement (``tasks.versions``), so the update runs without a
+transaction of its own: a toggle is one round trip to the database.
+
+Every edit of a task increments ``Task.version``, which is part of its
+representation. Writes of ``UNVERSIONED_FIELDS`` alone (moves, reorders
+and rebalances, which only change ranks) do not, so they never fail an
+edit made from the version before them. A client that sends the version
+it last saw in the ``version`` field of the body only updates the task
+if it is still at that version, and gets ``412 Precondition Failed``
+otherwise instead of overwriting a concurrent edit; without it the last
+write wins.
+
+``If-Match`` keeps its HTTP meaning: it names the task's ``ETag``, which
+is the task list's (``tasks.versions``) so that conditional GETs never
+read the task. The update is made only if no task has been written since
+that tag, checked under a lock on the counter; any write to the list
+fails it, so the ``version`` field is the finer check.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+from .models import Task
+from .signals import UPDATED, tasks_changed
+from .versions import current_version, make_etag
+
+NOT_FOUND = "No Task matches the given query."
+
+_FIELDS = Task._meta.concrete_fields
+
+VERSION_FIELD = "version"
+
+# Writes of only these fields keep the task's version.
+UNVERSIONED_FIELDS = frozenset({"sort_order"})
+
+
+def is_edit(fields):
+    """Return whether writing ``fields`` increments a task's version."""
+    return not fields or not UNVERSIONED_FIELDS.issuperset(fields)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The task has changed since the version given."
+    default_code = "precondition_failed"
+
+
+def expected_versions(request):
+    """
+    Return the task version named by the ``version`` field of a write's
+    body, as a list for ``update_task``, or None to update any version.
+    """
+    value = request.data.get(VERSION_FIELD)
+    if value is None:
+        return None
+    try:
+        return [serializers.IntegerField(min_value=1).run_validation(value)]
+    except ValidationError as exc:
+        raise ValidationError({VERSION_FIELD: exc.detail})
+
+
+def if_match(request):
+    """
+    Return the tags named by the ``If-Match`` header, or None to update
+    whatever the task list's tag (no header, or ``*``).
+    """
+    header = request.META.get("HTTP_IF_MATCH")
+    if not header:
+        return None
+    tags = parse_etags(header)
+    return None if "*" in tags else tags
+
+
+def _from_row(row):
+    # As the ORM would convert the columns of a query.
+    table = Task._meta.db_table
+    values = []
+    for field, value in zip(_FIELDS, row):
+        column = field.get_col(table)
+        converters = connection.ops.get_db_converters(
+            column
+        ) + field.get_db_converters(connection)
+        for converter in converters:
+            value = converter(value, column, connection)
+        values.append(value)
+    return Task.from_db(
+        connection.alias, [field.attname for field in _FIELDS], values
+    )
+
+
+def write_fields(task_id, data, versions=None, now=None):
+    """
+    Set the fields in ``data`` on task ``task_id`` with a single
+    ``UPDATE ... RETURNING``, along with ``updated_at`` and the next
+    ``version`` (unless it holds only ``UNVERSIONED_FIELDS``), if
+    the task is at one of ``versions`` (any if None).
+
+    Returns the updated task, or None if no row matched.
+    """
+    quote = connection.ops.quote_name
+    fields = [Task._meta.get_field(name) for name in data]
+    fields.append(Task._meta.get_field("updated_at"))
+    values = [*data.values(), now or timezone.now()]
+    assignments = [f"{quote(field.column)} = %s" for field in fields]
+    params = [
+        field.get_db_prep_save(value, connection)
+        for field, value in zip(fields, values)
+    ]
+    version = quote("version")
+    if is_edit(data):
+        assignments.append(f"{version} = {version} + 1")
+    sql = (
+        f"UPDATE {quote(Task._meta.db_table)} "
+        f"SET {', '.join(assignments)} WHERE {quote('id')} = %s"
+    )
+    params.append(task_id)
+    if versions is not None:
+        sql += f" AND {version} IN ({', '.join(['%s'] * len(versions))})"
+        params.extend(versions)
+    sql += " RETURNING " + ", ".join(quote(field.column) for field in _FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return None if row is None else _from_row(row)
+
+
+def update_task(task_id, data, versions=None, etags=None, variant=None):
+    """
+    Write the validated ``data`` to task ``task_id`` and return the task.
+
+    Raises ``NotFound``, or ``PreconditionFailed`` if the task is not at
+    one of ``versions`` or the task list's tag for the renderer format
+    ``variant`` is not one of ``etags`` (weak tags never match).
+    """
+    if etags is None:
+        task = write_fields(task_id, data, versions)
+    else:
+        # No write may come between the check and the update.
+        with transaction.atomic():
+            etag = make_etag(current_version(for_update=True), variant)
+            if etag not in etags:
+                raise PreconditionFailed(
+                    f"The task list has changed; its tag is {etag}."
+                )
+            task = write_fields(task_id, data, versions)
+    if task is None:
+        # Only failed updates read the task.
+        current = (
+            Task.objects.filter(id=task_id)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if current is None:
+            raise NotFound(NOT_FOUND)
+        raise PreconditionFailed(
+            f"The task has changed; it is at version {current}."
+        )
+    tasks_changed.send(sender=Task, action=UPDATED, ids=[task_id])
+    return task
@@ -4,8 +4,15 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter(trailing_slash=False)
+# Before "tasks", whose detail route would take "archive" for an id.
+router.register(
+    r"tasks/archive", views.ArchivedTaskViewSet, basename="archived-tasks"
+)
 router.register(r"tasks", views.TaskViewSet, basename="tasks")
 
 urlpatterns = [
     path("health/", views.health, name="health"),
+    path("ready/", views.ready, name="ready"),
+    path("metrics", views.metrics, name="metrics"),
+    path("tasks/events", views.task_events, name="task-events"),
 ] + router.urls
@@ -0,0 +1,154 @@
+"""
+Conditional GETs of the task list and tasks from a change counter.
+
+``CollectionVersion`` holds a counter for the task list that database
+triggers bump with every statement that writes to ``tasks_task``, in the
+same transaction: API writes, reorders, archiving, bulk loads and
+PostgreSQL ``COPY`` alike. Statement-level triggers on PostgreSQL
+(migration 0011) bump it once per statement that changed rows, row-level
+triggers on SQLite once per row. List and detail responses carry it as a
+strong ``ETag``, with the time of the last change as ``Last-Modified``,
+and a request whose ``If-None-Match`` names the current version is
+answered ``304 Not Modified`` after reading only the counter, without
+touching ``tasks_task``.
+
+The counter covers the whole collection: any write changes every tag.
+``Last-Modified`` has one-second granularity, too coarse to tell writes
+apart, so ``If-Modified-Since`` alone never gets a ``304``.
+"""
+
+from collections import namedtuple
+from functools import wraps
+
+from django.db import connection, connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+
+from .models import CollectionVersion, Task
+
+TASKS = "tasks"
+
+Version = namedtuple("Version", ["version", "changed_at"])
+
+# Before the first write.
+_INITIAL = Version(0, None)
+
+_TABLE = CollectionVersion._meta.db_table
+
+_BUMP = f"""
+    INSERT INTO {_TABLE} (name, version, changed_at) VALUES (%s, 1, %s)
+    ON CONFLICT (name)
+    DO UPDATE SET version = {_TABLE}.version + 1,
+        changed_at = excluded.changed_at
+"""
+
+
+# Row-level on SQLite, which has no statement-level triggers. A table
+# rebuild by a schema change drops them, so they are (re)installed after
+# every migrate, as in tasks.stats.
+_SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {_TABLE}_{event.lower()}
+    AFTER {event} ON {Task._meta.db_table} BEGIN
+        {_BUMP % (f"'{TASKS}'", "strftime('%Y-%m-%d %H:%M:%f', 'now')")};
+    END
+    """
+    for event in ["INSERT", "UPDATE", "DELETE"]
+]
+
+
+def bump_version(name=TASKS):
+    """Count a change to the ``name`` collection."""
+    with connection.cursor() as cursor:
+        cursor.execute(_BUMP, [name, timezone.now()])
+
+
+@receiver(post_migrate, dispatch_uid="tasks.versions.install_sqlite_triggers")
+def install_sqlite_triggers(sender, using, **kwargs):
+    connection = connections[using]
+    if sender.label != "tasks" or connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for statement in _SQLITE_TRIGGERS:
+            cursor.execute(statement)
+
+
+def current_version(name=TASKS, for_update=False):
+    """
+    Return the ``Version`` of the ``name`` collection, locking it until
+    the end of the transaction if ``for_update``.
+    """
+    queryset = CollectionVersion.objects.filter(name=name)
+    if for_update:
+        queryset = queryset.select_for_update()
+    row = queryset.values_list("version", "changed_at").first()
+    return Version(*row) if row else _INITIAL
+
+
+async def acurrent_version(name=TASKS):
+    """Async ``current_version``."""
+    row = (
+        await CollectionVersion.objects.filter(name=name)
+        .values_list("version", "changed_at")
+        .afirst()
+    )
+    return Version(*row) if row else _INITIAL
+
+
+def make_etag(version, variant):
+    """The strong tag of the ``variant`` (renderer format) of a version."""
+    return f'"{version.version}-{variant}"'
+
+
+def is_not_modified(request, etag):
+    """Return whether the client's ``If-None-Match`` names ``etag``."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header or request.method not in ("GET", "HEAD"):
+        return False
+    # If-None-Match compares tags weakly.
+    tags = {tag.removeprefix("W/") for tag in parse_etags(header)}
+    return "*" in tags or etag in tags
+
+
+def add_validators(response, version, etag):
+    """Mark ``response`` with the version and make clients revalidate."""
+    response["ETag"] = etag
+    if version.changed_at is not None:
+        response["Last-Modified"] = http_date(version.changed_at.timestamp())
+    # Store, but check the version before every reuse.
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def not_modified(version, etag):
+    return add_validators(HttpResponseNotModified(), version, etag)
+
+
+def conditional(view):
+    """
+    Answer a ``TaskViewSet`` read with ``304`` when the client has the
+    current version, and add the validators to full responses.
+    """
+
+    @wraps(view)
+    def wrapped(self, request, *args, **kwargs):
+        # Read before the tasks: a response may then be newer than its
+        # tag, which only costs a client a full response, never older.
+        version = current_version()
+        # For tasks.response_cache.cached_list.
+        self.collection_version = version
+        etag = make_etag(version, request.accepted_renderer.format)
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+        response = view(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            add_validators(response, version, etag)
+        return response
+
+    return wrapped
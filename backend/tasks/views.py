@@ -1,9 +1,51 @@
+import logging
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError, transaction
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .archive import restore_task
+from .batch import create_tasks, delete_tasks, update_tasks
+from .events import event_stream, get_broadcaster
+from .fieldsets import list_fields, list_serializer_class
+from .filters import TaskFilterBackend
+from .models import ArchivedTask, Task
+from .monitoring import check_database, render_metrics
+from .pagination import ArchivedTaskCursorPagination, TaskCursorPagination
+from .parsers import BINARY_PARSERS, CSVParser, NDJSONParser
+from .ranking import RankError, apply_order, move_task
+from .renderers import (
+    BINARY_RENDERERS,
+    CSVRenderer,
+    FastJSONRenderer,
+    NDJSONRenderer,
+)
+from .response_cache import cached_list
+from .rows import get_row_encoder
+from .serializers import (
+    ArchivedTaskSerializer,
+    TaskBatchCreateSerializer,
+    TaskBatchDeleteSerializer,
+    TaskBatchUpdateSerializer,
+    TaskMoveSerializer,
+    TaskSerializer,
+)
+from .signals import CREATED, DELETED, tasks_changed
+from .stats import task_stats
+from .sync import SyncTokenError, SyncTokenExpired, changes_since
+from .transfer import astream_export, import_tasks, stream_export
+from .updates import NOT_FOUND, expected_versions, if_match, update_task
+from .versions import conditional
 
-from .models import Task
-from .serializers import TaskSerializer
+logger = logging.getLogger(__name__)
 
 
 @api_view(["GET"])
@@ -11,16 +53,278 @@ def health(request):
     return Response({"status": "ok"})
 
 
+@api_view(["GET"])
+def ready(request):
+    """Readiness: 503 unless the database answers within the timeout."""
+    try:
+        elapsed = check_database(settings.READINESS_DB_TIMEOUT_SECONDS)
+    except DatabaseError as exc:
+        logger.warning("Readiness check failed: %s", exc)
+        return Response(
+            {"status": "unavailable", "database": "unreachable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return Response(
+        {"status": "ready", "database_ms": round(elapsed * 1000, 1)}
+    )
+
+
+def metrics(request):
+    """Prometheus metrics, summed over every worker."""
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+async def task_events(request):
+    """Stream task change events as Server-Sent Events."""
+    if request.method != "GET":
+        return JsonResponse(
+            {"detail": f'Method "{request.method}" not allowed.'}, status=405
+        )
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be held for the lifetime of the stream.
+        return JsonResponse(
+            {"detail": "The event stream is only served over ASGI."},
+            status=501,
+        )
+
+    async def stream():
+        async with get_broadcaster().subscribe() as subscription:
+            async for message in event_stream(
+                subscription, settings.TASK_EVENTS_HEARTBEAT_SECONDS
+            ):
+                yield message
+
+    response = StreamingHttpResponse(
+        stream(), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class TaskViewSet(viewsets.ModelViewSet):
-    queryset = Task.objects.all().order_by("sort_order", "created_at")
+    queryset = Task.objects.all().order_by("sort_order", "created_at", "id")
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
+    renderer_classes = [
+        FastJSONRenderer,
+        *BINARY_RENDERERS,
+        BrowsableAPIRenderer,
+    ]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, *BINARY_PARSERS]
+    # Actions whose reads may be served by the read replica. Not changes:
+    # sync tokens are primary time, which a lagging replica is behind.
+    replica_reads = {"list", "retrieve", "stats", "export"}
+
+    @conditional
+    @cached_list
+    def list(self, request, *args, **kwargs):
+        # Lists are read as tuples and encoded without model instances;
+        # the output matches TaskSerializer exactly. Only the columns of
+        # the fields asked for are read; see tasks.fieldsets.
+        serializer_class = list_serializer_class(
+            request, self.get_serializer_class()
+        )
+        encoder = get_row_encoder(
+            serializer_class, list_fields(request, serializer_class)
+        )
+        if encoder is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        # Cursors are built from the raw ordering values of the last row.
+        ordering = self.paginator.get_ordering(request, queryset, self)
+        page = self.paginate_queryset(
+            encoder.rows(queryset, keys=[key.field for key in ordering])
+        )
+        if page is not None:
+            return self.get_paginated_response(encoder.encode(page))
+        return Response(encoder.encode(encoder.rows(queryset)))
+
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        task = serializer.save()
+        tasks_changed.send(sender=Task, action=CREATED, ids=[task.id])
+
+    def update(self, request, *args, **kwargs):
+        # Validated without reading the task and written with a single
+        # UPDATE ... RETURNING; see tasks.updates.
+        try:
+            task_id = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValueError:
+            raise NotFound(NOT_FOUND)
+        serializer = self.get_serializer(
+            data=request.data, partial=kwargs.get("partial", False)
+        )
+        serializer.is_valid(raise_exception=True)
+        task = update_task(
+            task_id,
+            serializer.validated_data,
+            expected_versions(request),
+            if_match(request),
+            request.accepted_renderer.format,
+        )
+        return Response(self.get_serializer(task).data)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        task_id = instance.id
+        instance.delete()
+        tasks_changed.send(sender=Task, action=DELETED, ids=[task_id])
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        try:
+            changes = changes_since(request.query_params.get("since"))
+        except SyncTokenExpired as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_410_GONE)
+        except SyncTokenError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        encoder = get_row_encoder(self.get_serializer_class())
+        if encoder is None:
+            changed = self.get_serializer(changes.changed, many=True).data
+        else:
+            changed = encoder.encode(encoder.rows(changes.changed))
+        return Response(
+            {
+                "token": changes.token,
+                "changed": changed,
+                "deleted": changes.deleted,
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        """Task counts from the summary table kept by ``tasks.stats``."""
+        return Response(task_stats())
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+    )
+    def export(self, request):
+        """
+        Stream every task matching the list filters as NDJSON or CSV,
+        chosen by ``?format=`` or the ``Accept`` header.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        if isinstance(request._request, ASGIRequest):
+            content = astream_export(queryset, renderer)
+        else:
+            content = stream_export(queryset, renderer)
+        response = StreamingHttpResponse(
+            content, content_type=renderer.media_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{renderer.format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[NDJSONParser, CSVParser],
+    )
+    def import_(self, request):
+        """
+        Create tasks from an NDJSON or CSV body, streamed into the
+        database as it is read; all or nothing.
+        """
+        count = import_tasks(request.data)
+        return Response({"imported": count}, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=["post"])
     def reorder(self, request):
-        task_orders = request.data.get("task_orders", [])
-        for item in task_orders:
+        orders = {}
+        for item in request.data.get("task_orders", []):
             task_id = item.get("id")
             sort_order = item.get("sort_order")
-            if task_id is not None and sort_order is not None:
-                Task.objects.filter(id=task_id).update(sort_order=sort_order)
+            if task_id is None or sort_order is None:
+                continue
+            try:
+                orders[int(task_id)] = int(sort_order)
+            except (TypeError, ValueError):
+                return Response(
+                    {"detail": "Task ids and sort orders must be integers."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        apply_order(orders)
         return Response({"status": "success"}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    @transaction.atomic
+    def batch(self, request):
+        """
+        Create (POST), partially update (PATCH) or delete (DELETE) up to
+        ``MAX_BATCH_SIZE`` tasks at once.
+
+        The whole batch is validated first and written only if every item
+        is valid; otherwise nothing is written and the errors are returned
+        per item.
+        """
+        if request.method == "DELETE":
+            serializer = TaskBatchDeleteSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            count = delete_tasks(serializer.validated_data["ids"])
+            return Response({"deleted": count})
+
+        if request.method == "POST":
+            serializer = TaskBatchCreateSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            tasks = create_tasks(serializer.validated_data["tasks"])
+            status_code = status.HTTP_201_CREATED
+        else:
+            serializer = TaskBatchUpdateSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            tasks = update_tasks(serializer.validated_data["tasks"])
+            status_code = status.HTTP_200_OK
+        return Response(
+            {"tasks": self.get_serializer(tasks, many=True).data},
+            status=status_code,
+        )
+
+    @action(detail=True, methods=["post"])
+    def move(self, request, pk=None):
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            task = move_task(
+                task,
+                after_id=serializer.validated_data.get("after"),
+                before_id=serializer.validated_data.get("before"),
+            )
+        except RankError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(self.get_serializer(task).data)
+
+
+class ArchivedTaskViewSet(viewsets.ReadOnlyModelViewSet):
+    """Tasks moved out of the task list by ``tasks.archive``."""
+
+    queryset = ArchivedTask.objects.all()
+    serializer_class = ArchivedTaskSerializer
+    pagination_class = ArchivedTaskCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    replica_reads = {"list", "retrieve"}
+
+    @action(detail=True, methods=["post"])
+    def restore(self, request, pk=None):
+        """Move the task back to the task list."""
+        try:
+            task = restore_task(int(pk))
+        except (ValueError, ArchivedTask.DoesNotExist):
+            raise NotFound("No archived task matches the given query.")
+        return Response(TaskSerializer(task).data)
@@ -1,7 +1,27 @@
+import datetime
+
 import pytest
+from django.utils import timezone
 from rest_framework.test import APIClient
 
 
+def titles(response):
+    """The titles of the tasks on a list response's page."""
+    return [task["title"] for task in response.json()["results"]]
+
+
+def touches_tasks(queries):
+    """Whether any of the captured ``queries`` reads or writes tasks."""
+    return any('"tasks_task"' in query["sql"] for query in queries)
+
+
+def age_all_tasks(delta=datetime.timedelta(minutes=10)):
+    """Backdate every task so it falls outside the sync overlap."""
+    from tasks.models import Task
+
+    Task.objects.update(updated_at=timezone.now() - delta)
+
+
 @pytest.fixture
 def api_client():
     """Provides an API client for testing."""
@@ -0,0 +1,257 @@
+import datetime
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.admin import DUE_MONTHS_CACHE_KEY, TaskAdmin, due_months
+from tasks.estimates import estimate_count, table_rows
+from tasks.models import Task
+from tasks.signals import UPDATED, tasks_changed
+
+CHANGELIST = "admin:tasks_task_changelist"
+
+
+@pytest.fixture
+def tasks(db):
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}",
+            due_date=datetime.date(2026, 1 + i % 3, 10),
+            completed=i % 2 == 0,
+        )
+        for i in range(5)
+    )
+
+
+@pytest.fixture
+def large(settings, monkeypatch):
+    # Every table counts as large; pages of two tasks.
+    settings.ADMIN_LARGE_TABLE_ROWS = 0
+    monkeypatch.setattr(TaskAdmin, "list_per_page", 2)
+
+
+@pytest.fixture
+def months_cache():
+    cache.delete(DUE_MONTHS_CACHE_KEY)
+    yield
+    cache.delete(DUE_MONTHS_CACHE_KEY)
+
+
+def titles(response):
+    return [task.title for task in response.context["cl"].result_list]
+
+
+@pytest.mark.django_db
+class TestTaskChangeList:
+    """Test cases for the task changelist on small and large tables."""
+
+    def test_small_tables_are_paged_by_number(
+        self, admin_client, tasks, monkeypatch
+    ):
+        """Test that small tables keep exact counts and page numbers."""
+        monkeypatch.setattr(TaskAdmin, "list_per_page", 2)
+
+        response = admin_client.get(reverse(CHANGELIST), {"p": 2})
+
+        cl = response.context["cl"]
+        assert not cl.keyset
+        assert cl.result_count == 5
+        assert titles(response) == ["Task 2", "Task 1"]
+
+    def test_large_tables_are_paged_by_keyset(
+        self, admin_client, tasks, large
+    ):
+        """Test that next page links continue below the last task shown."""
+        first = admin_client.get(reverse(CHANGELIST))
+        cl = first.context["cl"]
+        second = admin_client.get(reverse(CHANGELIST) + cl.next_page_url)
+        last = admin_client.get(
+            reverse(CHANGELIST) + second.context["cl"].next_page_url
+        )
+
+        assert cl.keyset
+        assert cl.next_page_url == f"?cursor={tasks[3].id}"
+        assert titles(first) == ["Task 4", "Task 3"]
+        assert titles(second) == ["Task 2", "Task 1"]
+        assert titles(last) == ["Task 0"]
+        assert last.context["cl"].next_page_url is None
+        assert b"Next page" in first.content
+        assert b"First page" in last.content
+
+    def test_keyset_pages_keep_filters(self, admin_client, tasks, large):
+        """Test that the cursor applies within the filtered tasks."""
+        first = admin_client.get(
+            reverse(CHANGELIST), {"completed__exact": "1"}
+        )
+        url = first.context["cl"].next_page_url
+        second = admin_client.get(reverse(CHANGELIST) + url)
+
+        assert "completed__exact=1" in url
+        assert titles(first) == ["Task 4", "Task 2"]
+        assert titles(second) == ["Task 0"]
+
+    def test_filter_links_drop_the_cursor(self, admin_client, tasks, large):
+        """Test that changing the filters starts from the first page."""
+        response = admin_client.get(
+            reverse(CHANGELIST), {"cursor": tasks[3].id}
+        )
+        cl = response.context["cl"]
+
+        assert "cursor" not in cl.get_query_string({"priority__exact": "low"})
+        assert "cursor" not in cl.get_query_string({"o": "1"})
+
+    def test_sorted_large_tables_are_paged_by_number(
+        self, admin_client, tasks, large
+    ):
+        """Test that keyset pages only follow the default ordering."""
+        response = admin_client.get(reverse(CHANGELIST), {"o": "1", "p": 2})
+
+        assert not response.context["cl"].keyset
+        assert titles(response) == ["Task 2", "Task 3"]
+
+    def test_invalid_cursor(self, admin_client, tasks, large):
+        """Test that a malformed cursor is reported like a bad filter."""
+        response = admin_client.get(reverse(CHANGELIST), {"cursor": "x"})
+
+        assert response.status_code == 302
+        assert response.url.endswith("?e=1")
+
+    def test_large_tables_search_newest_first(
+        self, admin_client, tasks, large
+    ):
+        """Test that searches on large tables are not ranked."""
+        response = admin_client.get(reverse(CHANGELIST), {"q": "task"})
+
+        assert response.context["cl"].keyset
+        assert titles(response) == ["Task 4", "Task 3"]
+
+
+@pytest.mark.django_db
+class TestDueMonthFilter:
+    """Test cases for the cached due month filter."""
+
+    def test_lists_months_with_tasks(self, tasks, months_cache):
+        """Test that every month some task is due in is found."""
+        assert due_months() == [
+            datetime.date(2026, 1, 1),
+            datetime.date(2026, 2, 1),
+            datetime.date(2026, 3, 1),
+        ]
+
+    def test_filters_by_month(self, admin_client, tasks, months_cache):
+        """Test that choosing a month lists the tasks due in it."""
+        response = admin_client.get(
+            reverse(CHANGELIST), {"due_month": "2026-02"}
+        )
+
+        assert titles(response) == ["Task 4", "Task 1"]
+        assert b"March 2026" in response.content
+
+    def test_caches_the_months(self, admin_client, tasks, months_cache):
+        """Test that the months are looked up once."""
+        admin_client.get(reverse(CHANGELIST))
+        Task.objects.create(title="Later", due_date=datetime.date(2027, 5, 1))
+
+        response = admin_client.get(reverse(CHANGELIST))
+
+        assert b"May 2027" not in response.content
+        assert b"January 2026" in response.content
+
+    def test_invalid_month(self, admin_client, tasks, months_cache):
+        """Test that a malformed month is reported like a bad filter."""
+        response = admin_client.get(reverse(CHANGELIST), {"due_month": "x"})
+
+        assert response.status_code == 302
+
+
+@pytest.mark.django_db
+class TestCompletedActions:
+    """Test cases for marking tasks completed or open from the admin."""
+
+    def run_action(self, client, action, ids, **extra):
+        return client.post(
+            reverse(CHANGELIST),
+            {"action": action, ACTION_CHECKBOX_NAME: ids, **extra},
+        )
+
+    def test_marks_selection_in_one_update(self, admin_client, tasks):
+        """Test that the selected tasks are updated by one statement."""
+        events = []
+
+        def receiver(sender, **kwargs):
+            events.append(kwargs)
+
+        tasks_changed.connect(receiver)
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.run_action(
+                    admin_client,
+                    "mark_completed",
+                    [task.id for task in tasks[:2]],
+                )
+        finally:
+            tasks_changed.disconnect(receiver)
+
+        assert response.status_code == 302
+        updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "tasks_task"')
+        ]
+        assert len(updates) == 1
+        assert Task.objects.get(id=tasks[1].id).completed
+        assert events[0]["action"] == UPDATED
+        assert events[0]["ids"] == [tasks[1].id]
+
+    def test_marks_every_matching_task(self, admin_client, tasks):
+        """Test "select all" across pages."""
+        response = self.run_action(
+            admin_client, "mark_open", [tasks[0].id], select_across="1"
+        )
+
+        assert response.status_code == 302
+        assert not Task.objects.filter(completed=True).exists()
+        assert (
+            Task.objects.get(id=tasks[0].id).updated_at > tasks[0].updated_at
+        )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="PostgreSQL only"
+)
+@pytest.mark.django_db
+class TestEstimatedCounts:
+    """Test cases for counts from planner statistics."""
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE tasks_task")
+
+    def test_estimates_tables_and_filtered_queries(self, tasks):
+        """Test that analyzed tables are counted from statistics."""
+        self.analyze()
+
+        assert table_rows(Task) == 5
+        assert estimate_count(Task.objects.all()) == 5
+        assert 1 <= estimate_count(Task.objects.filter(completed=True)) <= 5
+
+    def test_large_changelists_do_not_count(
+        self, admin_client, tasks, settings
+    ):
+        """Test that a large table's changelist runs no COUNT(*)."""
+        self.analyze()
+        settings.ADMIN_LARGE_TABLE_ROWS = 1
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(
+                reverse(CHANGELIST), {"completed__exact": "0"}
+            )
+
+        cl = response.context["cl"]
+        assert cl.keyset and cl.estimated_count
+        assert not any("COUNT(" in query["sql"] for query in queries)
+        assert b"About" in response.content
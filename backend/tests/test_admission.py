@@ -0,0 +1,302 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tasks.admission import (
+    CRITICAL,
+    HEAVY,
+    READ,
+    WRITE,
+    ConcurrencyLimiter,
+    RateLimiter,
+    classify,
+    queue_time,
+)
+from tasks.middleware import AdmissionMiddleware
+
+
+def decisions(priority, decision):
+    return (
+        REGISTRY.get_sample_value(
+            "admission_decisions_total",
+            {"priority": priority, "decision": decision},
+        )
+        or 0
+    )
+
+
+class TestRateLimiter:
+    """Test cases for the per-client token buckets."""
+
+    def test_allows_bursts_then_paces(self):
+        """Test that a burst passes and the next request must wait."""
+        limiter = RateLimiter(rate=2, burst=3, max_clients=10)
+
+        assert [limiter.acquire("a", 0.0) for _ in range(3)] == [0, 0, 0]
+        assert limiter.acquire("a", 0.0) == pytest.approx(0.5)
+        assert limiter.acquire("a", 0.5) == 0
+        assert limiter.acquire("b", 0.5) == 0
+
+    def test_forgets_least_recent_clients(self):
+        """Test that the number of buckets kept is bounded."""
+        limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+        for client in ["a", "b", "c"]:
+            limiter.acquire(client, 0.0)
+
+        assert list(limiter.buckets) == ["b", "c"]
+        assert limiter.acquire("a", 0.0) == 0
+
+
+class TestConcurrencyLimiter:
+    """Test cases for the per-worker concurrency limit."""
+
+    def wait_for_queue(self, limiter, depth):
+        deadline = time.monotonic() + 5
+        while len(limiter.waiting) < depth:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+
+    def test_admits_up_to_the_limit(self):
+        """Test that requests wait once every slot is taken."""
+        limiter = ConcurrencyLimiter(limit=2, heavy_limit=1)
+
+        assert limiter.acquire(READ, 1) == ("admitted", 0.0)
+        assert limiter.acquire(WRITE, 1) == ("admitted", 0.0)
+        assert limiter.acquire(READ, 0.01)[0] == "timed_out"
+        assert limiter.waiting == []
+
+    def test_limits_heavy_reads_to_their_share(self):
+        """Test that heavy reads leave slots for everything else."""
+        limiter = ConcurrencyLimiter(limit=2, heavy_limit=1)
+
+        assert limiter.acquire(HEAVY, 1)[0] == "admitted"
+        assert limiter.acquire(HEAVY, 0.01)[0] == "timed_out"
+        assert limiter.acquire(WRITE, 1)[0] == "admitted"
+
+    def test_hands_slots_to_higher_classes_first(self):
+        """Test that a freed slot goes to the waiting write."""
+        limiter = ConcurrencyLimiter(limit=1, heavy_limit=1)
+        limiter.acquire(READ, 1)
+        order = []
+
+        def request(priority):
+            decision, _ = limiter.acquire(priority, 5)
+            order.append((priority, decision))
+            limiter.release(priority, 0.0)
+
+        threads = []
+        for depth, priority in enumerate([HEAVY, READ, WRITE], start=1):
+            threads.append(threading.Thread(target=request, args=[priority]))
+            threads[-1].start()
+            self.wait_for_queue(limiter, depth)
+        limiter.release(READ, 0.0)
+        for thread in threads:
+            thread.join()
+
+        assert order == [
+            (WRITE, "queued"),
+            (READ, "queued"),
+            (HEAVY, "queued"),
+        ]
+
+    def test_fails_fast_when_the_wait_would_be_too_long(self):
+        """Test that slow recent requests make new ones fail at once."""
+        limiter = ConcurrencyLimiter(limit=1, heavy_limit=1)
+        limiter.service_time = 10.0
+        limiter.acquire(READ, 1)
+
+        start = time.monotonic()
+        decision, wait = limiter.acquire(READ, 1)
+
+        assert decision == "overloaded"
+        assert wait == pytest.approx(10.0)
+        assert time.monotonic() - start < 0.5
+
+    def test_async_waiters_are_woken(self):
+        """Test that a slot released from another thread wakes a task."""
+        limiter = ConcurrencyLimiter(limit=1, heavy_limit=1)
+        limiter.acquire(READ, 1)
+
+        async def wait_for_slot():
+            pending = asyncio.ensure_future(limiter.aacquire(WRITE, 5))
+            while not limiter.waiting:
+                await asyncio.sleep(0.001)
+            threading.Thread(target=limiter.release, args=[READ, 0]).start()
+            return await pending
+
+        assert asyncio.run(wait_for_slot()) == ("queued", 0.0)
+        assert limiter.active == 1
+
+
+class TestClassification:
+    """Test cases for request priorities and queue times."""
+
+    factory = RequestFactory()
+
+    @pytest.mark.parametrize(
+        "method, url, priority",
+        [
+            ("get", "/api/health/", CRITICAL),
+            ("get", "/api/metrics", CRITICAL),
+            ("post", "/api/tasks", WRITE),
+            ("delete", "/api/tasks/1", WRITE),
+            ("get", "/api/tasks/1", READ),
+            ("get", "/api/tasks", HEAVY),
+            ("get", "/api/tasks/export", HEAVY),
+            ("get", "/nowhere", READ),
+        ],
+    )
+    def test_classifies_requests(self, method, url, priority):
+        """Test the priority class of each kind of request."""
+        assert classify(getattr(self.factory, method)(url)) == priority
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            "t=1700000000.0",
+            "1700000000000",
+            "1700000000000000",
+            "t=1700000000000000",
+        ],
+    )
+    def test_reads_queue_time(self, header):
+        """Test X-Request-Start in seconds, milliseconds and microseconds."""
+        request = self.factory.get("/", HTTP_X_REQUEST_START=header)
+
+        assert queue_time(request, 1700000001.5) == pytest.approx(
+            1.5, abs=0.001
+        )
+
+    def test_ignores_missing_or_invalid_queue_time(self):
+        """Test that requests without a usable header have no queue time."""
+        assert queue_time(self.factory.get("/"), 10) is None
+        request = self.factory.get("/", HTTP_X_REQUEST_START="soon")
+        assert queue_time(request, 10) is None
+
+
+@pytest.mark.django_db
+class TestAdmissionMiddleware:
+    """Test cases for admission control of API requests."""
+
+    def test_rate_limits_clients(self, api_client, settings):
+        """Test that a client over its rate gets 429 with Retry-After."""
+        settings.ADMISSION_CLIENT_RATE = 0.5
+        settings.ADMISSION_CLIENT_BURST = 2
+        before = decisions("read", "rate_limited")
+
+        statuses = [
+            api_client.get(reverse("tasks-detail", kwargs={"pk": 1}))
+            for _ in range(3)
+        ]
+
+        assert [response.status_code for response in statuses] == [
+            404,
+            404,
+            429,
+        ]
+        assert statuses[-1]["Retry-After"] == "2"
+        assert statuses[-1].json()["detail"].startswith("Request was throt")
+        assert decisions("read", "rate_limited") == before + 1
+
+    def test_health_is_never_limited(self, api_client, settings):
+        """Test that health checks pass while the client is limited."""
+        settings.ADMISSION_CLIENT_RATE = 0.1
+        settings.ADMISSION_CLIENT_BURST = 1
+        api_client.get(reverse("tasks-list"))
+
+        assert api_client.get(reverse("tasks-list")).status_code == 429
+        assert api_client.get(reverse("health")).status_code == 200
+
+    def test_clients_are_told_apart_by_header(self, api_client, settings):
+        """Test that a configured header identifies clients."""
+        settings.ADMISSION_CLIENT_RATE = 0.1
+        settings.ADMISSION_CLIENT_BURST = 1
+        settings.ADMISSION_CLIENT_HEADER = "X-Forwarded-For"
+        url = reverse("tasks-list")
+
+        first = api_client.get(url, HTTP_X_FORWARDED_FOR="10.0.0.1, 10.0.0.9")
+        again = api_client.get(url, HTTP_X_FORWARDED_FOR="10.0.0.1")
+        other = api_client.get(url, HTTP_X_FORWARDED_FOR="10.0.0.2")
+
+        assert [first.status_code, again.status_code, other.status_code] == [
+            200,
+            429,
+            200,
+        ]
+
+    def test_sheds_requests_past_their_queue_deadline(
+        self, api_client, settings
+    ):
+        """Test that requests that queued too long upstream get 503."""
+        settings.ADMISSION_HEAVY_QUEUE_TIMEOUT = 0.5
+        stale = f"t={time.time() - 1:.3f}"
+
+        listed = api_client.get(
+            reverse("tasks-list"), HTTP_X_REQUEST_START=stale
+        )
+        fetched = api_client.get(
+            reverse("tasks-detail", kwargs={"pk": 1}),
+            HTTP_X_REQUEST_START=stale,
+        )
+
+        assert listed.status_code == 503
+        assert listed["Retry-After"] == "1"
+        assert fetched.status_code == 404
+
+    def test_rejects_requests_when_no_slot_frees_up(self, settings):
+        """Test that a request that waits out its timeout gets 503."""
+        settings.ADMISSION_MAX_CONCURRENCY = 1
+        settings.ADMISSION_QUEUE_TIMEOUT = 0.01
+        middleware = AdmissionMiddleware(lambda request: HttpResponse())
+        middleware.slots.acquire(READ, 1)
+        before = decisions("write", "timed_out")
+
+        response = middleware(RequestFactory().post("/api/tasks"))
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+        assert decisions("write", "timed_out") == before + 1
+        assert middleware(RequestFactory().get("/api/ready/")).status_code
+        assert middleware.slots.active == 1
+
+    def test_releases_slots_when_views_fail(self, settings):
+        """Test that a slot is freed when the view raises."""
+
+        def fail(request):
+            raise RuntimeError
+
+        middleware = AdmissionMiddleware(fail)
+
+        with pytest.raises(RuntimeError):
+            middleware(RequestFactory().get("/api/tasks"))
+        assert middleware.slots.active == 0
+
+    def test_disabled(self, api_client, settings):
+        """Test that ADMISSION_CONTROL turns the middleware off."""
+        settings.ADMISSION_CONTROL = False
+        settings.ADMISSION_CLIENT_RATE = 0.1
+        settings.ADMISSION_CLIENT_BURST = 1
+
+        for _ in range(3):
+            assert api_client.get(reverse("tasks-list")).status_code == 200
+
+    def test_async_requests(self, settings):
+        """Test admission of requests through the async handler."""
+        settings.ADMISSION_CLIENT_RATE = 0.1
+        settings.ADMISSION_CLIENT_BURST = 1
+        client = AsyncClient()
+
+        async def requests():
+            return [
+                (await client.get(reverse(name))).status_code
+                for name in ["health", "tasks-list", "tasks-list"]
+            ]
+
+        assert async_to_sync(requests)() == [200, 200, 429]
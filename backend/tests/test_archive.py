@@ -0,0 +1,157 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.archive import archive_batch, archive_cutoff, archive_tasks
+from tasks.models import ArchivedTask, Task, TaskTombstone
+from tasks.signals import tasks_changed
+from tasks.stats import task_stats, verify_stats
+from tasks.sync import encode_token
+
+from .conftest import titles
+
+
+@pytest.fixture
+def tasks(db, settings):
+    """Ten tasks, half completed; the first six last updated long ago."""
+    settings.TASK_ARCHIVE_AFTER_DAYS = 30
+    tasks = Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i % 2 == 0, sort_order=i)
+        for i in range(10)
+    )
+    old = timezone.now() - datetime.timedelta(days=60)
+    for i, task in enumerate(tasks[:6]):
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=old + datetime.timedelta(minutes=i)
+        )
+    return tasks
+
+
+@pytest.mark.django_db
+class TestArchiveTasks:
+    """Test cases for moving completed tasks to the archive."""
+
+    def test_moves_old_completed_tasks(self, tasks):
+        """Test that only completed tasks past the cutoff move."""
+        sent = []
+
+        def record(sender, action, ids, **kwargs):
+            sent.append((action, ids))
+
+        tasks_changed.connect(record)
+        try:
+            count, batches = archive_tasks(batch_size=2)
+        finally:
+            tasks_changed.disconnect(record)
+
+        archived = [tasks[0].pk, tasks[2].pk, tasks[4].pk]
+        assert (count, batches) == (3, 2)
+        assert sent == [("archive", archived[:2]), ("archive", archived[2:])]
+        assert sorted(ArchivedTask.objects.values_list("id", flat=True)) == (
+            archived
+        )
+        assert not Task.objects.filter(pk__in=archived).exists()
+        assert Task.objects.count() == 7
+
+    def test_keeps_every_field(self, tasks):
+        """Test that an archived task is a copy of the task."""
+        task = Task.objects.get(pk=tasks[0].pk)
+
+        archive_batch(archive_cutoff())
+
+        archived = ArchivedTask.objects.get(pk=task.pk)
+        for field in Task._meta.concrete_fields:
+            assert getattr(archived, field.attname) == getattr(
+                task, field.attname
+            )
+        assert archived.archived_at > task.updated_at
+
+    def test_batches_are_bounded(self, tasks):
+        """Test that a pass can be limited to a number of batches."""
+        assert archive_tasks(batch_size=1, max_batches=2) == (2, 2)
+        assert archive_tasks(batch_size=1) == (1, 1)
+
+    def test_list_and_delta_sync_drop_archived_tasks(self, api_client, tasks):
+        """Test that archived tasks leave the list like deleted ones."""
+        token = encode_token(timezone.now())
+
+        archive_tasks()
+
+        listed = titles(api_client.get(reverse("tasks-list")))
+        changes = api_client.get(reverse("tasks-changes"), {"since": token})
+        assert "Task 0" not in listed
+        assert len(listed) == 7
+        assert sorted(changes.json()["deleted"]) == [
+            tasks[0].pk,
+            tasks[2].pk,
+            tasks[4].pk,
+        ]
+
+    def test_stats_still_count_archived_tasks(self, tasks):
+        """Test that the task stats include the archive."""
+        before = task_stats()
+
+        archive_tasks()
+
+        assert task_stats() == before
+        assert verify_stats() == []
+
+    def test_command(self, tasks):
+        """Test the archive command's cutoff and report."""
+        call_command("archive_tasks", "--days", "90")
+        assert not ArchivedTask.objects.exists()
+
+        call_command("archive_tasks", "--days", "30", "--batch-size", "2")
+        assert ArchivedTask.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestArchivedTaskAPI:
+    """Test cases for reading and restoring archived tasks."""
+
+    def test_list_and_retrieve(self, api_client, tasks):
+        """Test that archived tasks are listed newest first."""
+        archive_tasks(batch_size=1)
+
+        response = api_client.get(
+            reverse("archived-tasks-list"), {"page_size": 2}
+        )
+        detail = api_client.get(
+            reverse("archived-tasks-detail", kwargs={"pk": tasks[0].pk})
+        )
+
+        assert titles(response) == ["Task 4", "Task 2"]
+        following = api_client.get(response.json()["next"])
+        assert titles(following) == ["Task 0"]
+        assert detail.json()["title"] == "Task 0"
+        assert detail.json()["archived_at"]
+
+    def test_restore(self, api_client, tasks):
+        """Test that a restored task is back in the list and in sync."""
+        archive_tasks()
+        token = encode_token(timezone.now())
+
+        response = api_client.post(
+            reverse("archived-tasks-restore", kwargs={"pk": tasks[2].pk})
+        )
+
+        assert response.status_code == 200
+        assert response.json()["id"] == tasks[2].pk
+        assert response.json()["title"] == "Task 2"
+        assert not ArchivedTask.objects.filter(pk=tasks[2].pk).exists()
+        assert not TaskTombstone.objects.filter(task_id=tasks[2].pk).exists()
+        changes = api_client.get(reverse("tasks-changes"), {"since": token})
+        # Reported after the tasks changed in the sync overlap window.
+        assert changes.json()["changed"][-1]["id"] == tasks[2].pk
+        assert verify_stats() == []
+
+    def test_restore_missing(self, api_client, tasks):
+        """Test that restoring an unknown task is a 404."""
+        response = api_client.post(
+            reverse("archived-tasks-restore", kwargs={"pk": tasks[1].pk})
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,230 @@
+import datetime
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskTombstone
+from tasks.signals import tasks_changed
+from tasks.sync import encode_token
+
+# The DRF views the async ones must match.
+drf_urls = override_settings(ROOT_URLCONF="config.urls")
+
+
+@pytest.fixture
+def asgi():
+    """Call the async views through Django's async request handler."""
+    client = AsyncClient()
+
+    def request(method, name, data=None, **kwargs):
+        url = reverse(name, kwargs=kwargs or None)
+        call = getattr(client, method)
+        if method in ("post", "put", "patch"):
+            call = async_to_sync(call)
+            return call(url, json.dumps(data), content_type="application/json")
+        return async_to_sync(call)(url, data)
+
+    return request
+
+
+@pytest.fixture
+def tasks(db):
+    today = datetime.date(2025, 1, 1)
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Deploy service {i}" if i % 3 == 0 else f"Task {i}",
+            priority=["low", "medium", "high"][i % 3],
+            completed=i % 2 == 0,
+            due_date=today + datetime.timedelta(days=i % 4) if i % 5 else None,
+            sort_order=(i % 7) * 1000,
+        )
+        for i in range(30)
+    )
+
+
+def drf(api_client, method, name, data=None, **kwargs):
+    with drf_urls:
+        url = reverse(name, kwargs=kwargs or None)
+        return getattr(api_client, method)(url, data, format="json")
+
+
+@pytest.mark.urls("tasks.async_urls")
+@pytest.mark.django_db
+class TestAsyncTaskViews:
+    """Test cases for the async task views served over ASGI."""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"page_size": 7},
+            {"priority": "high,low", "completed": "false", "page_size": 4},
+            {"ordering": "-due_date", "due_after": "2025-01-02"},
+            {"search": "deploy", "page_size": 3},
+            {"all": "true", "ordering": "created_at"},
+        ],
+    )
+    def test_list_matches_drf(self, asgi, api_client, tasks, params):
+        """Test that every page matches the DRF view's."""
+        expected = drf(api_client, "get", "tasks-list", params).json()
+        response = asgi("get", "tasks-list", params)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        data = response.json()
+        if params.get("all"):
+            assert data == expected
+            return
+        assert data["results"] == expected["results"]
+        assert (data["next"] is None) == (expected["next"] is None)
+        if data["next"]:
+            # Cursors follow the same rows as DRF's.
+            cursor = data["next"].split("cursor=")[1].split("&")[0]
+            following = asgi("get", "tasks-list", {**params, "cursor": cursor})
+            with drf_urls:
+                expected = api_client.get(expected["next"]).json()
+            assert following.json()["results"] == expected["results"]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"priority": "urgent"},
+            {"ordering": "rank"},
+            {"due_before": "soon"},
+        ],
+    )
+    def test_invalid_parameters_match_drf(
+        self, asgi, api_client, tasks, params
+    ):
+        """Test that filter errors are reported as by DRF."""
+        expected = drf(api_client, "get", "tasks-list", params)
+        response = asgi("get", "tasks-list", params)
+
+        assert response.status_code == expected.status_code == 400
+        assert response.json() == expected.json()
+
+    def test_invalid_cursor(self, asgi, tasks):
+        """Test that a malformed cursor is a 404."""
+        response = asgi("get", "tasks-list", {"cursor": "nope"})
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Invalid cursor"}
+
+    def test_retrieve_matches_drf(self, asgi, api_client, tasks):
+        """Test a single task and a missing one."""
+        pk = tasks[4].pk
+        expected = drf(api_client, "get", "tasks-detail", pk=pk).json()
+
+        assert asgi("get", "tasks-detail", pk=pk).json() == expected
+        missing = asgi("get", "tasks-detail", pk=pk + 1000)
+        assert missing.status_code == 404
+        assert missing.json() == {"detail": "No Task matches the given query."}
+
+    def test_create(self, asgi):
+        """Test that a created task is returned and announced."""
+        sent = []
+
+        def record(sender, action, ids, **kwargs):
+            sent.append((action, ids))
+
+        tasks_changed.connect(record)
+        try:
+            response = asgi(
+                "post", "tasks-list", {"title": "New", "priority": "high"}
+            )
+        finally:
+            tasks_changed.disconnect(record)
+
+        assert response.status_code == 201
+        task = Task.objects.get()
+        assert response.json()["id"] == task.id
+        assert task.priority == "high"
+        assert sent == [("create", [task.id])]
+
+    def test_create_validates(self, asgi, api_client):
+        """Test that invalid tasks are rejected as by DRF."""
+        data = {"priority": "urgent"}
+        expected = drf(api_client, "post", "tasks-list", data)
+
+        response = asgi("post", "tasks-list", data)
+
+        assert response.status_code == 400
+        assert response.json() == expected.json()
+        assert not Task.objects.exists()
+
+    def test_update_and_partial_update(self, asgi, tasks):
+        """Test PUT and PATCH."""
+        pk = tasks[0].pk
+
+        patched = asgi("patch", "tasks-detail", {"completed": True}, pk=pk)
+        replaced = asgi("put", "tasks-detail", {"title": "Replaced"}, pk=pk)
+        invalid = asgi("put", "tasks-detail", {"priority": "low"}, pk=pk)
+
+        assert patched.status_code == 200
+        assert patched.json()["completed"] is True
+        assert replaced.status_code == 200
+        task = Task.objects.get(pk=pk)
+        assert (task.title, task.completed) == ("Replaced", True)
+        assert invalid.status_code == 400
+        assert "title" in invalid.json()
+
+    def test_destroy_records_tombstone(self, asgi, tasks):
+        """Test that deletes are visible to delta sync."""
+        pk = tasks[0].pk
+
+        response = asgi("delete", "tasks-detail", pk=pk)
+        again = asgi("delete", "tasks-detail", pk=pk)
+
+        assert response.status_code == 204
+        assert again.status_code == 404
+        assert not Task.objects.filter(pk=pk).exists()
+        assert TaskTombstone.objects.filter(task_id=pk).exists()
+
+    def test_changes_match_drf(self, asgi, api_client, tasks):
+        """Test delta sync with and without a token."""
+        since = encode_token(timezone.now() - datetime.timedelta(hours=1))
+        Task.objects.filter(pk=tasks[1].pk).delete()
+        TaskTombstone.objects.create(
+            task_id=tasks[1].pk, deleted_at=timezone.now()
+        )
+
+        for params in [{}, {"since": since}]:
+            expected = drf(api_client, "get", "tasks-changes", params).json()
+            data = asgi("get", "tasks-changes", params).json()
+            assert data["changed"] == expected["changed"]
+            assert (
+                data["deleted"]
+                == expected["deleted"]
+                == ([tasks[1].pk] if params else [])
+            )
+
+    def test_changes_rejects_bad_tokens(self, asgi):
+        """Test invalid and expired tokens."""
+        expired = encode_token(timezone.now() - datetime.timedelta(days=60))
+
+        assert asgi("get", "tasks-changes", {"since": "x"}).status_code == 400
+        assert (
+            asgi("get", "tasks-changes", {"since": expired}).status_code == 410
+        )
+
+    def test_rejects_other_methods(self, asgi):
+        """Test that unsupported methods get 405."""
+        response = asgi("put", "tasks-list", {})
+
+        assert response.status_code == 405
+        assert response.json() == {"detail": 'Method "PUT" not allowed.'}
+
+    def test_other_actions_use_drf_views(self, asgi, tasks):
+        """Test that actions without async views are still served."""
+        response = asgi(
+            "post",
+            "tasks-reorder",
+            {"task_orders": [{"id": tasks[0].pk, "sort_order": 5}]},
+        )
+
+        assert response.status_code == 200
+        assert Task.objects.get(pk=tasks[0].pk).sort_order == 5
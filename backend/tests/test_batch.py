@@ -0,0 +1,201 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.batch import MAX_BATCH_SIZE
+from tasks.models import Task, TaskTombstone
+
+
+def write_statements(queries):
+    # Writes to the tasks themselves, not the bookkeeping around them.
+    return [
+        q["sql"]
+        for q in queries
+        if q["sql"].lstrip().startswith(("INSERT", "UPDATE", "DELETE"))
+        and '"tasks_task"' in q["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestBatchCreate:
+    """Test cases for creating tasks in bulk."""
+
+    def test_creates_all_tasks_in_one_insert(self, api_client):
+        """Test that a batch is written with a single INSERT."""
+        payload = {
+            "tasks": [
+                {"title": f"Task {i}", "priority": "high"} for i in range(20)
+            ]
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                reverse("tasks-batch"), payload, format="json"
+            )
+
+        assert response.status_code == 201
+        assert len(response.data["tasks"]) == 20
+        assert all(t["id"] for t in response.data["tasks"])
+        assert all(t["created_at"] for t in response.data["tasks"])
+        assert Task.objects.filter(priority="high").count() == 20
+        assert len(write_statements(queries)) == 1
+
+    def test_invalid_item_rejects_whole_batch(self, api_client):
+        """Test that errors are reported per item and nothing is written."""
+        payload = {
+            "tasks": [
+                {"title": "Fine"},
+                {"title": "Bad", "priority": "urgent"},
+                {"description": "No title"},
+            ]
+        }
+
+        response = api_client.post(
+            reverse("tasks-batch"), payload, format="json"
+        )
+
+        assert response.status_code == 400
+        errors = response.data["tasks"]
+        assert set(errors) == {1, 2}
+        assert "priority" in errors[1]
+        assert "title" in errors[2]
+        assert Task.objects.count() == 0
+
+    def test_rejects_empty_and_oversized_batches(self, api_client):
+        """Test the batch size limits."""
+        empty = api_client.post(
+            reverse("tasks-batch"), {"tasks": []}, format="json"
+        )
+        oversized = api_client.post(
+            reverse("tasks-batch"),
+            {"tasks": [{"title": "x"}] * (MAX_BATCH_SIZE + 1)},
+            format="json",
+        )
+
+        assert empty.status_code == 400
+        assert oversized.status_code == 400
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestBatchUpdate:
+    """Test cases for updating tasks in bulk."""
+
+    def test_updates_in_one_statement(self, api_client):
+        """Test partial updates with different fields per item."""
+        first = Task.objects.create(title="First", priority="low")
+        second = Task.objects.create(title="Second", priority="low")
+        before = first.updated_at
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.patch(
+                reverse("tasks-batch"),
+                {
+                    "tasks": [
+                        {"id": first.id, "completed": True},
+                        {"id": second.id, "title": "Renamed"},
+                    ]
+                },
+                format="json",
+            )
+
+        assert response.status_code == 200
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.completed is True
+        assert first.title == "First"
+        assert second.title == "Renamed"
+        assert second.completed is False
+        assert first.priority == second.priority == "low"
+        assert first.updated_at > before
+        assert len(write_statements(queries)) == 1
+
+    def test_reports_unknown_duplicate_and_invalid_items(
+        self, api_client, sample_task
+    ):
+        """Test per-item errors for bad ids and bad values."""
+        response = api_client.patch(
+            reverse("tasks-batch"),
+            {
+                "tasks": [
+                    {"id": sample_task.id, "title": "Changed"},
+                    {"id": 999999, "title": "Missing"},
+                    {"title": "No id"},
+                    {"id": sample_task.id, "completed": True},
+                    {"id": "abc"},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == 400
+        errors = response.data["tasks"]
+        assert 0 not in errors
+        assert errors[1] == {"id": ["Task not found."]}
+        assert "id" in errors[2]
+        assert errors[3] == {"id": ["Duplicate task id."]}
+        assert "id" in errors[4]
+        sample_task.refresh_from_db()
+        assert sample_task.title == "Test Task"
+
+    def test_invalid_value_rejects_whole_batch(self, api_client, sample_task):
+        """Test that one invalid field stops every update."""
+        other = Task.objects.create(title="Other")
+
+        response = api_client.patch(
+            reverse("tasks-batch"),
+            {
+                "tasks": [
+                    {"id": other.id, "completed": True},
+                    {"id": sample_task.id, "priority": "urgent"},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == 400
+        assert list(response.data["tasks"]) == [1]
+        assert "priority" in response.data["tasks"][1]
+        other.refresh_from_db()
+        assert other.completed is False
+
+
+@pytest.mark.django_db
+class TestBatchDelete:
+    """Test cases for deleting tasks in bulk."""
+
+    def test_deletes_with_single_statement(self, api_client):
+        """Test that tasks are removed with one DELETE and tombstoned."""
+        ids = [Task.objects.create(title=f"Task {i}").id for i in range(5)]
+        keep = Task.objects.create(title="Keep")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.delete(
+                reverse("tasks-batch"), {"ids": ids}, format="json"
+            )
+
+        assert response.status_code == 200
+        assert response.data == {"deleted": 5}
+        assert list(Task.objects.values_list("id", flat=True)) == [keep.id]
+        assert set(
+            TaskTombstone.objects.values_list("task_id", flat=True)
+        ) == set(ids)
+        deletes = [
+            sql
+            for sql in write_statements(queries)
+            if sql.lstrip().startswith("DELETE")
+        ]
+        assert len(deletes) == 1
+
+    def test_unknown_ids_reject_whole_batch(self, api_client, sample_task):
+        """Test that unknown ids are reported by position."""
+        response = api_client.delete(
+            reverse("tasks-batch"),
+            {"ids": [sample_task.id, 999999]},
+            format="json",
+        )
+
+        assert response.status_code == 400
+        assert response.data["ids"] == {1: ["Task not found."]}
+        assert Task.objects.filter(id=sample_task.id).exists()
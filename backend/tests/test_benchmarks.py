@@ -0,0 +1,217 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+
+from benchmarks import (
+    admin,
+    api,
+    batch,
+    encodings,
+    fieldsets,
+    response_cache,
+    servers,
+)
+from benchmarks.seed import seed_tasks
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestBatchBenchmark:
+    """Smoke test for the batch benchmark workload."""
+
+    def test_reports_throughput_for_every_case(self):
+        """Test that each case runs and reports a rate."""
+        results = batch.run(APIClient(), size=3, repeat=1)
+
+        assert [r["name"] for r in results] == [
+            "create_single",
+            "create_batch",
+            "update_single",
+            "update_batch",
+            "delete_single",
+            "delete_batch",
+        ]
+        assert all(r["items"] == 3 for r in results)
+        assert all(r["items_per_second"] > 0 for r in results)
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestApiBenchmark:
+    """Smoke test for the per-action API workload."""
+
+    def test_reports_latency_queries_and_memory(self, monkeypatch):
+        """Test that every action runs and reports its measurements."""
+        monkeypatch.setattr(api, "REQUESTS", 2)
+        monkeypatch.setattr(api, "WARMUP", 1)
+        monkeypatch.setattr(api, "PROFILED", 1)
+
+        results = api.run(APIClient(), size=20, repeat=1)
+
+        assert [r["name"] for r in results] == [
+            "list",
+            "list_deep_page",
+            "list_filtered",
+            "search",
+            "retrieve",
+            "create",
+            "update",
+            "partial_update",
+            "move",
+            "reorder",
+            "changes",
+            "destroy",
+        ]
+        for result in results:
+            assert result["size"] == 20
+            assert result["requests"] == 2
+            assert result["p99_ms"] >= result["p95_ms"] >= result["p50_ms"]
+            assert result["queries_per_request"] >= 1
+            assert result["peak_memory_kb"] > 0
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestAdminBenchmark:
+    """Smoke test for the admin changelist workload."""
+
+    def test_times_both_modes(self, monkeypatch):
+        """Test that every page load runs with the mode on and off."""
+        monkeypatch.setattr(admin, "REQUESTS", 2)
+        monkeypatch.setattr(admin, "WARMUP", 1)
+
+        results = admin.run(APIClient(), size=250, repeat=1)
+
+        cases = [
+            "first_page",
+            "middle_page",
+            "filtered",
+            "due_month",
+            "search",
+        ]
+        assert [r["name"] for r in results] == [
+            name for case in cases for name in [case, f"{case}_exact"]
+        ]
+        assert all(r["requests"] == 2 for r in results)
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestResponseCacheBenchmark:
+    """Smoke test for the response cache workload."""
+
+    def test_times_every_page_in_every_mode(self, monkeypatch):
+        """Test that each page runs uncached, as a hit and as a miss."""
+        monkeypatch.setattr(response_cache, "REQUESTS", 2)
+        monkeypatch.setattr(response_cache, "WARMUP", 1)
+
+        results = response_cache.run(APIClient(), size=30, repeat=1)
+
+        assert [r["name"] for r in results] == [
+            f"{page}_{mode}"
+            for page, _ in response_cache.PAGES
+            for mode in ["uncached", "hit", "miss"]
+        ]
+        assert all(r["requests"] == 2 for r in results)
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestFieldsetsBenchmark:
+    """Smoke test for the list representations workload."""
+
+    def test_compares_every_representation(self, monkeypatch):
+        """Test that each representation runs and reports its size."""
+        monkeypatch.setattr(fieldsets, "REQUESTS", 2)
+        monkeypatch.setattr(fieldsets, "WARMUP", 1)
+
+        results = fieldsets.run(APIClient(), size=5, repeat=1)
+
+        sizes = {r["name"]: r["response_bytes"] for r in results}
+        assert list(sizes) == [
+            f"{page}_{name}"
+            for page, _ in fieldsets.PAGES
+            for name, _ in fieldsets.REPRESENTATIONS
+        ]
+        assert sizes["first_page_fields"] < sizes["first_page_summary"]
+        assert sizes["first_page_summary"] < sizes["first_page_full"]
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestEncodingsBenchmark:
+    """Smoke test for the response encodings workload."""
+
+    def test_compares_every_encoding(self, monkeypatch):
+        """Test that each format and coding runs and reports its size."""
+        monkeypatch.setattr(encodings, "REQUESTS", 2)
+        monkeypatch.setattr(encodings, "WARMUP", 1)
+        monkeypatch.setattr(encodings, "DECODES", 1)
+
+        results = encodings.run(APIClient(), size=20, repeat=1)
+
+        sizes = {r["name"]: r["response_bytes"] for r in results}
+        assert list(sizes) == [
+            f"{name}_{coding}"
+            for name in encodings.FORMATS
+            for coding in encodings.CODINGS
+        ]
+        assert sizes["json_gzip"] < sizes["json_identity"]
+        assert all(r["decode_ms"] >= 0 for r in results)
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="PostgreSQL only"
+)
+@pytest.mark.django_db(transaction=True)
+class TestServersBenchmark:
+    """Smoke test for the WSGI against ASGI server workload."""
+
+    def test_compares_both_server_modes(self, monkeypatch):
+        """Test that every case runs against both servers."""
+        monkeypatch.setattr(servers, "REQUESTS", 4)
+        monkeypatch.setattr(servers, "WARMUP", 2)
+        monkeypatch.setattr(servers, "CONCURRENCY", 2)
+        monkeypatch.setattr(servers, "WORKERS", 1)
+
+        results = servers.run(APIClient(), size=20, repeat=1)
+
+        cases = ["list", "list_filtered", "search", "retrieve", "create"]
+        assert [r["name"] for r in results] == [
+            f"{case}_{mode}" for mode in ["wsgi", "asgi"] for case in cases
+        ]
+        assert all(r["requests"] == 4 for r in results)
+        assert all(r["speedup"] > 0 for r in results if r["mode"] == "asgi")
+        assert Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestSeedTasks:
+    """Test cases for the synthetic data seeder."""
+
+    def test_command_inserts_reproducible_rows(self):
+        """Test that the same seed gives the same tasks."""
+        call_command("seed_tasks", 50, stdout=StringIO())
+        first = list(Task.objects.values_list("title", "priority", "due_date"))
+        call_command("seed_tasks", 50, "--clear", stdout=StringIO())
+        second = list(
+            Task.objects.values_list("title", "priority", "due_date")
+        )
+
+        assert len(first) == 50
+        assert first == second
+
+    def test_appends_after_existing_tasks(self):
+        """Test that seeding again extends the list order."""
+        seed_tasks(10)
+        seed_tasks(10)
+
+        ranks = list(
+            Task.objects.order_by("id").values_list("sort_order", flat=True)
+        )
+        assert len(ranks) == 20
+        assert ranks == sorted(set(ranks))
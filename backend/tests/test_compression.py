@@ -0,0 +1,170 @@
+import gzip
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+from tasks.compression import CODINGS, negotiate
+from tasks.models import Task
+
+
+@pytest.fixture
+def many_tasks(db):
+    return Task.objects.bulk_create(
+        Task(title=f"Task {i}", description="x" * 100, sort_order=i)
+        for i in range(40)
+    )
+
+
+def decode(coding, data):
+    if coding == "gzip":
+        return gzip.decompress(data)
+    if coding == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    brotli = pytest.importorskip("brotli")
+    return brotli.decompress(data)
+
+
+class TestNegotiate:
+    """Test cases for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("gzip", "gzip"),
+            ("GZIP, deflate", "gzip"),
+            ("gzip;q=0", None),
+            ("gzip;q=x", None),
+            ("", None),
+            ("identity", None),
+            ("deflate", None),
+        ],
+    )
+    def test_codings(self, header, expected):
+        """Test that supported codings are picked unless refused."""
+        assert negotiate(header) == expected
+
+    def test_wildcard(self):
+        """Test that * picks the preferred coding, minus those refused."""
+        preferred = next(iter(CODINGS))
+
+        assert negotiate("*") == preferred
+        assert negotiate(f"*, {preferred};q=0") == (
+            list(CODINGS)[1] if len(CODINGS) > 1 else None
+        )
+
+    def test_weights(self):
+        """Test that the client's weights win over ours."""
+        assert negotiate("zstd;q=0.5, br;q=0.5, gzip;q=0.9") == "gzip"
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """Test cases for compressed responses."""
+
+    def test_list_is_gzipped(self, api_client, many_tasks):
+        """Test that large lists are compressed with matching headers."""
+        url = reverse("tasks-list")
+        plain = api_client.get(url)
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert len(response.content) < len(plain.content)
+        assert gzip.decompress(response.content) == plain.content
+        assert response["ETag"] == "W/" + plain["ETag"]
+
+    def test_weak_etag_revalidates(self, api_client, many_tasks):
+        """Test that the weakened ETag still gets 304."""
+        url = reverse("tasks-list")
+        etag = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        response = api_client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("coding", ["zstd", "br"])
+    def test_optional_codings(self, api_client, many_tasks, coding):
+        """Test zstd and brotli when their modules are installed."""
+        if coding not in CODINGS:
+            pytest.skip(f"{coding} is not installed")
+        url = reverse("tasks-list")
+        plain = api_client.get(url)
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING=coding)
+
+        assert response["Content-Encoding"] == coding
+        assert decode(coding, response.content) == plain.content
+
+    def test_without_accept_encoding(self, api_client, many_tasks):
+        """Test that clients that accept nothing get the plain body."""
+        response = api_client.get(reverse("tasks-list"))
+
+        assert not response.has_header("Content-Encoding")
+        assert "Accept-Encoding" in response["Vary"]
+        assert response.json()["results"]
+
+    def test_small_responses(self, api_client, sample_task):
+        """Test that responses under the threshold are sent as they are."""
+        response = api_client.get(
+            reverse("tasks-detail", kwargs={"pk": sample_task.id}),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        assert not response.has_header("Content-Encoding")
+        assert response.data["title"] == "Test Task"
+
+    def test_html_is_not_compressed(self, client, many_tasks):
+        """Test that HTML pages, which hold CSRF tokens, are left alone."""
+        response = client.get(
+            reverse("tasks-list"),
+            HTTP_ACCEPT="text/html",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        assert response["Content-Type"].startswith("text/html")
+        assert not response.has_header("Content-Encoding")
+
+    def test_streaming_export(self, api_client, many_tasks):
+        """Test that exports are compressed chunk by chunk as they stream."""
+        url = reverse("tasks-export")
+        plain = b"".join(api_client.get(url, {"format": "ndjson"}))
+        response = api_client.get(
+            url, {"format": "ndjson"}, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        assert response.streaming
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == plain
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_streaming_export(self, many_tasks):
+        """Test that ASGI exports are compressed as they stream."""
+        response = async_to_sync(AsyncClient().get)(
+            reverse("tasks-export"),
+            {"format": "ndjson"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.is_async
+        assert response["Content-Encoding"] == "gzip"
+        data = b"".join(async_to_sync(_collect)(response.streaming_content))
+        assert len(gzip.decompress(data).splitlines()) == len(many_tasks)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=10**9)
+    def test_threshold_setting(self, api_client, many_tasks):
+        """Test that RESPONSE_COMPRESSION_MIN_BYTES is the threshold."""
+        response = api_client.get(
+            reverse("tasks-list"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        assert not response.has_header("Content-Encoding")
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
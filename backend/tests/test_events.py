@@ -0,0 +1,185 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tasks import events
+from tasks.events import LocalBroadcaster, event_stream
+from tasks.models import Task
+
+
+class RecordingBroadcaster(LocalBroadcaster):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, event):
+        self.published.append(event)
+        super().publish(event)
+
+
+@pytest.fixture
+def broadcaster(settings):
+    settings.TASK_EVENTS_BROADCASTER = "tests.test_events.RecordingBroadcaster"
+    events.get_broadcaster.cache_clear()
+    yield events.get_broadcaster()
+    events.get_broadcaster.cache_clear()
+
+
+class TestLocalBroadcaster:
+    """Test cases for in-process event fan-out."""
+
+    def test_fans_out_from_other_threads(self):
+        """Test that every subscriber receives a published event."""
+        broadcaster = LocalBroadcaster()
+
+        async def main():
+            async with broadcaster.subscribe() as first:
+                async with broadcaster.subscribe() as second:
+                    assert broadcaster.subscriber_count == 2
+                    thread = threading.Thread(
+                        target=broadcaster.publish,
+                        args=({"action": "update", "ids": [1]},),
+                    )
+                    thread.start()
+                    thread.join()
+                    return await first.get(), await second.get()
+
+        received = asyncio.run(main())
+
+        assert received == ({"action": "update", "ids": [1]},) * 2
+        assert broadcaster.subscriber_count == 0
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        """Test that an overflowing queue ends in a resync marker."""
+        broadcaster = LocalBroadcaster()
+        broadcaster.queue_size = 2
+
+        async def main():
+            async with broadcaster.subscribe() as subscription:
+                for i in range(5):
+                    broadcaster.publish({"action": "update", "ids": [i]})
+                await asyncio.sleep(0)
+                return [await subscription.get(), await subscription.get()]
+
+        first, last = asyncio.run(main())
+
+        assert first == {"action": "update", "ids": [1]}
+        assert last is None
+
+
+class TestEventStream:
+    """Test cases for Server-Sent Event encoding."""
+
+    def test_stream_messages(self):
+        """Test retry, heartbeat, event and resync messages."""
+        broadcaster = LocalBroadcaster()
+
+        async def main():
+            async with broadcaster.subscribe() as subscription:
+                stream = event_stream(subscription, heartbeat=0.01)
+                messages = [await anext(stream), await anext(stream)]
+                broadcaster.publish({"action": "delete", "ids": [7]})
+                messages.append(await anext(stream))
+                subscription.put(None)
+                messages.append(await anext(stream))
+                return messages
+
+        retry, heartbeat, event, resync = asyncio.run(main())
+
+        assert retry == "retry: 5000\n\n"
+        assert heartbeat == ": keepalive\n\n"
+        assert event == (
+            'event: delete\ndata: {"action": "delete", "ids": [7]}\n\n'
+        )
+        assert resync.startswith("event: resync\n")
+
+
+@pytest.mark.django_db
+class TestTaskEvents:
+    """Test cases for events published by task writes."""
+
+    def test_writes_publish_after_commit(
+        self, api_client, broadcaster, django_capture_on_commit_callbacks
+    ):
+        """Test create, update, delete and reorder events."""
+        with django_capture_on_commit_callbacks(execute=True):
+            task_id = api_client.post(
+                reverse("tasks-list"), {"title": "Live"}, format="json"
+            ).data["id"]
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(
+                reverse("tasks-detail", kwargs={"pk": task_id}),
+                {"completed": True},
+                format="json",
+            )
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse("tasks-reorder"),
+                {"task_orders": [{"id": task_id, "sort_order": 3}]},
+                format="json",
+            )
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(reverse("tasks-detail", kwargs={"pk": task_id}))
+
+        assert broadcaster.published == [
+            {"action": "create", "ids": [task_id]},
+            {"action": "update", "ids": [task_id]},
+            {"action": "reorder", "ids": [task_id]},
+            {"action": "delete", "ids": [task_id]},
+        ]
+
+    def test_nothing_published_on_rollback(
+        self, api_client, broadcaster, django_capture_on_commit_callbacks
+    ):
+        """Test that invalid writes publish nothing."""
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse("tasks-list"), {"priority": "urgent"}, format="json"
+            )
+
+        assert broadcaster.published == []
+        assert Task.objects.count() == 0
+
+    def test_large_changes_are_sent_without_ids(self):
+        """Test that oversized id lists collapse to a resync hint."""
+        event = events.make_event("reorder", list(range(1000)))
+
+        assert event == {"action": "reorder", "ids": None}
+
+
+class TestEventsEndpoint:
+    """Test cases for the streaming endpoint."""
+
+    def test_requires_asgi(self, api_client):
+        """Test that WSGI requests are refused instead of held open."""
+        response = api_client.get(reverse("task-events"))
+
+        assert response.status_code == 501
+
+    def test_streams_published_events(self, broadcaster):
+        """Test an ASGI client receiving a published event."""
+
+        async def main():
+            response = await AsyncClient().get(reverse("task-events"))
+            stream = aiter(response.streaming_content)
+            first = await anext(stream)
+            for _ in range(100):
+                if broadcaster.subscriber_count:
+                    break
+                await asyncio.sleep(0)
+            broadcaster.publish({"action": "create", "ids": [1]})
+            second = await anext(stream)
+            await stream.aclose()
+            return response, first, second
+
+        response, first, second = asyncio.run(main())
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert first == b"retry: 5000\n\n"
+        message = second.decode().split("data: ")[1]
+        assert json.loads(message) == {"action": "create", "ids": [1]}
@@ -0,0 +1,199 @@
+import datetime
+import json
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from tasks import renderers, views
+from tasks.models import Task
+from tasks.renderers import FastJSONRenderer
+from tasks.rows import get_row_encoder
+from tasks.serializers import TaskSerializer
+
+TITLES = [
+    "Plain",
+    'Quotes " and \\ backslashes',
+    "Line\nbreaks\tand \x01 controls",
+    "Unicode é ü 中文 😀",
+    "Separators \u2028 and \u2029",
+    "",
+]
+
+
+@pytest.fixture
+def many_tasks(db):
+    start = datetime.date(2026, 1, 1)
+    tasks = Task.objects.bulk_create(
+        Task(
+            title=TITLES[i % len(TITLES)] or f"Task {i}",
+            description=TITLES[(i + 1) % len(TITLES)],
+            priority=["low", "medium", "high"][i % 3],
+            due_date=None if i % 4 == 0 else start + datetime.timedelta(i),
+            completed=i % 5 == 0,
+            sort_order=(i * 7919) % 211,
+        )
+        for i in range(60)
+    )
+    # isoformat() drops a zero fraction but keeps trailing zeros.
+    moment = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+    Task.objects.filter(id=tasks[0].id).update(created_at=moment)
+    Task.objects.filter(id=tasks[1].id).update(
+        updated_at=moment.replace(microsecond=100)
+    )
+    return tasks
+
+
+@pytest.fixture
+def standard_get(api_client, monkeypatch):
+    """GET through TaskSerializer and DRF's JSONRenderer."""
+
+    def get(url):
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                views, "get_row_encoder", lambda cls, fields=None: None
+            )
+            patch.setattr(
+                views.TaskViewSet, "renderer_classes", [JSONRenderer]
+            )
+            return api_client.get(url)
+
+    return get
+
+
+@pytest.mark.django_db
+class TestFastListPath:
+    """Test that the fast list path is byte-for-byte identical."""
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "?all=true",
+            "?page_size=7",
+            "?ordering=-due_date&page_size=9",
+            "?ordering=created_at&priority=high,low&completed=false",
+            "?due_after=2026-01-10&due_before=2026-02-10&all=true",
+        ],
+    )
+    def test_list_matches_serializer(
+        self, api_client, standard_get, many_tasks, query
+    ):
+        """Test identical bytes for pages, filters and orderings."""
+        url = reverse("tasks-list") + query
+
+        fast = api_client.get(url)
+        standard = standard_get(url)
+
+        assert fast.status_code == standard.status_code == 200
+        assert fast.content == standard.content
+
+    def test_following_cursors_matches_serializer(
+        self, api_client, standard_get, many_tasks
+    ):
+        """Test that cursors from the fast path page identically."""
+        url = reverse("tasks-list") + "?ordering=due_date&page_size=11"
+        pages = 0
+        while url:
+            fast = api_client.get(url)
+            assert fast.content == standard_get(url).content
+            url = json.loads(fast.content)["next"]
+            pages += 1
+
+        assert pages == 6
+
+    def test_changes_matches_serializer(
+        self, api_client, standard_get, many_tasks
+    ):
+        """Test identical bytes for the delta sync snapshot."""
+        url = reverse("tasks-changes")
+
+        fast = json.loads(api_client.get(url).content)
+        standard = json.loads(standard_get(url).content)
+
+        assert fast["changed"] == standard["changed"]
+        assert len(fast["changed"]) == 60
+
+    def test_other_time_zones_match_serializer(self, many_tasks):
+        """Test that datetimes follow the active time zone."""
+        queryset = Task.objects.order_by("id")
+        encoder = get_row_encoder(TaskSerializer)
+
+        with timezone.override("America/New_York"):
+            expected = TaskSerializer(queryset, many=True).data
+            encoded = encoder.encode(encoder.rows(queryset))
+
+        assert encoded == expected
+        assert not encoded[0]["created_at"].endswith("Z")
+
+
+@pytest.mark.django_db
+class TestRowEncoder:
+    """Test cases for compiling row encoders."""
+
+    def test_custom_field_formats_use_the_field(self, many_tasks):
+        """Test that unknown conversions fall back to the field."""
+
+        class FormattedSerializer(serializers.ModelSerializer):
+            due_date = serializers.DateField(format="%d/%m/%Y")
+
+            class Meta:
+                model = Task
+                fields = ["id", "due_date", "updated_at"]
+
+        queryset = Task.objects.order_by("id")
+        encoder = get_row_encoder(FormattedSerializer)
+
+        assert encoder.encode(encoder.rows(queryset)) == (
+            FormattedSerializer(queryset, many=True).data
+        )
+
+    def test_computed_fields_are_not_supported(self):
+        """Test that serializers with computed fields are left alone."""
+
+        class ComputedSerializer(serializers.ModelSerializer):
+            overdue = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Task
+                fields = ["id", "overdue"]
+
+            def get_overdue(self, task):
+                return False
+
+        assert get_row_encoder(ComputedSerializer) is None
+
+
+class TestFastJSONRenderer:
+    """Test cases for the orjson renderer and its fallbacks."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"title": TITLES, "n": None, "ok": True, "id": 2**62},
+            [{"nested": {"list": [1, "two", False]}}],
+            {1: "integer keys"},
+            {"when": datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)},
+            None,
+        ],
+    )
+    def test_matches_json_renderer(self, data):
+        """Test identical bytes, including types that fall back."""
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indented_output_uses_stock_encoder(self):
+        """Test that pretty-printing is left to the stock encoder."""
+        media_type = "application/json; indent=2"
+        data = {"title": "x"}
+
+        assert FastJSONRenderer().render(data, media_type) == (
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_works_without_orjson(self, monkeypatch):
+        """Test the fallback when orjson is not installed."""
+        monkeypatch.setattr(renderers, "orjson", None)
+        data = {"title": TITLES}
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
@@ -0,0 +1,138 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.serializers import SUMMARY_DESCRIPTION_LENGTH, TaskSummarySerializer
+
+
+@pytest.fixture
+def long_tasks(db):
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}",
+            description=f"{i} é " + "x" * 5000,
+            priority=["low", "medium", "high"][i % 3],
+            sort_order=i,
+        )
+        for i in range(5)
+    )
+
+
+def select(queries):
+    return next(
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT") and '"tasks_task"' in query["sql"]
+    )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Test cases for ?fields= on task lists."""
+
+    def test_fields_limit_items(self, api_client, long_tasks):
+        """Test that items hold the fields named, in the usual order."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse("tasks-list"), {"fields": "title, id,completed"}
+            )
+
+        assert response.status_code == 200
+        assert [list(task) for task in response.data["results"]] == [
+            ["id", "title", "completed"]
+        ] * 5
+        assert '"description"' not in select(queries)
+
+    def test_unknown_fields(self, api_client, long_tasks):
+        """Test that fields the serializer does not have are rejected."""
+        response = api_client.get(
+            reverse("tasks-list"), {"fields": "title,secret"}
+        )
+
+        assert response.status_code == 400
+        assert "secret" in str(response.data["fields"])
+
+    def test_empty_fields_mean_all(self, api_client, long_tasks):
+        """Test that an empty list selects every field."""
+        response = api_client.get(reverse("tasks-list"), {"fields": ""})
+
+        assert "description" in response.data["results"][0]
+
+    def test_cursors_without_ordering_fields(self, api_client, long_tasks):
+        """Test that pages follow each other without the ordering keys."""
+        url = reverse("tasks-list")
+        params = {"fields": "title", "page_size": 2, "ordering": "-due_date"}
+        titles = []
+        response = api_client.get(url, params)
+        while True:
+            titles += [task["title"] for task in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = api_client.get(response.data["next"])
+
+        assert sorted(titles) == sorted(task.title for task in long_tasks)
+        assert "fields=title" in api_client.get(url, params).data["next"]
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views(self, long_tasks):
+        """Test that the async list takes fields too."""
+        response = async_to_sync(AsyncClient().get)(
+            reverse("tasks-list"), {"fields": "id"}
+        )
+
+        assert response.json()["results"][0] == {"id": long_tasks[0].id}
+
+
+@pytest.mark.django_db
+class TestSummaryView:
+    """Test cases for ?view=summary on task lists."""
+
+    def test_descriptions_are_cut(self, api_client, long_tasks):
+        """Test that the query returns only a preview of descriptions."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse("tasks-list"), {"view": "summary"}
+            )
+
+        first = response.data["results"][0]
+        assert (
+            first["description"]
+            == long_tasks[0].description[:SUMMARY_DESCRIPTION_LENGTH]
+        )
+        assert first["title"] == "Task 0"
+        assert "description_left" in select(queries)
+
+    def test_matches_serializer(self, api_client, long_tasks):
+        """Test that the fast path matches TaskSummarySerializer."""
+        response = api_client.get(
+            reverse("tasks-list"), {"view": "summary", "all": "true"}
+        )
+
+        expected = TaskSummarySerializer(
+            Task.objects.order_by("sort_order"), many=True
+        ).data
+        assert response.json() == expected
+
+    def test_with_fields(self, api_client, long_tasks):
+        """Test that the summary view takes fields too."""
+        response = api_client.get(
+            reverse("tasks-list"),
+            {"view": "summary", "fields": "description"},
+        )
+
+        assert response.data["results"][0] == {
+            "description": long_tasks[0].description[
+                :SUMMARY_DESCRIPTION_LENGTH
+            ]
+        }
+
+    def test_unknown_view(self, api_client, long_tasks):
+        """Test that only known views are accepted."""
+        response = api_client.get(reverse("tasks-list"), {"view": "brief"})
+
+        assert response.status_code == 400
+        assert "view" in response.data
@@ -0,0 +1,293 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from tasks.filters import ORDERING_ANNOTATIONS, TASK_ORDERINGS
+from tasks.models import Task
+from tasks.pagination import keyset_filter, order_by_args
+from tasks.search import search_tasks
+
+from .conftest import titles
+
+MILLION = 1_000_000
+THIS_WEEK = (datetime.date(2026, 3, 2), datetime.date(2026, 3, 8))
+
+
+@pytest.fixture
+def varied_tasks(db):
+    rows = [
+        ("Open high this week", "high", datetime.date(2026, 3, 3), False),
+        ("Open high next week", "high", datetime.date(2026, 3, 10), False),
+        ("Done high this week", "high", datetime.date(2026, 3, 4), True),
+        ("Open low this week", "low", datetime.date(2026, 3, 5), False),
+        ("Open medium no date", "medium", None, False),
+        ("Done medium no date", "medium", None, True),
+    ]
+    return [
+        Task.objects.create(
+            title=title,
+            priority=priority,
+            due_date=due_date,
+            completed=completed,
+            sort_order=i,
+        )
+        for i, (title, priority, due_date, completed) in enumerate(rows)
+    ]
+
+
+@pytest.mark.django_db
+class TestTaskFilters:
+    """Test cases for list filtering parameters."""
+
+    def test_filter_open_high_priority_due_this_week(
+        self, api_client, varied_tasks
+    ):
+        """Test combining completed, priority and due date range."""
+        response = api_client.get(
+            reverse("tasks-list"),
+            {
+                "completed": "false",
+                "priority": "high",
+                "due_after": THIS_WEEK[0].isoformat(),
+                "due_before": THIS_WEEK[1].isoformat(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert titles(response) == ["Open high this week"]
+
+    def test_filter_multiple_priorities(self, api_client, varied_tasks):
+        """Test a comma-separated priority list."""
+        response = api_client.get(
+            reverse("tasks-list"), {"priority": "low,medium"}
+        )
+
+        assert titles(response) == [
+            "Open low this week",
+            "Open medium no date",
+            "Done medium no date",
+        ]
+
+    def test_filter_completed(self, api_client, varied_tasks):
+        """Test filtering by completion status."""
+        response = api_client.get(reverse("tasks-list"), {"completed": "1"})
+
+        assert titles(response) == [
+            "Done high this week",
+            "Done medium no date",
+        ]
+
+    def test_filters_apply_to_unpaginated_list(self, api_client, varied_tasks):
+        """Test that filters also apply with all=true."""
+        response = api_client.get(
+            reverse("tasks-list"), {"all": "true", "priority": "high"}
+        )
+
+        assert len(response.data) == 3
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"priority": "urgent"},
+            {"completed": "maybe"},
+            {"due_after": "next week"},
+            {"ordering": "title"},
+        ],
+    )
+    def test_invalid_parameters(self, api_client, varied_tasks, params):
+        """Test that malformed filter values are rejected."""
+        response = api_client.get(reverse("tasks-list"), params)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestTaskOrdering:
+    """Test cases for list ordering parameters."""
+
+    def test_due_date_ordering_puts_undated_last(
+        self, api_client, varied_tasks
+    ):
+        """Test ascending due date ordering across keyset pages."""
+        url = reverse("tasks-list") + "?ordering=due_date&page_size=2"
+        seen = []
+        while url:
+            response = api_client.get(url)
+            seen += titles(response)
+            url = response.data["next"]
+
+        assert seen == [
+            "Open high this week",
+            "Done high this week",
+            "Open low this week",
+            "Open high next week",
+            "Open medium no date",
+            "Done medium no date",
+        ]
+
+    def test_descending_due_date_pages_forward_and_back(
+        self, api_client, varied_tasks
+    ):
+        """Test descending due date ordering with previous links."""
+        url = reverse("tasks-list") + "?ordering=-due_date&page_size=2"
+        pages = []
+        while url:
+            response = api_client.get(url)
+            pages.append(response)
+            url = response.data["next"]
+        seen = [title for page in pages for title in titles(page)]
+
+        assert seen == [
+            "Done medium no date",
+            "Open medium no date",
+            "Open high next week",
+            "Open low this week",
+            "Done high this week",
+            "Open high this week",
+        ]
+        back = api_client.get(pages[-1].data["previous"])
+        assert titles(back) == titles(pages[-2])
+
+    def test_created_at_ordering(self, api_client, varied_tasks):
+        """Test newest-first ordering."""
+        response = api_client.get(
+            reverse("tasks-list"), {"ordering": "-created_at"}
+        )
+
+        assert titles(response) == [t.title for t in reversed(varied_tasks)]
+
+
+def explain(queryset):
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+    """Test that filtered and ordered lists are answered from indexes."""
+
+    def test_open_priority_query_uses_partial_index(self, varied_tasks):
+        """Test the SQLite plan for open high-priority tasks this week."""
+        if connection.vendor != "sqlite":
+            pytest.skip("SQLite query plan")
+        queryset = Task.objects.filter(
+            completed=False,
+            priority__in=["high"],
+            due_date__gte=THIS_WEEK[0],
+            due_date__lte=THIS_WEEK[1],
+        )
+
+        assert "task_open_priority_due_idx" in explain(queryset)
+
+
+@pytest.fixture(scope="class")
+def million_tasks(django_db_setup, django_db_blocker):
+    """Seed a million committed rows shared by a test class."""
+    with django_db_blocker.unblock():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO tasks_task (
+                    title, description, priority, due_date, completed,
+                    sort_order, created_at, updated_at
+                )
+                SELECT
+                    'Task ' || g,
+                    '',
+                    (ARRAY['low', 'medium', 'high'])[1 + g %% 3],
+                    CASE WHEN g %% 5 = 0 THEN NULL
+                         ELSE DATE '2026-01-01' + (g %% 365) END,
+                    g %% 4 <> 0,
+                    g::bigint * 65536,
+                    TIMESTAMPTZ '2026-01-01' + g * INTERVAL '1 second',
+                    TIMESTAMPTZ '2026-01-01' + g * INTERVAL '1 second'
+                FROM generate_series(1, %s) AS g
+                """,
+                [MILLION],
+            )
+            cursor.execute("ANALYZE tasks_task")
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE tasks_task")
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="set TEST_DATABASE_URL to a PostgreSQL database",
+)
+@pytest.mark.usefixtures("million_tasks")
+@pytest.mark.django_db
+class TestPostgresQueryPlans:
+    """EXPLAIN the list queries against one million tasks."""
+
+    def assert_indexed(self, queryset):
+        plan = explain(queryset)
+        assert "Seq Scan" not in plan, plan
+        assert "Index" in plan, plan
+        return plan
+
+    def assert_range_scan(self, queryset):
+        """Cursor pages must seek to the cursor, not filter up to it."""
+        plan = self.assert_indexed(queryset)
+        assert "Index Cond" in plan, plan
+
+    def page(self, name, after=None, **filters):
+        ordering = TASK_ORDERINGS[name]
+        queryset = Task.objects.filter(**filters).annotate(
+            **ORDERING_ANNOTATIONS
+        )
+        if after is not None:
+            queryset = queryset.filter(keyset_filter(ordering, after))
+        return queryset.order_by(*order_by_args(ordering))[:51]
+
+    def test_first_and_deep_position_pages(self):
+        """Test default ordering at the start and deep in the list."""
+        self.assert_indexed(self.page("position"))
+        deep = Task.objects.order_by("sort_order")[900_000]
+        self.assert_range_scan(
+            self.page(
+                "position", after=[deep.sort_order, deep.created_at, deep.id]
+            )
+        )
+
+    def test_open_high_priority_due_this_week(self):
+        """Test the dashboard query is a single indexed lookup."""
+        self.assert_indexed(
+            self.page(
+                "position",
+                completed=False,
+                priority__in=["high"],
+                due_date__gte=THIS_WEEK[0],
+                due_date__lte=THIS_WEEK[1],
+            )
+        )
+
+    def test_due_date_orderings(self):
+        """Test both due date orderings, including past a cursor."""
+        self.assert_indexed(self.page("due_date"))
+        self.assert_indexed(self.page("-due_date"))
+        self.assert_range_scan(
+            self.page("due_date", after=[datetime.date(2026, 6, 1), 0])
+        )
+        self.assert_range_scan(
+            self.page("-due_date", after=[datetime.date(2026, 6, 1), 0])
+        )
+
+    def test_open_tasks_by_due_date(self):
+        """Test open tasks ordered by due date."""
+        self.assert_indexed(self.page("due_date", completed=False))
+
+    def test_created_at_orderings(self):
+        """Test both creation time orderings."""
+        self.assert_indexed(self.page("created_at"))
+        self.assert_indexed(self.page("-created_at"))
+
+    def test_search_uses_gin_index(self):
+        """Test that full-text search reads the generated tsvector index."""
+        queryset = search_tasks(Task.objects.all(), "task 123456")
+
+        plan = self.assert_indexed(
+            queryset.order_by("-search_rank", "id")[:51]
+        )
+        assert "task_search_vector_idx" in plan, plan
@@ -34,8 +34,11 @@ class TestTaskWorkflows:
         # 2. Verify task was created
         list_response = api_client.get(create_url)
         assert list_response.status_code == status.HTTP_200_OK
-        assert len(list_response.data) == 1
-        assert list_response.data[0]["title"] == "Integration Test Task"
+        assert len(list_response.data["results"]) == 1
+        assert (
+            list_response.data["results"][0]["title"]
+            == "Integration Test Task"
+        )
 
         # 3. Update the task
         update_url = reverse("tasks-detail", kwargs={"pk": task_id})
@@ -89,7 +92,7 @@ class TestTaskWorkflows:
 
         # Verify all tasks exist
         list_response = api_client.get(reverse("tasks-list"))
-        assert len(list_response.data) == 3
+        assert len(list_response.data["results"]) == 3
 
         # Complete all tasks
         for task_id in created_ids:
@@ -139,9 +142,9 @@ class TestTaskWorkflows:
 
         # Verify via API (ordered by sort_order)
         list_response = api_client.get(reverse("tasks-list"))
-        assert list_response.data[0]["title"] == "Third"
-        assert list_response.data[1]["title"] == "First"
-        assert list_response.data[2]["title"] == "Second"
+        assert list_response.data["results"][0]["title"] == "Third"
+        assert list_response.data["results"][1]["title"] == "First"
+        assert list_response.data["results"][2]["title"] == "Second"
 
     def test_task_filtering_and_search(self, api_client):
         """Test filtering tasks by different criteria."""
@@ -158,7 +161,7 @@ class TestTaskWorkflows:
 
         # Get all tasks
         all_tasks = api_client.get(reverse("tasks-list"))
-        assert len(all_tasks.data) == 3
+        assert len(all_tasks.data["results"]) == 3
 
         # Verify we can filter in database
         high_priority = Task.objects.filter(priority="high")
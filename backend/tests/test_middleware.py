@@ -0,0 +1,132 @@
+import asyncio
+import contextvars
+import json
+import logging
+import re
+import threading
+
+import pytest
+from django.db import connection
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tasks.middleware import RequestTiming
+
+TIMING = re.compile(
+    r"total;dur=[\d.]+, view;dur=[\d.]+, "
+    r'db;dur=[\d.]+;desc="(\d+) queries", '
+    r"serialize;dur=[\d.]+, middleware;dur=[\d.]+"
+)
+
+
+@pytest.mark.django_db
+class TestRequestTimingMiddleware:
+    """Test cases for Server-Timing headers and the slow-request log."""
+
+    @pytest.fixture(autouse=True)
+    def sample_every_request(self, settings):
+        settings.REQUEST_TIMING_SAMPLE_RATE = 1.0
+
+    def test_reports_timings_and_query_count(self, api_client, sample_task):
+        """Test that every phase and the SQL query count are reported."""
+        response = api_client.get(reverse("tasks-list"))
+
+        match = TIMING.fullmatch(response["Server-Timing"])
+        assert match
+        # The collection version, then the page.
+        assert match.group(1) == "2"
+
+    def test_counts_writes(self, api_client, sample_task):
+        """Test that queries in write transactions are counted."""
+        response = api_client.patch(
+            reverse("tasks-batch"),
+            {"tasks": [{"id": sample_task.id, "completed": True}]},
+            format="json",
+        )
+
+        assert int(TIMING.fullmatch(response["Server-Timing"]).group(1)) > 1
+
+    def test_unsampled_requests_are_left_alone(
+        self, api_client, sample_task, settings
+    ):
+        """Test that a zero sample rate disables instrumentation."""
+        settings.REQUEST_TIMING_SAMPLE_RATE = 0
+
+        response = api_client.get(reverse("tasks-list"))
+
+        assert response.status_code == 200
+        assert "Server-Timing" not in response
+
+    def test_logs_slow_requests_with_sql(
+        self, api_client, sample_task, settings, caplog
+    ):
+        """Test that slow requests are logged with their statements."""
+        settings.REQUEST_TIMING_SLOW_MS = 0
+
+        with caplog.at_level(logging.WARNING, logger="tasks.middleware"):
+            api_client.get(reverse("tasks-list"), {"priority": "medium"})
+
+        (record,) = caplog.records
+        entry = json.loads(record.getMessage())
+        assert entry["event"] == "slow_request"
+        assert entry["path"] == reverse("tasks-list")
+        assert entry["status"] == 200
+        assert entry["queries"] == 2
+        assert any(
+            '"tasks_task"' in query["sql"]
+            for query in entry["slowest_queries"]
+        )
+        assert record.timing == entry
+
+    def test_logs_requests_with_many_queries(
+        self, api_client, sample_task, settings, caplog
+    ):
+        """Test the query count threshold."""
+        settings.REQUEST_TIMING_SLOW_QUERIES = 3
+
+        with caplog.at_level(logging.WARNING, logger="tasks.middleware"):
+            api_client.get(reverse("tasks-list"))
+            api_client.post(
+                reverse("tasks-list"), {"title": "New"}, format="json"
+            )
+
+        assert [
+            json.loads(r.getMessage())["path"] for r in caplog.records
+        ] == [reverse("tasks-list")]
+        assert json.loads(caplog.records[0].getMessage())["queries"] >= 3
+
+    def test_times_requests_under_asgi(self):
+        """Test that the async middleware path reports timings."""
+
+        async def main():
+            response = await AsyncClient().get(reverse("task-events"))
+            await response.streaming_content.aclose()
+            return response
+
+        response = asyncio.run(main())
+
+        assert response.status_code == 200
+        assert TIMING.fullmatch(response["Server-Timing"])
+
+    def test_counts_queries_on_other_threads(self):
+        """Test that queries the request runs on a thread are counted."""
+
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        def on_thread():
+            query()
+            connection.close()
+
+        timing = RequestTiming()
+        with timing.capture_queries():
+            # As sync_to_async does for async views.
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(on_thread,)
+            )
+            thread.start()
+            thread.join()
+        query()
+
+        assert [sql for sql, _ in timing.queries] == ["SELECT 1"]
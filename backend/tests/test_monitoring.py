@@ -0,0 +1,158 @@
+import subprocess
+import sys
+import time
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test import Client
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tasks import views
+from tasks.monitoring import check_database, render_metrics
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="PostgreSQL only"
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """Test cases for request metrics and the metrics endpoint."""
+
+    def test_counts_and_times_requests_by_route(self, api_client):
+        """Test request counters and latency histograms."""
+        labels = {"route": "tasks-list", "method": "GET"}
+        before = sample("http_requests_total", status="200", **labels)
+        observed = sample("http_request_duration_seconds_count", **labels)
+
+        api_client.get(reverse("tasks-list"))
+        api_client.get("/api/nowhere")
+
+        assert sample("http_requests_total", status="200", **labels) == (
+            before + 1
+        )
+        assert sample("http_request_duration_seconds_count", **labels) == (
+            observed + 1
+        )
+        assert sample(
+            "http_requests_total",
+            route="unmatched",
+            method="GET",
+            status="404",
+        )
+        assert sample("http_requests_in_progress") == 0
+
+    def test_counts_exceptions(self, monkeypatch):
+        """Test that unhandled view errors are counted as 500s."""
+
+        def fail(self, request):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(views.TaskViewSet, "list", fail)
+        labels = {"route": "tasks-list"}
+        errors = sample(
+            "http_requests_total", method="GET", status="500", **labels
+        )
+        raised = sample(
+            "http_request_exceptions_total", exception="RuntimeError", **labels
+        )
+
+        response = Client(raise_request_exception=False).get(
+            reverse("tasks-list")
+        )
+
+        assert response.status_code == 500
+        assert sample(
+            "http_requests_total", method="GET", status="500", **labels
+        ) == (errors + 1)
+        assert sample(
+            "http_request_exceptions_total", exception="RuntimeError", **labels
+        ) == (raised + 1)
+
+    def test_endpoint_serves_text_format(self, api_client):
+        """Test the Prometheus exposition endpoint."""
+        api_client.get(reverse("health"))
+
+        response = api_client.get(reverse("metrics"))
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        assert b'http_requests_total{method="GET",route="health"' in (
+            response.content
+        )
+
+    def test_sums_metrics_over_worker_processes(self, tmp_path, monkeypatch):
+        """Test that multiprocess files from every worker are summed."""
+        worker = (
+            "from prometheus_client import Counter; "
+            "Counter('http_requests_total', '', ['route', 'method', "
+            "'status']).labels('tasks-list', 'GET', '200').inc()"
+        )
+        env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        output = render_metrics().decode()
+
+        assert (
+            'http_requests_total{method="GET",route="tasks-list",'
+            'status="200"} 2.0'
+        ) in output
+
+    @postgres_only
+    def test_reports_database_connections(self):
+        """Test connection usage read from pg_stat_activity."""
+        output = render_metrics().decode()
+
+        assert 'db_connections{state="active"}' in output
+        assert "db_max_connections " in output
+
+
+@pytest.mark.django_db
+class TestReadiness:
+    """Test cases for the readiness probe."""
+
+    def test_ready_when_database_answers(self, api_client):
+        """Test a healthy probe."""
+        response = api_client.get(reverse("ready"))
+
+        assert response.status_code == 200
+        assert response.data["status"] == "ready"
+        assert response.data["database_ms"] >= 0
+
+    def test_unavailable_when_database_fails(self, api_client, monkeypatch):
+        """Test that a failing database makes the instance unready."""
+
+        def down(timeout):
+            raise DatabaseError("connection refused")
+
+        monkeypatch.setattr(views, "check_database", down)
+
+        response = api_client.get(reverse("ready"))
+
+        assert response.status_code == 503
+        assert response.data["status"] == "unavailable"
+
+    @postgres_only
+    def test_probe_gives_up_after_timeout(self, settings):
+        """Test that an unreachable server fails within the timeout."""
+        database = settings.DATABASES["default"]
+        assert check_database(1) < 1
+        # A non-routable address never answers the connection attempt.
+        original = database["HOST"], database["PORT"]
+        database["HOST"], database["PORT"] = "10.255.255.1", 5432
+        start = time.perf_counter()
+        try:
+            with pytest.raises(DatabaseError):
+                check_database(1)
+        finally:
+            database["HOST"], database["PORT"] = original
+
+        # libpq's shortest connect timeout is two seconds.
+        assert time.perf_counter() - start < 3
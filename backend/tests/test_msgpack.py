@@ -0,0 +1,175 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tasks.models import Task
+
+msgpack = pytest.importorskip("msgpack")
+
+MSGPACK = "application/msgpack"
+
+
+def packed(data):
+    return msgpack.packb(data)
+
+
+def unpacked(response):
+    assert response["Content-Type"] == MSGPACK
+    return msgpack.unpackb(response.content)
+
+
+@pytest.mark.django_db
+class TestMessagePackRenderer:
+    """Test cases for MessagePack task responses."""
+
+    def test_list_matches_json(self, api_client, sample_task):
+        """Test that lists decode to the JSON representation."""
+        url = reverse("tasks-list")
+        response = api_client.get(url, HTTP_ACCEPT=MSGPACK)
+
+        assert unpacked(response) == api_client.get(url).json()
+
+    def test_format_parameter(self, api_client, sample_task):
+        """Test that ?format=msgpack selects MessagePack."""
+        response = api_client.get(
+            reverse("tasks-detail", kwargs={"pk": sample_task.id}),
+            {"format": "msgpack"},
+        )
+
+        assert unpacked(response)["title"] == "Test Task"
+
+    def test_etag_names_format(self, api_client, sample_task):
+        """Test that the MessagePack and JSON lists have their own ETags."""
+        url = reverse("tasks-list")
+        binary = api_client.get(url, HTTP_ACCEPT=MSGPACK)["ETag"]
+
+        assert binary.endswith('-msgpack"')
+        assert binary != api_client.get(url)["ETag"]
+
+    def test_errors(self, api_client):
+        """Test that errors are rendered as MessagePack too."""
+        response = api_client.get(
+            reverse("tasks-detail", kwargs={"pk": 0}), HTTP_ACCEPT=MSGPACK
+        )
+
+        assert response.status_code == 404
+        assert "detail" in unpacked(response)
+
+
+@pytest.mark.django_db
+class TestMessagePackParser:
+    """Test cases for MessagePack task requests."""
+
+    def test_create(self, api_client):
+        """Test that tasks can be created from MessagePack."""
+        response = api_client.post(
+            reverse("tasks-list"),
+            packed({"title": "Packed", "priority": "high"}),
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+
+        assert response.status_code == 201
+        assert unpacked(response)["title"] == "Packed"
+        assert Task.objects.get().priority == "high"
+
+    def test_batch_update(self, api_client, sample_task):
+        """Test that batch writes take MessagePack."""
+        response = api_client.patch(
+            reverse("tasks-batch"),
+            packed({"tasks": [{"id": sample_task.id, "completed": True}]}),
+            content_type=MSGPACK,
+        )
+
+        sample_task.refresh_from_db()
+        assert response.status_code == 200
+        assert sample_task.completed is True
+
+    def test_invalid_body(self, api_client):
+        """Test that malformed MessagePack gets 400."""
+        response = api_client.post(
+            reverse("tasks-list"), b"\xc1", content_type=MSGPACK
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("tasks.async_urls")
+class TestAsyncMessagePack:
+    """Test cases for MessagePack in the async server mode."""
+
+    def test_list_matches_json(self, sample_task):
+        """Test that async lists negotiate MessagePack and their tag."""
+        get = async_to_sync(AsyncClient().get)
+        url = reverse("tasks-list")
+
+        binary = get(url, headers={"Accept": MSGPACK})
+        plain = get(url)
+
+        assert unpacked(binary) == plain.json()
+        assert binary["ETag"].endswith('-msgpack"')
+        assert plain["ETag"].endswith('-json"')
+
+    def test_cached_list(self, sample_task, settings):
+        """Test that cached lists are kept apart by media type."""
+        settings.RESPONSE_CACHE = True
+        get = async_to_sync(AsyncClient().get)
+        url = reverse("tasks-list")
+
+        get(url)
+        binary = get(url, {"format": "msgpack"})
+
+        assert unpacked(binary)["results"][0]["title"] == "Test Task"
+
+    def test_detail_changes_and_errors(self, sample_task):
+        """Test the detail and changes routes and error responses."""
+        get = async_to_sync(AsyncClient().get)
+        headers = {"Accept": MSGPACK}
+
+        fetched = get(
+            reverse("tasks-detail", kwargs={"pk": sample_task.id}),
+            headers=headers,
+        )
+        changes = get(reverse("tasks-changes"), headers=headers)
+        missing = get(
+            reverse("tasks-detail", kwargs={"pk": 0}), headers=headers
+        )
+
+        assert unpacked(fetched)["title"] == "Test Task"
+        assert [task["id"] for task in unpacked(changes)["changed"]] == [
+            sample_task.id
+        ]
+        assert missing.status_code == 404
+        assert "detail" in unpacked(missing)
+
+    def test_writes(self, sample_task):
+        """Test that creates and updates take MessagePack bodies."""
+        client = AsyncClient()
+
+        created = async_to_sync(client.post)(
+            reverse("tasks-list"),
+            packed({"title": "Packed"}),
+            content_type=MSGPACK,
+            headers={"Accept": MSGPACK},
+        )
+        updated = async_to_sync(client.patch)(
+            reverse("tasks-detail", kwargs={"pk": sample_task.id}),
+            packed({"completed": True, "version": 1}),
+            content_type=MSGPACK,
+        )
+
+        assert created.status_code == 201
+        assert unpacked(created)["title"] == "Packed"
+        assert updated.status_code == 200
+        assert updated.json()["completed"] is True
+
+    def test_not_acceptable(self, sample_task):
+        """Test that unsupported media types get 406 as JSON."""
+        response = async_to_sync(AsyncClient().get)(
+            reverse("tasks-list"), headers={"Accept": "text/html"}
+        )
+
+        assert response.status_code == 406
+        assert response["Content-Type"] == "application/json"
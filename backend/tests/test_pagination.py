@@ -0,0 +1,92 @@
+import pytest
+from django.urls import reverse
+
+from tasks.models import Task
+
+
+@pytest.fixture
+def many_tasks(db):
+    return [
+        Task.objects.create(title=f"Task {i:02d}", sort_order=i // 2)
+        for i in range(25)
+    ]
+
+
+def collect_pages(api_client, url):
+    titles = []
+    pages = 0
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        titles += [task["title"] for task in response.data["results"]]
+        url = response.data["next"]
+        pages += 1
+    return titles, pages
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    """Test cases for keyset pagination of the task list."""
+
+    def test_first_page_envelope(self, api_client, many_tasks):
+        """Test the paginated response shape."""
+        response = api_client.get(reverse("tasks-list"), {"page_size": 10})
+
+        assert response.status_code == 200
+        assert set(response.data) == {"next", "previous", "results"}
+        assert len(response.data["results"]) == 10
+        assert response.data["previous"] is None
+        assert response.data["next"] is not None
+
+    def test_walks_every_task_once_in_order(self, api_client, many_tasks):
+        """Test that following next links visits all tasks in order."""
+        url = reverse("tasks-list") + "?page_size=7"
+        titles, pages = collect_pages(api_client, url)
+
+        assert titles == [task.title for task in many_tasks]
+        assert pages == 4
+
+    def test_previous_link_returns_prior_page(self, api_client, many_tasks):
+        """Test navigating backwards from the second page."""
+        first = api_client.get(reverse("tasks-list"), {"page_size": 5})
+        second = api_client.get(first.data["next"])
+        back = api_client.get(second.data["previous"])
+
+        assert back.data["results"] == first.data["results"]
+        assert back.data["next"] == first.data["next"]
+
+    def test_pages_are_stable_across_reorders(self, api_client, many_tasks):
+        """Test that moving earlier tasks does not shift later pages."""
+        first = api_client.get(reverse("tasks-list"), {"page_size": 5})
+        seen = [task["title"] for task in first.data["results"]]
+
+        # Move a task from the first page to the very end.
+        Task.objects.filter(title="Task 00").update(sort_order=1000)
+        rest, _ = collect_pages(api_client, first.data["next"])
+
+        assert rest == [t.title for t in many_tasks[5:]] + ["Task 00"]
+        assert not set(seen[1:]) & set(rest)
+
+    def test_all_returns_plain_list(self, api_client, many_tasks):
+        """Test the opt-in unpaginated mode."""
+        response = api_client.get(reverse("tasks-list"), {"all": "true"})
+
+        assert response.status_code == 200
+        assert isinstance(response.data, list)
+        assert len(response.data) == 25
+
+    def test_page_size_is_capped(self, api_client, many_tasks):
+        """Test that page_size is bounded and invalid sizes fall back."""
+        response = api_client.get(reverse("tasks-list"), {"page_size": "x"})
+        assert len(response.data["results"]) == 25
+
+        response = api_client.get(reverse("tasks-list"), {"page_size": 3})
+        assert len(response.data["results"]) == 3
+
+    def test_invalid_cursor(self, api_client, many_tasks):
+        """Test that a malformed cursor is rejected with 404."""
+        for cursor in ["not-a-cursor", "eyJ2IjpbMV19", "eyJ2IjpbIngiLDEsMV19"]:
+            response = api_client.get(
+                reverse("tasks-list"), {"cursor": cursor}
+            )
+            assert response.status_code == 404
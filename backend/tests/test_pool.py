@@ -0,0 +1,165 @@
+import pytest
+from django.db import OperationalError, connection, connections
+from prometheus_client import REGISTRY
+from psycopg_pool import ConnectionPool
+
+from config.env_settings import Settings
+from tasks.monitoring import publish_pool_stats
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="PostgreSQL only"
+)
+
+
+def sample(name, database):
+    return REGISTRY.get_sample_value(name, {"database": database}) or 0
+
+
+@pytest.fixture
+def pooled():
+    """Open PostgreSQL connections through their own pools."""
+    wrappers = []
+
+    def connect(alias, health_checks=False, **options):
+        settings_dict = {
+            **connection.settings_dict,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": health_checks,
+            "OPTIONS": {
+                **connection.settings_dict["OPTIONS"],
+                "pool": options,
+            },
+        }
+        wrapper = type(connections["default"])(settings_dict, alias)
+        wrappers.append(wrapper)
+        return wrapper
+
+    yield connect
+    for wrapper in wrappers:
+        wrapper.close()
+        wrapper.close_pool()
+
+
+class TestPoolSettings:
+    """Test cases for the connection pool configuration."""
+
+    def test_sizes_are_per_worker(self):
+        """Test the default per-worker pool arguments."""
+        options = Settings(
+            secret_key="x", db_pool_min_size=1, db_pool_max_size=8
+        ).db_pool_options()
+
+        assert options["min_size"] == 1
+        assert options["max_size"] == 8
+        assert options["timeout"] == 10.0
+
+    def test_total_size_is_split_between_workers(self):
+        """Test that a total connection budget caps every worker's pool."""
+        options = Settings(
+            secret_key="x",
+            db_pool_min_size=4,
+            db_pool_total_max_size=10,
+            web_concurrency=4,
+        ).db_pool_options()
+
+        assert options["max_size"] == 2
+        assert options["min_size"] == 2
+
+
+class TestPoolStats:
+    """Test cases for connection pool metrics."""
+
+    def test_publishes_measures_and_counters(self):
+        """Test that gauges are set and counters grow by each delta."""
+
+        class Pool:
+            stats = {
+                "pool_size": 3,
+                "pool_available": 1,
+                "pool_max": 4,
+                "requests_num": 5,
+                "requests_wait_ms": 250,
+            }
+
+            def pop_stats(self):
+                return self.stats
+
+        before = sample("db_pool_checkouts_total", "stub")
+
+        publish_pool_stats("stub", Pool())
+        publish_pool_stats("stub", Pool())
+
+        assert sample("db_pool_connections", "stub") == 3
+        assert sample("db_pool_idle_connections", "stub") == 1
+        assert sample("db_pool_waiting_requests", "stub") == 0
+        assert sample("db_pool_checkouts_total", "stub") == before + 10
+        assert sample("db_pool_checkout_wait_seconds_total", "stub") == 0.5
+
+    @postgres_only
+    @pytest.mark.django_db
+    def test_requests_publish_their_pools(self, api_client, monkeypatch):
+        """Test that pools are reported at the end of every request."""
+        pool = ConnectionPool(open=False)
+        monkeypatch.setattr(
+            type(connections["default"]), "pool", property(lambda self: pool)
+        )
+        pool._stats["requests_num"] = 2
+        before = sample("db_pool_checkouts_total", "default")
+
+        api_client.get("/health/")
+
+        assert sample("db_pool_checkouts_total", "default") == before + 2
+
+
+@postgres_only
+@pytest.mark.django_db
+class TestPooledConnections:
+    """Test cases for connections checked out of a pool."""
+
+    def test_connections_are_reused(self, pooled):
+        """Test that closing returns the connection to the pool."""
+        wrapper = pooled("reused", min_size=1, max_size=1)
+
+        pids = []
+        for _ in range(3):
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT pg_backend_pid()")
+                pids.append(cursor.fetchone()[0])
+            wrapper.close()
+
+        assert len(set(pids)) == 1
+        stats = wrapper.pool.get_stats()
+        assert stats["requests_num"] == 3
+        assert stats["connections_num"] == 1
+
+    def test_checkout_waits_at_most_the_timeout(self, pooled):
+        """Test that an exhausted pool fails the checkout."""
+        holder = pooled("exhausted", min_size=1, max_size=1, timeout=0.2)
+        holder.ensure_connection()
+        waiter = pooled("exhausted", min_size=1, max_size=1, timeout=0.2)
+
+        with pytest.raises(OperationalError):
+            waiter.ensure_connection()
+
+        assert holder.pool.get_stats()["requests_errors"] == 1
+
+    def test_broken_connections_are_replaced(self, pooled):
+        """Test the health check on checkout."""
+        wrapper = pooled(
+            "checked",
+            health_checks=True,
+            min_size=1,
+            max_size=1,
+        )
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            (pid,) = cursor.fetchone()
+        wrapper.close()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            assert cursor.fetchone()[0] != pid
+
+        assert wrapper.pool.get_stats()["connections_lost"] == 1
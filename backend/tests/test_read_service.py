@@ -0,0 +1,163 @@
+import datetime
+import json
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from benchmarks import read_service
+from tasks.models import Task
+from tasks.sync import encode_token
+
+pytest.importorskip("fastapi")
+pytest.importorskip("psycopg_pool")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+pytestmark = [
+    # The service reads through its own connections, so rows must be
+    # committed and the database must be PostgreSQL.
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor != "postgresql",
+        reason="The read service queries PostgreSQL directly",
+    ),
+]
+
+
+@pytest.fixture
+def service():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def many_tasks():
+    start = datetime.date(2026, 1, 1)
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}" if i % 4 else f"Deploy step {i}",
+            description="Run the deploy" if i % 5 == 0 else "",
+            priority=["low", "medium", "high"][i % 3],
+            due_date=None if i % 4 == 0 else start + datetime.timedelta(i),
+            completed=i % 2 == 0,
+            sort_order=(i * 7919) % 37,
+        )
+        for i in range(30)
+    )
+
+
+def django_list(api_client, query):
+    return json.loads(api_client.get(reverse("tasks-list") + query).content)
+
+
+class TestReadService:
+    """Test that the FastAPI service answers like the DRF views."""
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "?all=true",
+            "?page_size=7",
+            "?ordering=-due_date&page_size=4",
+            "?ordering=created_at&priority=high,low&completed=false",
+            "?due_after=2026-01-05&due_before=2026-01-20&all=true",
+            "?search=deploy&page_size=3",
+        ],
+    )
+    def test_list_matches_django(self, service, api_client, many_tasks, query):
+        """Test identical results for pages, filters and orderings."""
+        fast = service.get("/tasks" + query)
+        expected = django_list(api_client, query)
+
+        assert fast.status_code == 200
+        if isinstance(expected, list):
+            assert fast.json() == expected
+        else:
+            assert fast.json()["results"] == expected["results"]
+
+    @pytest.mark.parametrize("ordering", ["position", "-due_date", "rank"])
+    def test_cursors_page_like_django(
+        self, service, api_client, many_tasks, ordering
+    ):
+        """Test cursor pages forwards and back, with DRF's cursors."""
+        query = f"?ordering={ordering}&page_size=4"
+        if ordering == "rank":
+            query += "&search=deploy run"
+        expected = django_list(api_client, query)
+        page = service.get("/tasks" + query).json()
+        forward = []
+        while True:
+            assert page["results"] == expected["results"]
+            forward.extend(task["id"] for task in page["results"])
+            if not page["next"]:
+                break
+            token = page["next"].split("cursor=")[1]
+            expected = django_list(api_client, f"{query}&cursor={token}")
+            page = service.get(page["next"]).json()
+
+        backward = []
+        while page["previous"]:
+            page = service.get(page["previous"]).json()
+            backward[:0] = [task["id"] for task in page["results"]]
+
+        assert len(forward) == len(set(forward)) > 4
+        assert backward == forward[: len(backward)]
+
+    def test_rejects_bad_parameters(self, service, many_tasks):
+        """Test the errors DRF would return for bad input."""
+        priority = service.get("/tasks?priority=urgent")
+        rank = service.get("/tasks?ordering=rank")
+        cursor = service.get("/tasks?cursor=garbage")
+
+        assert priority.status_code == 400
+        assert rank.status_code == 400
+        assert cursor.status_code == 404
+
+    def test_retrieve(self, service, api_client, many_tasks):
+        """Test that a single task matches the DRF detail view."""
+        task = many_tasks[3]
+        url = reverse("tasks-detail", kwargs={"pk": task.id})
+
+        response = service.get(f"/tasks/{task.id}")
+        missing = service.get("/tasks/0")
+
+        assert response.json() == json.loads(api_client.get(url).content)
+        assert missing.status_code == 404
+
+    def test_changes_since_token(self, service, api_client, many_tasks):
+        """Test that delta sync reports updates and deletions."""
+        snapshot = service.get("/tasks/changes").json()
+        old = encode_token(
+            datetime.datetime.now(datetime.timezone.utc)
+            - datetime.timedelta(days=60)
+        )
+        Task.objects.filter(id=many_tasks[0].id).update(
+            updated_at=datetime.datetime.now(datetime.timezone.utc)
+        )
+        api_client.delete(
+            reverse("tasks-detail", kwargs={"pk": many_tasks[1].id})
+        )
+
+        since = service.get(
+            "/tasks/changes", params={"since": snapshot["token"]}
+        ).json()
+
+        assert len(snapshot["changed"]) == 30
+        assert many_tasks[0].id in [task["id"] for task in since["changed"]]
+        assert since["deleted"] == [many_tasks[1].id]
+        assert service.get(f"/tasks/changes?since={old}").status_code == 410
+        assert service.get("/tasks/changes?since=x").status_code == 400
+
+    def test_benchmark_compares_both_services(self, api_client):
+        """Smoke test for the read service benchmark workload."""
+        results = read_service.run(api_client, size=20, repeat=1)
+
+        assert [r["name"] for r in results][:2] == [
+            "list_page_django",
+            "list_page_fastapi",
+        ]
+        assert all(r["p99_ms"] >= r["p50_ms"] > 0 for r in results)
+        assert Task.objects.count() == 0
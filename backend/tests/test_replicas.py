@@ -0,0 +1,116 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.replicas import PIN_COOKIE, ReplicaRouter
+
+from .conftest import titles
+
+databases = pytest.mark.django_db(databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    """Route reads to the second test database, filled differently."""
+    settings.REPLICA_DATABASE = "replica"
+    Task.objects.create(title="Primary")
+    return Task.objects.using("replica").create(title="Replica")
+
+
+@databases
+class TestReplicaRouting:
+    """Test cases for read-replica routing and read-your-writes pins."""
+
+    def test_reads_go_to_replica(self, api_client, replica):
+        """Test that list and detail reads are served by the replica."""
+        detail = api_client.get(
+            reverse("tasks-detail", kwargs={"pk": replica.pk})
+        )
+
+        assert titles(api_client.get(reverse("tasks-list"))) == ["Replica"]
+        assert detail.json()["title"] == "Replica"
+        assert PIN_COOKIE not in detail.cookies
+
+    def test_writes_go_to_primary_and_pin_the_client(
+        self, api_client, replica, settings
+    ):
+        """Test that a client reads its own writes after writing."""
+        settings.REPLICA_PIN_SECONDS = 7
+
+        response = api_client.post(
+            reverse("tasks-list"), {"title": "Mine"}, format="json"
+        )
+
+        assert response.status_code == 201
+        assert Task.objects.using("default").filter(title="Mine").exists()
+        assert not Task.objects.using("replica").filter(title="Mine").exists()
+        assert response.cookies[PIN_COOKIE]["max-age"] == 7
+        # The test client sends the cookie back until it expires.
+        assert titles(api_client.get(reverse("tasks-list"))) == [
+            "Primary",
+            "Mine",
+        ]
+        del api_client.cookies[PIN_COOKIE]
+        assert titles(api_client.get(reverse("tasks-list"))) == ["Replica"]
+
+    def test_updates_find_tasks_on_primary(self, api_client, replica):
+        """Test that writes look tasks up on the primary."""
+        task = Task.objects.using("default").get()
+
+        response = api_client.patch(
+            reverse("tasks-detail", kwargs={"pk": task.pk}),
+            {"completed": True},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert Task.objects.using("default").get().completed
+
+    def test_changes_read_primary(self, api_client, replica):
+        """Test that delta sync, timed on the primary, stays there."""
+        response = api_client.get(reverse("tasks-changes"))
+
+        assert [task["title"] for task in response.json()["changed"]] == [
+            "Primary"
+        ]
+
+    def test_off_without_replica(self, api_client, replica, settings):
+        """Test that nothing is routed or pinned without a replica."""
+        settings.REPLICA_DATABASE = None
+
+        response = api_client.post(
+            reverse("tasks-list"), {"title": "Mine"}, format="json"
+        )
+
+        assert PIN_COOKIE not in response.cookies
+        assert titles(api_client.get(reverse("tasks-list"))) == [
+            "Primary",
+            "Mine",
+        ]
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views_read_replica(self, replica):
+        """Test routing for the async views."""
+        client = AsyncClient()
+
+        response = async_to_sync(client.get)(reverse("tasks-list"))
+        created = async_to_sync(client.post)(
+            reverse("tasks-list"),
+            {"title": "Mine"},
+            content_type="application/json",
+        )
+
+        assert titles(response) == ["Replica"]
+        assert created.status_code == 201
+        assert PIN_COOKIE in created.cookies
+        assert Task.objects.using("default").filter(title="Mine").exists()
+
+    def test_replica_instances_save_to_primary(self, replica):
+        """Test that the router writes every instance to the primary."""
+        router = ReplicaRouter()
+
+        assert router.db_for_write(Task, instance=replica) == "default"
+        assert router.db_for_read(Task) is None
+        assert router.allow_relation(replica, Task.objects.get())
@@ -0,0 +1,260 @@
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tasks.models import CollectionVersion
+from tasks.response_cache import (
+    ALIAS,
+    LOCK_SECONDS,
+    Entry,
+    FileCache,
+    get_or_build,
+)
+
+from .conftest import touches_tasks
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.RESPONSE_CACHE = True
+    caches[ALIAS].clear()
+    yield caches[ALIAS]
+    caches[ALIAS].clear()
+
+
+@pytest.fixture
+def created(api_client):
+    # Through the API, as clients do.
+    for title in ["First", "Second"]:
+        api_client.post(reverse("tasks-list"), {"title": title}, format="json")
+
+
+def lookups(result):
+    return (
+        REGISTRY.get_sample_value(
+            "response_cache_requests_total", {"result": result}
+        )
+        or 0
+    )
+
+
+@pytest.mark.django_db
+class TestCachedLists:
+    """Test cases for task lists served from the response cache."""
+
+    def test_second_request_is_a_hit(
+        self, api_client, created, response_cache
+    ):
+        """Test that a cached list is served without reading tasks."""
+        hits = lookups("hit")
+        first = api_client.get(reverse("tasks-list"))
+
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get(reverse("tasks-list"))
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second["Content-Type"] == "application/json"
+        assert second["ETag"] == first["ETag"]
+        assert [task["title"] for task in second.json()["results"]] == [
+            "First",
+            "Second",
+        ]
+        assert not touches_tasks(queries)
+        assert lookups("hit") == hits + 1
+
+    def test_writes_invalidate(self, api_client, created, response_cache):
+        """Test that a write is visible in the next list."""
+        first = api_client.get(reverse("tasks-list")).json()["results"][0]
+
+        api_client.patch(
+            reverse("tasks-detail", kwargs={"pk": first["id"]}),
+            {"title": "Renamed"},
+            format="json",
+        )
+        response = api_client.get(reverse("tasks-list"))
+
+        assert response.json()["results"][0]["title"] == "Renamed"
+
+    def test_parameters_are_part_of_the_key(
+        self, api_client, created, response_cache
+    ):
+        """Test that filters get their own entries, in any order."""
+        url = reverse("tasks-list")
+        api_client.get(url, {"completed": "false", "page_size": 1})
+        hits = lookups("hit")
+
+        reordered = api_client.get(f"{url}?page_size=1&completed=false")
+        other = api_client.get(url, {"page_size": 2})
+
+        assert len(reordered.json()["results"]) == 1
+        assert len(other.json()["results"]) == 2
+        assert lookups("hit") == hits + 1
+
+    def test_media_type_is_part_of_the_key(
+        self, api_client, created, response_cache
+    ):
+        """Test that indented JSON is not served to other clients."""
+        indented = api_client.get(
+            reverse("tasks-list"), HTTP_ACCEPT="application/json; indent=2"
+        )
+        compact = api_client.get(reverse("tasks-list"))
+
+        assert indented["Content-Type"] == "application/json; indent=2"
+        assert b"\n" in indented.content
+        assert b"\n" not in compact.content
+
+    def test_browsable_api_is_not_cached(
+        self, api_client, created, response_cache
+    ):
+        """Test that HTML pages are rendered for every request."""
+        misses = lookups("miss")
+
+        response = api_client.get(
+            reverse("tasks-list"), HTTP_ACCEPT="text/html"
+        )
+
+        assert response.status_code == 200
+        assert lookups("miss") == misses
+
+    def test_unversioned_lists_are_not_cached(
+        self, api_client, response_cache
+    ):
+        """Test that lists are not cached before the first write."""
+        CollectionVersion.objects.all().delete()
+        misses = lookups("miss")
+
+        api_client.get(reverse("tasks-list"))
+
+        assert lookups("miss") == misses
+
+    def test_disabled(self, api_client, created, response_cache, settings):
+        """Test that RESPONSE_CACHE=False reads the tasks every time."""
+        settings.RESPONSE_CACHE = False
+        api_client.get(reverse("tasks-list"))
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(reverse("tasks-list"))
+
+        assert touches_tasks(queries)
+
+    def test_large_bodies_are_not_stored(
+        self, api_client, created, response_cache, settings
+    ):
+        """Test that bodies over the limit are built every time."""
+        settings.RESPONSE_CACHE_MAX_BYTES = 10
+        first = api_client.get(reverse("tasks-list"))
+        bypasses = lookups("bypass")
+
+        second = api_client.get(reverse("tasks-list"))
+
+        assert second.content == first.content
+        assert lookups("bypass") == bypasses + 1
+
+    def test_invalid_requests_release_the_lock(
+        self, api_client, created, response_cache
+    ):
+        """Test that errors are not cached and free the rebuild lock."""
+        timeouts = lookups("wait_timeout")
+        first = api_client.get(reverse("tasks-list"), {"cursor": "x"})
+        second = api_client.get(reverse("tasks-list"), {"cursor": "x"})
+
+        assert first.status_code == second.status_code == 404
+        assert lookups("wait_timeout") == timeouts
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views_share_entries(self, created, response_cache):
+        """Test that the async list reads what the DRF list stored."""
+        client = AsyncClient()
+        get = async_to_sync(client.get)
+        first = get(reverse("tasks-list"))
+        hits = lookups("hit")
+
+        second = get(reverse("tasks-list"))
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert lookups("hit") == hits + 1
+
+
+class TestStampedeProtection:
+    """Test cases for rebuilding a missing entry once."""
+
+    def test_one_worker_rebuilds(self, response_cache):
+        """Test that concurrent misses wait for a single rebuild."""
+        calls = []
+        results = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.1)
+            return Entry("application/json", b"[]")
+
+        def request():
+            results.append(get_or_build("stampede", build))
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        waited = lookups("waited")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [Entry("application/json", b"[]")] * 5
+        assert lookups("waited") == waited + 4
+
+    def test_waiters_give_up(self, response_cache, settings):
+        """Test that a worker builds itself when a rebuild takes too long."""
+        settings.RESPONSE_CACHE_WAIT = 0.05
+        response_cache.add("slow:lock", True, LOCK_SECONDS)
+        timeouts = lookups("wait_timeout")
+
+        entry = get_or_build("slow", lambda: Entry("text/plain", b"x"))
+
+        assert entry.content == b"x"
+        assert lookups("wait_timeout") == timeouts + 1
+        assert response_cache.get("slow") == entry
+
+    def test_failed_rebuilds_release_the_lock(self, response_cache):
+        """Test that the lock is freed when building raises."""
+
+        def build():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            get_or_build("failing", build)
+
+        assert response_cache.get("failing:lock") is None
+
+
+class TestFileCache:
+    """Test cases for the file cache shared by worker processes."""
+
+    def test_add_is_exclusive(self, tmp_path):
+        """Test that only one of two caches on a directory adds a key."""
+        first = FileCache(str(tmp_path), {})
+        second = FileCache(str(tmp_path), {})
+
+        assert first.add("lock", True, 30)
+        assert not second.add("lock", True, 30)
+        assert second.get("lock") is True
+        # No temporary files are left behind.
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_add_replaces_expired_entries(self, tmp_path):
+        """Test that an expired lock can be taken again."""
+        cache = FileCache(str(tmp_path), {})
+        cache.add("lock", 1, 0.01)
+        time.sleep(0.02)
+
+        assert cache.add("lock", 2, 30)
+        assert cache.get("lock") == 2
@@ -0,0 +1,136 @@
+import pytest
+from django.urls import reverse
+
+from tasks.models import Task
+
+from .conftest import titles
+
+
+@pytest.fixture
+def searchable_tasks(db):
+    return [
+        Task.objects.create(
+            title="Deploy the release", description="Run the migrations"
+        ),
+        Task.objects.create(
+            title="Write notes", description="Summarize the deploy plan"
+        ),
+        Task.objects.create(
+            title="Groceries", description="Milk, eggs and bread"
+        ),
+        Task.objects.create(
+            title="Running shoes",
+            description="Buy new ones",
+            priority="high",
+            completed=True,
+        ),
+    ]
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    """Test cases for full-text search on the task list."""
+
+    def test_matches_title_and_description_ranked(
+        self, api_client, searchable_tasks
+    ):
+        """Test that title matches rank above description matches."""
+        response = api_client.get(reverse("tasks-list"), {"search": "deploy"})
+
+        assert response.status_code == 200
+        assert titles(response) == ["Deploy the release", "Write notes"]
+
+    def test_stems_words_and_requires_every_term(
+        self, api_client, searchable_tasks
+    ):
+        """Test stemming and that all terms must match."""
+        stemmed = api_client.get(reverse("tasks-list"), {"search": "runs"})
+        both = api_client.get(
+            reverse("tasks-list"), {"search": "deploy migrations"}
+        )
+
+        assert set(titles(stemmed)) == {
+            "Deploy the release",
+            "Running shoes",
+        }
+        assert titles(both) == ["Deploy the release"]
+
+    def test_combines_with_filters_and_orderings(
+        self, api_client, searchable_tasks
+    ):
+        """Test search together with filters and explicit orderings."""
+        filtered = api_client.get(
+            reverse("tasks-list"), {"search": "run", "completed": "true"}
+        )
+        ordered = api_client.get(
+            reverse("tasks-list"),
+            {"search": "deploy", "ordering": "-created_at"},
+        )
+
+        assert titles(filtered) == ["Running shoes"]
+        assert titles(ordered) == ["Write notes", "Deploy the release"]
+
+    def test_ranked_pages_follow_cursors(self, api_client, db):
+        """Test that every match is returned once across ranked pages."""
+        for i in range(7):
+            Task.objects.create(
+                title=f"Report {i}", description="report " * (i % 3)
+            )
+        Task.objects.create(title="Unrelated")
+
+        seen = []
+        url = reverse("tasks-list") + "?search=report&page_size=2"
+        while url:
+            response = api_client.get(url)
+            seen.extend(titles(response))
+            url = response.data["next"]
+
+        assert sorted(seen) == [f"Report {i}" for i in range(7)]
+
+    def test_index_follows_writes(self, api_client, searchable_tasks):
+        """Test that updates and deletes are reflected in results."""
+        groceries = searchable_tasks[2]
+        api_client.patch(
+            reverse("tasks-detail", kwargs={"pk": groceries.id}),
+            {"title": "Farmers market"},
+            format="json",
+        )
+        searchable_tasks[0].delete()
+
+        market = api_client.get(reverse("tasks-list"), {"search": "market"})
+        deploy = api_client.get(reverse("tasks-list"), {"search": "deploy"})
+
+        assert titles(market) == ["Farmers market"]
+        assert titles(deploy) == ["Write notes"]
+
+    def test_query_syntax_is_not_interpreted(
+        self, api_client, searchable_tasks
+    ):
+        """Test that operators and punctuation are treated as text."""
+        for text in ['"deploy', "deploy*) OR (", "NOT", "!!!"]:
+            response = api_client.get(reverse("tasks-list"), {"search": text})
+            assert response.status_code == 200
+
+    def test_rank_ordering_requires_search(self, api_client):
+        """Test that ordering by rank without a search is rejected."""
+        response = api_client.get(reverse("tasks-list"), {"ordering": "rank"})
+
+        assert response.status_code == 400
+        assert "ordering" in response.data
+
+
+@pytest.mark.django_db
+class TestAdminSearch:
+    """Test cases for the admin changelist search."""
+
+    def test_changelist_search_is_ranked(self, admin_client, searchable_tasks):
+        """Test that admin search uses the full-text index."""
+        response = admin_client.get(
+            reverse("admin:tasks_task_changelist"), {"q": "deploy"}
+        )
+
+        assert response.status_code == 200
+        assert [t.title for t in response.context["cl"].result_list] == [
+            "Deploy the release",
+            "Write notes",
+        ]
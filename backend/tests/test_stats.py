@@ -0,0 +1,138 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskStats
+from tasks.stats import task_stats, verify_stats
+
+
+@pytest.fixture
+def tasks(db):
+    today = timezone.localdate()
+    day = datetime.timedelta(days=1)
+    return Task.objects.bulk_create(
+        [
+            Task(title="Late", priority="high", due_date=today - day),
+            Task(title="Due", priority="high", due_date=today),
+            Task(title="Undated", priority="high"),
+            Task(title="Late", priority="low", due_date=today - 3 * day),
+            Task(
+                title="Done",
+                priority="low",
+                due_date=today - day,
+                completed=True,
+            ),
+            Task(title="Done", priority="medium", completed=True),
+        ]
+    )
+
+
+@pytest.mark.django_db
+class TestTaskStats:
+    """Test cases for the task stats summary and endpoint."""
+
+    def test_endpoint_reads_summary_table(self, api_client, tasks):
+        """Test the counts, read without touching the task table."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("tasks-stats"))
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "total": 6,
+            "open": 4,
+            "completed": 2,
+            "overdue": 2,
+            "by_priority": {
+                "low": {"open": 1, "completed": 1, "overdue": 1},
+                "medium": {"open": 0, "completed": 1, "overdue": 0},
+                "high": {"open": 3, "completed": 0, "overdue": 1},
+            },
+        }
+        assert not any('"tasks_task"' in q["sql"] for q in queries)
+
+    def test_overdue_follows_the_date(self, tasks):
+        """Test that overdue counts move with the calendar."""
+        later = timezone.localdate() + datetime.timedelta(days=1)
+
+        assert task_stats(today=later)["overdue"] == 3
+
+    def test_api_writes_keep_counts(self, api_client, tasks):
+        """Test that every kind of write updates the summary."""
+        ids = [task.pk for task in tasks]
+
+        api_client.post(reverse("tasks-list"), {"title": "New"}, format="json")
+        api_client.patch(
+            reverse("tasks-detail", kwargs={"pk": ids[0]}),
+            {"completed": True},
+            format="json",
+        )
+        api_client.delete(reverse("tasks-detail", kwargs={"pk": ids[1]}))
+        api_client.post(
+            reverse("tasks-batch"),
+            {"tasks": [{"title": "Batch", "priority": "low"}] * 3},
+            format="json",
+        )
+        api_client.patch(
+            reverse("tasks-batch"),
+            {"tasks": [{"id": ids[2], "due_date": "2020-01-01"}]},
+            format="json",
+        )
+        api_client.delete(
+            reverse("tasks-batch"), {"ids": ids[3:5]}, format="json"
+        )
+        api_client.post(
+            reverse("tasks-reorder"),
+            {"task_orders": [{"id": ids[5], "sort_order": 9}]},
+            format="json",
+        )
+        Task.objects.filter(priority="low").update(priority="medium")
+
+        assert verify_stats() == []
+        stats = task_stats()
+        assert stats["total"] == Task.objects.count() == 7
+        assert stats["by_priority"]["medium"]["open"] == 4
+        assert stats["overdue"] == 1
+
+    def test_rolled_back_writes_are_not_counted(self, tasks):
+        """Test that the summary changes in the writing transaction."""
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Task.objects.create(title="Discarded")
+                Task.objects.all().delete()
+                raise RuntimeError
+
+        assert task_stats()["total"] == 6
+        assert verify_stats() == []
+
+    def test_command_rebuilds_drifted_counts(self, tasks):
+        """Test that the command reports and repairs differences."""
+        TaskStats.objects.filter(priority="high").update(count=5)
+
+        with pytest.raises(CommandError, match="differ in 3 group"):
+            call_command("rebuild_task_stats", "--check")
+        call_command("rebuild_task_stats")
+
+        assert verify_stats() == []
+        assert task_stats()["total"] == 6
+        call_command("rebuild_task_stats", "--check")
+
+    def test_verify_reports_missing_and_stale_groups(self, tasks):
+        """Test the differences found by a full recount."""
+        TaskStats.objects.filter(priority="medium").delete()
+        TaskStats.objects.create(
+            priority="low",
+            completed=True,
+            due_key=datetime.date(2020, 1, 1),
+            count=2,
+        )
+
+        assert verify_stats() == [
+            ("low", True, datetime.date(2020, 1, 1), 2, 0),
+            ("medium", True, None, 0, 1),
+        ]
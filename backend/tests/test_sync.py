@@ -0,0 +1,120 @@
+import datetime
+import io
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskTombstone
+from tasks.sync import SYNC_OVERLAP, encode_token
+
+from .conftest import age_all_tasks
+
+
+@pytest.mark.django_db
+class TestDeltaSync:
+    """Test cases for the changes endpoint."""
+
+    def test_initial_sync_returns_everything(self, api_client):
+        """Test that a call without a token returns a full snapshot."""
+        Task.objects.create(title="Second", sort_order=2)
+        Task.objects.create(title="First", sort_order=1)
+
+        response = api_client.get(reverse("tasks-changes"))
+
+        assert response.status_code == 200
+        assert [t["title"] for t in response.data["changed"]] == [
+            "First",
+            "Second",
+        ]
+        assert response.data["deleted"] == []
+        assert response.data["token"]
+
+    def test_returns_only_changes_since_token(self, api_client, sample_task):
+        """Test that unchanged rows are left out of a delta."""
+        untouched = Task.objects.create(title="Untouched")
+        doomed = Task.objects.create(title="Doomed")
+        age_all_tasks()
+        token = api_client.get(reverse("tasks-changes")).data["token"]
+
+        api_client.patch(
+            reverse("tasks-detail", kwargs={"pk": sample_task.pk}),
+            {"completed": True},
+            format="json",
+        )
+        api_client.delete(reverse("tasks-detail", kwargs={"pk": doomed.pk}))
+        created = api_client.post(
+            reverse("tasks-list"), {"title": "New"}, format="json"
+        ).data
+
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+
+        changed = {t["id"]: t for t in response.data["changed"]}
+        assert set(changed) == {sample_task.id, created["id"]}
+        assert changed[sample_task.id]["completed"] is True
+        assert untouched.id not in changed
+        assert response.data["deleted"] == [doomed.id]
+        assert int(response.data["token"]) >= int(token)
+
+    def test_reorders_are_reported(self, api_client):
+        """Test that bulk reorders and moves stamp updated_at."""
+        a = Task.objects.create(title="A", sort_order=65536)
+        b = Task.objects.create(title="B", sort_order=131072)
+        c = Task.objects.create(title="C", sort_order=196608)
+        age_all_tasks()
+        token = api_client.get(reverse("tasks-changes")).data["token"]
+
+        api_client.post(
+            reverse("tasks-move", kwargs={"pk": c.pk}),
+            {"after": a.id, "before": b.id},
+            format="json",
+        )
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+        assert [t["id"] for t in response.data["changed"]] == [c.id]
+
+        api_client.post(
+            reverse("tasks-reorder"),
+            {"task_orders": [{"id": a.id, "sort_order": 9}]},
+            format="json",
+        )
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+        assert {t["id"] for t in response.data["changed"]} == {a.id, c.id}
+
+    def test_overlap_window_replays_recent_writes(self, api_client):
+        """Test that writes stamped just before the token are resent."""
+        task = Task.objects.create(title="Racy")
+        token = encode_token(task.updated_at + SYNC_OVERLAP / 2)
+
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+
+        assert [t["id"] for t in response.data["changed"]] == [task.id]
+
+    def test_invalid_token(self, api_client):
+        """Test that a malformed token is rejected."""
+        response = api_client.get(reverse("tasks-changes"), {"since": "x"})
+
+        assert response.status_code == 400
+
+    def test_expired_token_requires_full_resync(self, api_client, settings):
+        """Test that tokens older than tombstone retention get 410."""
+        settings.TASK_TOMBSTONE_RETENTION_DAYS = 1
+        token = encode_token(timezone.now() - datetime.timedelta(days=2))
+
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+
+        assert response.status_code == 410
+
+    def test_purge_tombstones(self, settings):
+        """Test that the purge command keeps recent tombstones only."""
+        settings.TASK_TOMBSTONE_RETENTION_DAYS = 1
+        TaskTombstone.objects.create(
+            task_id=1, deleted_at=timezone.now() - datetime.timedelta(days=2)
+        )
+        TaskTombstone.objects.create(task_id=2)
+
+        call_command("purge_task_tombstones", stdout=io.StringIO())
+
+        assert list(
+            TaskTombstone.objects.values_list("task_id", flat=True)
+        ) == [2]
@@ -0,0 +1,242 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.ranking import RANK_GAP, apply_order, rebalance
+
+from .conftest import age_all_tasks
+
+
+def ordered_titles():
+    return list(
+        Task.objects.order_by("sort_order", "created_at", "id").values_list(
+            "title", flat=True
+        )
+    )
+
+
+@pytest.fixture
+def ranked_tasks(db):
+    tasks = [
+        Task.objects.create(title=title, sort_order=(i + 1) * RANK_GAP)
+        for i, title in enumerate(["A", "B", "C", "D"])
+    ]
+    return tasks
+
+
+@pytest.mark.django_db
+class TestMoveTask:
+    """Test cases for moving a single task between neighbours."""
+
+    def test_move_between_neighbours_writes_one_row(
+        self, api_client, ranked_tasks
+    ):
+        """Test that a move with a free gap issues a single UPDATE."""
+        a, b, c, d = ranked_tasks
+        url = reverse("tasks-move", kwargs={"pk": d.pk})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(
+                url, {"after": a.id, "before": b.id}, format="json"
+            )
+
+        assert response.status_code == 200
+        assert a.sort_order < response.data["sort_order"] < b.sort_order
+        assert ordered_titles() == ["A", "D", "B", "C"]
+        updates = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].lstrip().startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+
+    def test_move_to_start_and_end(self, api_client, ranked_tasks):
+        """Test moving with a single anchor at either end of the list."""
+        a, b, c, d = ranked_tasks
+
+        api_client.post(
+            reverse("tasks-move", kwargs={"pk": c.pk}),
+            {"before": a.id},
+            format="json",
+        )
+        api_client.post(
+            reverse("tasks-move", kwargs={"pk": a.pk}),
+            {"after": d.id},
+            format="json",
+        )
+
+        assert ordered_titles() == ["C", "B", "D", "A"]
+
+    def test_move_after_only_uses_next_neighbour(
+        self, api_client, ranked_tasks
+    ):
+        """Test that 'after' alone places the task before A's successor."""
+        a, b, c, d = ranked_tasks
+        response = api_client.post(
+            reverse("tasks-move", kwargs={"pk": d.pk}),
+            {"after": a.id},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert ordered_titles() == ["A", "D", "B", "C"]
+
+    def test_exhausted_gap_rebalances(self, api_client):
+        """Test that ties or adjacent ranks trigger a renumbering."""
+        a = Task.objects.create(title="A", sort_order=0)
+        b = Task.objects.create(title="B", sort_order=0)
+        c = Task.objects.create(title="C", sort_order=0)
+
+        response = api_client.post(
+            reverse("tasks-move", kwargs={"pk": c.pk}),
+            {"after": a.id, "before": b.id},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert ordered_titles() == ["A", "C", "B"]
+        ranks = list(
+            Task.objects.order_by("sort_order").values_list(
+                "sort_order", flat=True
+            )
+        )
+        assert len(set(ranks)) == 3
+
+    def test_repeated_moves_into_same_gap(self, api_client, ranked_tasks):
+        """Test that many moves into one gap keep a consistent order."""
+        a, b, c, d = ranked_tasks
+        expected = ["A", "B", "C", "D"]
+        for _ in range(40):
+            moving = expected[-1]
+            task = Task.objects.get(title=moving)
+            first = Task.objects.get(title=expected[0])
+            second = Task.objects.get(title=expected[1])
+            response = api_client.post(
+                reverse("tasks-move", kwargs={"pk": task.pk}),
+                {"after": first.id, "before": second.id},
+                format="json",
+            )
+            assert response.status_code == 200
+            expected = [expected[0], moving] + expected[1:-1]
+
+        assert ordered_titles() == expected
+
+    def test_move_invalid_requests(self, api_client, ranked_tasks):
+        """Test validation of move neighbours."""
+        a, b, c, d = ranked_tasks
+        url = reverse("tasks-move", kwargs={"pk": a.pk})
+
+        assert api_client.post(url, {}, format="json").status_code == 400
+        assert (
+            api_client.post(url, {"after": a.id}, format="json").status_code
+            == 400
+        )
+        assert (
+            api_client.post(url, {"after": 99999}, format="json").status_code
+            == 400
+        )
+        response = api_client.post(
+            url, {"after": d.id, "before": b.id}, format="json"
+        )
+        assert response.status_code == 400
+
+    def test_move_nonexistent_task(self, api_client, ranked_tasks):
+        """Test moving a task that does not exist."""
+        url = reverse("tasks-move", kwargs={"pk": 99999})
+        response = api_client.post(
+            url, {"after": ranked_tasks[0].id}, format="json"
+        )
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestBulkOrder:
+    """Test cases for the single-statement bulk reorder path."""
+
+    def test_apply_order_is_single_update(self, ranked_tasks):
+        """Test that an arbitrary reorder is one UPDATE statement."""
+        orders = {
+            task.id: rank for rank, task in enumerate(reversed(ranked_tasks))
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            updated = apply_order(orders)
+
+        assert updated == 4
+        assert ordered_titles() == ["D", "C", "B", "A"]
+        updates = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].lstrip().startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+
+    def test_reorder_rejects_non_integer_values(self, api_client):
+        """Test that malformed ids or orders are rejected."""
+        task = Task.objects.create(title="Task 1", sort_order=0)
+        response = api_client.post(
+            reverse("tasks-reorder"),
+            {"task_orders": [{"id": task.id, "sort_order": "first"}]},
+            format="json",
+        )
+
+        assert response.status_code == 400
+        task.refresh_from_db()
+        assert task.sort_order == 0
+
+    def test_rebalance_spaces_ranks_in_order(self, db):
+        """Test that a rebalance keeps order and restores gaps."""
+        for title, rank in [("B", 5), ("A", 1), ("C", 5)]:
+            Task.objects.create(title=title, sort_order=rank)
+
+        assert rebalance() == 3
+
+        assert ordered_titles() == ["A", "B", "C"]
+        ranks = list(
+            Task.objects.order_by("sort_order").values_list(
+                "sort_order", flat=True
+            )
+        )
+        assert ranks == [RANK_GAP, 2 * RANK_GAP, 3 * RANK_GAP]
+
+    def test_apply_order_skips_unchanged_ranks(self, ranked_tasks):
+        """Test that tasks already at their rank are not written."""
+        a, b, c, d = ranked_tasks
+        age_all_tasks()
+
+        updated = apply_order(
+            {a.id: a.sort_order, b.id: b.sort_order, c.id: 1}
+        )
+
+        assert updated == 1
+        assert ordered_titles() == ["C", "A", "B", "D"]
+        written = Task.objects.filter(
+            updated_at__gt=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        assert list(written.values_list("title", flat=True)) == ["C"]
+
+    def test_rebalance_after_move_syncs_shifted_tasks(self, api_client):
+        """Test that a rebalance only sends the tasks it moved to sync."""
+        tasks = [
+            Task.objects.create(title=f"Task {i}", sort_order=i * RANK_GAP)
+            for i in range(1, 11)
+        ]
+        age_all_tasks()
+        token = api_client.get(reverse("tasks-changes")).data["token"]
+        api_client.post(
+            reverse("tasks-move", kwargs={"pk": tasks[-1].pk}),
+            {"after": tasks[7].id, "before": tasks[8].id},
+            format="json",
+        )
+
+        assert rebalance() == 2
+
+        response = api_client.get(reverse("tasks-changes"), {"since": token})
+        changed = {task["id"] for task in response.data["changed"]}
+        assert changed == {tasks[8].id, tasks[9].id}
@@ -22,7 +22,7 @@ class TestTaskAPI:
         response = api_client.get(url)
 
         assert response.status_code == 200
-        assert response.data == []
+        assert response.data["results"] == []
 
     def test_list_tasks_with_data(self, api_client, sample_task):
         """Test listing tasks with existing data."""
@@ -30,8 +30,8 @@ class TestTaskAPI:
         response = api_client.get(url)
 
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["title"] == "Test Task"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["title"] == "Test Task"
 
     def test_create_task(self, api_client):
         """Test creating a new task."""
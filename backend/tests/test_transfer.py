@@ -0,0 +1,236 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.signals import tasks_changed
+from tasks.stats import verify_stats
+from tasks.transfer import export_chunks
+
+
+@pytest.fixture
+def tasks(db):
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}",
+            description="" if i % 2 else f'About, "task"\n{i}',
+            priority=["low", "medium", "high"][i % 3],
+            completed=i % 4 == 0,
+            due_date=datetime.date(2025, 1, 1 + i) if i % 3 else None,
+            sort_order=i,
+        )
+        for i in range(12)
+    )
+
+
+def content(response):
+    return b"".join(response.streaming_content)
+
+
+def post(api_client, body, content_type):
+    return api_client.generic(
+        "POST", reverse("tasks-import"), body, content_type=content_type
+    )
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+    """Test cases for streaming task exports."""
+
+    def test_ndjson_matches_list(self, api_client, tasks):
+        """Test that each line is a task as the list returns it."""
+        expected = api_client.get(reverse("tasks-list"), {"all": "true"})
+
+        response = api_client.get(
+            reverse("tasks-export"), {"format": "ndjson"}
+        )
+
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert 'filename="tasks.ndjson"' in response["Content-Disposition"]
+        lines = content(response).decode().splitlines()
+        assert [json.loads(line) for line in lines] == expected.json()
+
+    def test_csv_by_accept_header(self, api_client, tasks):
+        """Test CSV output, chosen by content negotiation."""
+        response = api_client.get(
+            reverse("tasks-export"), HTTP_ACCEPT="text/csv"
+        )
+
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(content(response).decode())))
+        assert len(rows) == 12
+        assert rows[0]["description"] == 'About, "task"\n0'
+        assert (rows[0]["completed"], rows[0]["due_date"]) == ("true", "")
+        assert rows[1]["due_date"] == "2025-01-02"
+
+    def test_applies_list_filters(self, api_client, tasks):
+        """Test that exports take the list's filters and ordering."""
+        response = api_client.get(
+            reverse("tasks-export"),
+            {"format": "ndjson", "priority": "high", "ordering": "-due_date"},
+        )
+
+        lines = content(response).decode().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == [
+            "Task 11",
+            "Task 8",
+            "Task 5",
+            "Task 2",
+        ]
+
+    def test_empty_csv_has_header(self, api_client, db):
+        """Test that an empty CSV export still names the fields."""
+        response = api_client.get(reverse("tasks-export"), {"format": "csv"})
+
+        assert content(response).decode().strip() == (
+            "id,title,description,priority,due_date,completed,sort_order,"
+            "created_at,updated_at,version"
+        )
+
+    def test_reads_in_chunks(self, tasks):
+        """Test that rows are encoded a chunk at a time."""
+        chunks = list(export_chunks(Task.objects.order_by("id"), 5))
+
+        assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+
+    def test_async_stream_under_asgi(self, tasks):
+        """Test that ASGI responses stream from an async iterator."""
+        response = async_to_sync(AsyncClient().get)(
+            reverse("tasks-export"), {"format": "ndjson"}
+        )
+
+        assert response.is_async
+        lines = b"".join(
+            async_to_sync(_collect)(response.streaming_content)
+        ).splitlines()
+        assert len(lines) == 12
+
+    def test_command_writes_file(self, tasks, tmp_path):
+        """Test the export command."""
+        path = tmp_path / "tasks.csv"
+
+        call_command("export_tasks", "--format", "csv", "--output", path)
+
+        assert len(path.read_text().splitlines()) > 12
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.django_db
+class TestTaskImport:
+    """Test cases for bulk task imports."""
+
+    def test_round_trip(self, api_client, tasks):
+        """Test that exported tasks import as copies of themselves."""
+        fields = ["title", "description", "priority", "due_date", "completed"]
+        exports = {
+            content_type: content(
+                api_client.get(
+                    reverse("tasks-export"), HTTP_ACCEPT=content_type
+                )
+            )
+            for content_type in ["application/x-ndjson", "text/csv"]
+        }
+
+        for content_type, exported in exports.items():
+            response = post(api_client, exported, content_type)
+
+            assert response.status_code == 201
+            assert response.json() == {"imported": 12}
+        copies = {}
+        for task in Task.objects.order_by("id").values(*fields):
+            copies.setdefault(tuple(task.values()), 0)
+            copies[tuple(task.values())] += 1
+        assert len(copies) == 12
+        assert set(copies.values()) == {3}
+        assert verify_stats() == []
+
+    def test_defaults_and_signal(self, api_client, db):
+        """Test that missing fields take defaults and one event is sent."""
+        sent = []
+
+        def record(sender, action, ids, **kwargs):
+            sent.append((action, ids))
+
+        tasks_changed.connect(record)
+        try:
+            response = post(
+                api_client,
+                b'{"title": "One", "id": 99}\n\n{"title": "Two"}\n',
+                "application/x-ndjson",
+            )
+        finally:
+            tasks_changed.disconnect(record)
+
+        assert response.status_code == 201
+        task = Task.objects.get(title="One")
+        assert task.id != 99
+        assert (task.priority, task.completed, task.due_date) == (
+            "medium",
+            False,
+            None,
+        )
+        assert task.created_at is not None
+        assert sent == [("create", None)]
+
+    def test_invalid_records_write_nothing(self, api_client, db):
+        """Test that errors are reported by line and roll back."""
+        body = (
+            "title,priority,due_date\n"
+            "Fine,high,2025-01-01\n"
+            ",low,\n"
+            "Late,urgent,someday\n"
+        )
+
+        response = post(api_client, body.encode(), "text/csv")
+
+        assert response.status_code == 400
+        errors = response.json()["lines"]
+        assert list(errors) == ["3", "4"]
+        assert "title" in errors["3"]
+        assert set(errors["4"]) == {"priority", "due_date"}
+        assert not Task.objects.exists()
+
+    def test_malformed_input(self, api_client, db):
+        """Test that unparseable bodies are a parse error."""
+        response = post(
+            api_client, b'{"title": "A"}\n{"title"\n', "application/x-ndjson"
+        )
+
+        assert response.status_code == 400
+        assert "line 2" in response.json()["detail"]
+        assert not Task.objects.exists()
+
+    def test_unsupported_media_type(self, api_client, db):
+        """Test that other content types are refused."""
+        response = api_client.post(
+            reverse("tasks-import"), [{"title": "A"}], format="json"
+        )
+
+        assert response.status_code == 415
+
+    def test_command(self, tmp_path, db):
+        """Test the import command and its error report."""
+        good = tmp_path / "tasks.csv"
+        good.write_text("title,completed\nA,true\nB,\n")
+        bad = tmp_path / "tasks.ndjson"
+        bad.write_text('{"title": ""}\n')
+
+        call_command("import_tasks", str(good))
+        with pytest.raises(CommandError, match="No tasks were imported"):
+            call_command("import_tasks", str(bad))
+
+        assert list(
+            Task.objects.order_by("title").values_list("title", "completed")
+        ) == [("A", True), ("B", False)]
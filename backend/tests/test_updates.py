@@ -0,0 +1,341 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.ranking import RANK_GAP, rebalance
+
+
+def detail(task_id):
+    return reverse("tasks-detail", kwargs={"pk": task_id})
+
+
+def task_queries(queries):
+    return [query["sql"] for query in queries if "tasks_task" in query["sql"]]
+
+
+@pytest.mark.django_db
+class TestPartialUpdates:
+    """Test cases for single-statement task updates."""
+
+    def test_patch_is_one_statement(self, api_client, sample_task):
+        """Test that a toggle writes only its field, without a read."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.patch(
+                detail(sample_task.id), {"completed": True}, format="json"
+            )
+
+        assert response.status_code == 200
+        assert response.data["completed"] is True
+        assert response.data["description"] == "Test Description"
+        assert len(queries) == 1
+        [sql] = task_queries(queries)
+        assert sql.startswith("UPDATE")
+        assert "RETURNING" in sql
+        assert '"description"' not in sql.split("RETURNING")[0]
+
+    def test_updates_count_versions(self, api_client, sample_task):
+        """Test that every write increments the task's version."""
+        first_updated = sample_task.updated_at
+        first = api_client.patch(
+            detail(sample_task.id), {"completed": True}, format="json"
+        )
+        second = api_client.patch(
+            detail(sample_task.id), {"title": "Renamed"}, format="json"
+        )
+
+        sample_task.refresh_from_db()
+        assert first.data["version"] == 2
+        assert second.data["version"] == sample_task.version == 3
+        assert sample_task.updated_at > first_updated
+        assert api_client.get(detail(sample_task.id)).data["version"] == 3
+
+    def test_version_is_read_only(self, api_client, sample_task):
+        """Test that a version sent is checked, never written."""
+        response = api_client.patch(
+            detail(sample_task.id), {"version": 1}, format="json"
+        )
+
+        sample_task.refresh_from_db()
+        assert response.data["version"] == sample_task.version == 2
+
+    def test_put(self, api_client, sample_task):
+        """Test that PUT takes the same path, leaving omitted fields."""
+        response = api_client.put(
+            detail(sample_task.id), {"title": "Replaced"}, format="json"
+        )
+
+        sample_task.refresh_from_db()
+        assert response.status_code == 200
+        assert sample_task.title == "Replaced"
+        assert sample_task.description == "Test Description"
+        assert sample_task.version == 2
+
+    def test_invalid_data(self, api_client, sample_task):
+        """Test that validation errors write nothing."""
+        response = api_client.patch(
+            detail(sample_task.id), {"priority": "urgent"}, format="json"
+        )
+
+        sample_task.refresh_from_db()
+        assert response.status_code == 400
+        assert sample_task.priority == "medium"
+        assert sample_task.version == 1
+
+    @pytest.mark.parametrize("pk", [0, "x"])
+    def test_missing_tasks(self, api_client, sample_task, pk):
+        """Test that unknown ids get 404."""
+        response = api_client.patch(detail(pk), {"completed": True})
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestExpectedVersion:
+    """Test cases for optimistic concurrency with the version field."""
+
+    def patch(self, client, task, version):
+        return client.patch(
+            detail(task.id),
+            {"completed": True, "version": version},
+            format="json",
+        )
+
+    @pytest.mark.parametrize("version", [1, "1", None])
+    def test_current_version_updates(self, api_client, sample_task, version):
+        """Test that the current version, or none, matches."""
+        response = self.patch(api_client, sample_task, version)
+
+        assert response.status_code == 200
+        assert response.data["version"] == 2
+
+    def test_other_versions_fail(self, api_client, sample_task):
+        """Test that a stale version gets 412 and writes nothing."""
+        response = self.patch(api_client, sample_task, 2)
+
+        sample_task.refresh_from_db()
+        assert response.status_code == 412
+        assert response.data["detail"].code == "precondition_failed"
+        assert sample_task.completed is False
+        assert sample_task.version == 1
+
+    @pytest.mark.parametrize("version", ["x", 0, [1]])
+    def test_invalid_versions(self, api_client, sample_task, version):
+        """Test that versions that are not positive integers get 400."""
+        response = self.patch(api_client, sample_task, version)
+
+        assert response.status_code == 400
+        assert "version" in response.data
+
+    def test_concurrent_edit_is_detected(self, api_client, sample_task):
+        """Test that the second of two edits from one version fails."""
+        first = self.patch(api_client, sample_task, 1)
+        second = api_client.patch(
+            detail(sample_task.id),
+            {"title": "Lost", "version": 1},
+            format="json",
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 412
+        assert "version 2" in second.data["detail"]
+
+    def test_missing_task_is_not_a_conflict(self, api_client, sample_task):
+        """Test that unknown ids get 404 with a version too."""
+        response = self.patch(api_client, Task(id=0), 1)
+
+        assert response.status_code == 404
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views(self, sample_task):
+        """Test that the async server mode checks versions too."""
+        patch = async_to_sync(AsyncClient().patch)
+
+        stale, current = [
+            patch(
+                detail(sample_task.id),
+                {"completed": True, "version": version},
+                content_type="application/json",
+            )
+            for version in [2, 1]
+        ]
+
+        assert stale.status_code == 412
+        assert current.status_code == 200
+        assert current.json()["version"] == 2
+
+
+@pytest.mark.django_db
+class TestIfMatch:
+    """Test cases for If-Match with the ETag of a task."""
+
+    def patch(self, client, task, header):
+        return client.patch(
+            detail(task.id),
+            {"completed": True},
+            format="json",
+            HTTP_IF_MATCH=header,
+        )
+
+    def test_etag_from_get(self, api_client, sample_task):
+        """Test that the ETag of a GET is a valid If-Match."""
+        etag = api_client.get(detail(sample_task.id))["ETag"]
+
+        first = self.patch(api_client, sample_task, etag)
+        second = self.patch(api_client, sample_task, etag)
+
+        assert first.status_code == 200
+        assert first.data["completed"] is True
+        assert second.status_code == 412
+        assert second.data["detail"].code == "precondition_failed"
+
+    def test_other_writes_fail_it(self, api_client, sample_task):
+        """Test that the tag no longer matches after any write."""
+        etag = api_client.get(detail(sample_task.id))["ETag"]
+        Task.objects.create(title="Other")
+
+        response = self.patch(api_client, sample_task, etag)
+
+        sample_task.refresh_from_db()
+        assert response.status_code == 412
+        assert sample_task.completed is False
+
+    @pytest.mark.parametrize(
+        "header", ["W/{etag}", '"1"', "garbage", '"0-json", W/{etag}']
+    )
+    def test_other_tags_fail(self, api_client, sample_task, header):
+        """Test that weak, foreign or malformed tags get 412."""
+        etag = api_client.get(detail(sample_task.id))["ETag"]
+
+        response = self.patch(
+            api_client, sample_task, header.format(etag=etag)
+        )
+
+        assert response.status_code == 412
+
+    @pytest.mark.parametrize("header", ['"0-json", {etag}', "*"])
+    def test_tag_lists_and_star(self, api_client, sample_task, header):
+        """Test that a list holding the tag, or *, matches."""
+        etag = api_client.get(detail(sample_task.id))["ETag"]
+
+        response = self.patch(
+            api_client, sample_task, header.format(etag=etag)
+        )
+
+        assert response.status_code == 200
+
+    def test_missing_task_is_not_a_conflict(self, api_client, sample_task):
+        """Test that unknown ids get 404 with If-Match too."""
+        etag = api_client.get(detail(sample_task.id))["ETag"]
+
+        response = self.patch(api_client, Task(id=0), etag)
+
+        assert response.status_code == 404
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views(self, sample_task):
+        """Test that the async server mode checks If-Match too."""
+        client = AsyncClient()
+        etag = async_to_sync(client.get)(detail(sample_task.id))["ETag"]
+        patch = async_to_sync(client.patch)
+
+        current, stale = [
+            patch(
+                detail(sample_task.id),
+                {"completed": True},
+                content_type="application/json",
+                headers={"If-Match": etag},
+            )
+            for _ in range(2)
+        ]
+
+        assert current.status_code == 200
+        assert stale.status_code == 412
+
+
+@pytest.mark.django_db
+class TestOtherWrites:
+    """Test that every kind of edit increments task versions."""
+
+    def test_batch(self, api_client, sample_task):
+        api_client.patch(
+            reverse("tasks-batch"),
+            {"tasks": [{"id": sample_task.id, "title": "Renamed"}]},
+            format="json",
+        )
+
+        sample_task.refresh_from_db()
+        assert sample_task.version == 2
+
+    def test_admin(self, admin_client, sample_task):
+        admin_client.post(
+            reverse("admin:tasks_task_changelist"),
+            {
+                "action": "mark_completed",
+                ACTION_CHECKBOX_NAME: [sample_task.id],
+            },
+        )
+
+        sample_task.refresh_from_db()
+        assert sample_task.version == 2
+
+
+@pytest.mark.django_db
+class TestRankWrites:
+    """Test cases for writes that only change ranks."""
+
+    def test_move(self, api_client, sample_task):
+        """Test that moves keep the version."""
+        other = Task.objects.create(title="Other", sort_order=2)
+
+        response = api_client.post(
+            reverse("tasks-move", kwargs={"pk": sample_task.id}),
+            {"after": other.id},
+            format="json",
+        )
+
+        assert response.data["sort_order"] > 2
+        assert response.data["version"] == 1
+
+    def test_reorder(self, api_client, sample_task):
+        """Test that reorders keep the version."""
+        api_client.post(
+            reverse("tasks-reorder"),
+            {"task_orders": [{"id": sample_task.id, "sort_order": 7}]},
+            format="json",
+        )
+
+        sample_task.refresh_from_db()
+        assert sample_task.sort_order == 7
+        assert sample_task.version == 1
+
+    def test_batch_of_ranks(self, api_client, sample_task):
+        """Test that batch updates of ranks alone keep the version."""
+        api_client.patch(
+            reverse("tasks-batch"),
+            {"tasks": [{"id": sample_task.id, "sort_order": 7}]},
+            format="json",
+        )
+
+        sample_task.refresh_from_db()
+        assert sample_task.sort_order == 7
+        assert sample_task.version == 1
+
+    def test_edit_after_rebalance(self, api_client, sample_task):
+        """Test that a rebalance does not fail edits made before it."""
+        version = api_client.get(detail(sample_task.id)).data["version"]
+
+        rebalance()
+        response = api_client.patch(
+            detail(sample_task.id),
+            {"completed": True, "version": version},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["sort_order"] == RANK_GAP
+        assert response.data["version"] == version + 1
@@ -0,0 +1,212 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import CollectionVersion, Task
+from tasks.versions import current_version
+
+from .conftest import touches_tasks
+
+
+@pytest.fixture
+def unwritten(db):
+    # Flushes between transactional tests are counted writes too.
+    CollectionVersion.objects.all().delete()
+
+
+@pytest.fixture
+def created(api_client):
+    # Through the API, as clients do.
+    response = api_client.post(
+        reverse("tasks-list"), {"title": "Created"}, format="json"
+    )
+    return Task.objects.get(id=response.json()["id"])
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Test cases for ETags driven by the task list version."""
+
+    def test_unwritten_list_has_a_tag(self, api_client, unwritten):
+        """Test that the version starts at zero, with no Last-Modified."""
+        response = api_client.get(reverse("tasks-list"))
+
+        assert current_version().version == 0
+        assert response["ETag"] == '"0-json"'
+        assert "Last-Modified" not in response
+
+    def test_list_carries_validators(self, api_client, created):
+        """Test that list responses have an ETag and Last-Modified."""
+        response = api_client.get(reverse("tasks-list"))
+
+        assert response["ETag"] == f'"{current_version().version}-json"'
+        assert response["Last-Modified"].endswith(" GMT")
+        assert response["Cache-Control"] == "no-cache"
+        assert "Accept" in response["Vary"]
+
+    def test_matching_tag_is_not_modified(self, api_client, sample_task):
+        """Test that a current tag gets 304 without reading tasks."""
+        etag = api_client.get(reverse("tasks-list"))["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse("tasks-list"), HTTP_IF_NONE_MATCH=etag
+            )
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+        assert len(queries) == 1
+        assert not touches_tasks(queries)
+
+    def test_detail_is_not_modified(self, api_client, sample_task):
+        """Test that a task's current tag gets 304 without reading tasks."""
+        url = reverse("tasks-detail", kwargs={"pk": sample_task.id})
+        etag = api_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+        assert len(queries) == 1
+        assert not touches_tasks(queries)
+
+    def test_missing_tasks_have_no_tag(self, api_client, sample_task):
+        """Test that error responses are not given validators."""
+        response = api_client.get(reverse("tasks-detail", kwargs={"pk": 0}))
+
+        assert response.status_code == 404
+        assert "ETag" not in response
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda client, task: client.post(
+                reverse("tasks-list"), {"title": "New"}, format="json"
+            ),
+            lambda client, task: client.patch(
+                reverse("tasks-detail", kwargs={"pk": task.id}),
+                {"completed": True},
+                format="json",
+            ),
+            lambda client, task: client.delete(
+                reverse("tasks-detail", kwargs={"pk": task.id})
+            ),
+            lambda client, task: client.post(
+                reverse("tasks-reorder"),
+                {"task_orders": [{"id": task.id, "sort_order": 7}]},
+                format="json",
+            ),
+            lambda client, task: client.patch(
+                reverse("tasks-batch"),
+                {"tasks": [{"id": task.id, "title": "Renamed"}]},
+                format="json",
+            ),
+        ],
+        ids=["create", "update", "delete", "reorder", "batch"],
+    )
+    def test_writes_change_the_tag(self, api_client, sample_task, write):
+        """Test that every kind of write invalidates earlier tags."""
+        etag = api_client.get(reverse("tasks-list"))["ETag"]
+
+        assert write(api_client, sample_task).status_code < 300
+        response = api_client.get(
+            reverse("tasks-list"), HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_moves_change_the_tag(self, api_client, sample_task):
+        """Test that moving a task invalidates earlier tags."""
+        other = Task.objects.create(title="Other", sort_order=2)
+        etag = api_client.get(reverse("tasks-list"))["ETag"]
+
+        api_client.post(
+            reverse("tasks-move", kwargs={"pk": sample_task.id}),
+            {"after": other.id},
+            format="json",
+        )
+
+        assert api_client.get(reverse("tasks-list"))["ETag"] != etag
+
+    def test_tag_lists_and_weak_tags_match(self, api_client, sample_task):
+        """Test If-None-Match with several tags, weak tags and *."""
+        etag = api_client.get(reverse("tasks-list"))["ETag"]
+
+        for header in [f'"0-json", {etag}', f"W/{etag}", "*"]:
+            response = api_client.get(
+                reverse("tasks-list"), HTTP_IF_NONE_MATCH=header
+            )
+            assert response.status_code == 304
+
+    def test_formats_have_their_own_tags(self, api_client, sample_task):
+        """Test that the browsable API does not share the JSON tag."""
+        etag = api_client.get(reverse("tasks-list"))["ETag"]
+
+        response = api_client.get(
+            reverse("tasks-list"), HTTP_ACCEPT="text/html"
+        )
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_if_modified_since_alone_is_not_enough(self, api_client, created):
+        """Test that Last-Modified dates are not used to answer 304."""
+        modified = api_client.get(reverse("tasks-list"))["Last-Modified"]
+
+        response = api_client.get(
+            reverse("tasks-list"), HTTP_IF_MODIFIED_SINCE=modified
+        )
+
+        assert response.status_code == 200
+
+    @pytest.mark.urls("tasks.async_urls")
+    def test_async_views(self, created):
+        """Test that the async list and detail views answer 304 too."""
+        client = AsyncClient()
+        get = async_to_sync(client.get)
+        list_url = reverse("tasks-list")
+        detail_url = reverse("tasks-detail", kwargs={"pk": created.id})
+
+        etag = f'"{current_version().version}-json"'
+
+        listed = get(list_url)
+        fetched = get(detail_url)
+
+        assert listed["ETag"] == fetched["ETag"] == etag
+        for url in [list_url, detail_url]:
+            with CaptureQueriesContext(connection) as queries:
+                response = get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert len(queries) == 1
+            assert not touches_tasks(queries)
+
+
+@pytest.mark.django_db
+class TestVersionTriggers:
+    """Test cases for the database triggers that count writes."""
+
+    def test_bulk_writes_are_counted(self, unwritten):
+        """Test that writes bypassing the API bump the version."""
+        Task.objects.bulk_create([Task(title="Loaded")])
+        loaded = current_version()
+
+        Task.objects.update(completed=True)
+
+        assert loaded.changed_at is not None
+        assert current_version().version > loaded.version
+
+    def test_statements_without_rows_are_not_counted(self, sample_task):
+        """Test that writes matching no rows keep the version."""
+        before = current_version()
+
+        Task.objects.filter(id=0).update(completed=True)
+        Task.objects.filter(id=0).delete()
+
+        assert current_version() == before
@@ -102,10 +102,10 @@ export default function TaskCard({ task, onEdit, onDelete, onToggleComplete, onT
 
   const saveTask = async (updatedTask: Task) => {
     try {
-      await tasksApi.update(task.id, updatedTask);
+      const saved = await tasksApi.update(task.id, updatedTask);
 
       if (onTaskUpdate) {
-        onTaskUpdate(updatedTask);
+        onTaskUpdate(saved);
       }
     } catch (error) {
       console.error('Error saving task:', error);
@@ -27,6 +27,14 @@ describe('useTasks', () => {
     },
   ];
 
+  const mockSnapshot = (tasks: typeof mockTasks) => {
+    (tasksApi.changes as jest.Mock) = jest.fn().mockResolvedValue({
+      token: '1000',
+      changed: tasks,
+      deleted: [],
+    });
+  };
+
   beforeEach(() => {
     jest.clearAllMocks();
     // Suppress act warnings - we're using waitFor which handles async updates correctly
@@ -43,7 +51,7 @@ describe('useTasks', () => {
   });
 
   it('should initialize with empty tasks and loading state', () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue([]);
+    mockSnapshot([]);
 
     const { result } = renderHook(() => useTasks());
 
@@ -52,7 +60,7 @@ describe('useTasks', () => {
   });
 
   it('should fetch tasks on mount', async () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
+    mockSnapshot(mockTasks);
 
     const { result } = renderHook(() => useTasks());
 
@@ -61,12 +69,13 @@ describe('useTasks', () => {
     });
 
     expect(result.current.tasks).toEqual(mockTasks);
-    expect(tasksApi.getAll).toHaveBeenCalledTimes(1);
+    expect(tasksApi.changes).toHaveBeenCalledTimes(1);
+    expect(tasksApi.changes).toHaveBeenCalledWith();
   });
 
   it('should handle fetch error', async () => {
     const consoleError = jest.spyOn(console, 'error').mockImplementation();
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockRejectedValue(new Error('API Error'));
+    (tasksApi.changes as jest.Mock) = jest.fn().mockRejectedValue(new Error('API Error'));
 
     const { result } = renderHook(() => useTasks());
 
@@ -80,7 +89,7 @@ describe('useTasks', () => {
   });
 
   it('should refresh tasks', async () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
+    mockSnapshot(mockTasks);
 
     const { result } = renderHook(() => useTasks());
 
@@ -88,7 +97,7 @@ describe('useTasks', () => {
       expect(result.current.loading).toBe(false);
     });
 
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue([...mockTasks, {
+    mockSnapshot([...mockTasks, {
       id: 3,
       title: 'Task 3',
       description: 'Description 3',
@@ -106,8 +115,11 @@ describe('useTasks', () => {
   });
 
   it('should handle reorder', async () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
-    (tasksApi.reorder as jest.Mock) = jest.fn().mockResolvedValue(undefined);
+    mockSnapshot(mockTasks);
+    (tasksApi.move as jest.Mock) = jest.fn().mockResolvedValue({
+      ...mockTasks[1],
+      sort_order: -1,
+    });
 
     const { result } = renderHook(() => useTasks());
 
@@ -117,18 +129,59 @@ describe('useTasks', () => {
 
     await act(async () => {
       await result.current.handleDragEnd({
-        active: { id: '2' },
-        over: { id: '1' }
+        active: { id: 2 },
+        over: { id: 1 }
+      } as unknown as DragEndEvent);
+    });
+
+    expect(tasksApi.move).toHaveBeenCalledWith(2, {
+      after: null,
+      before: 1,
+    });
+    expect(result.current.tasks.map((t) => t.id)).toEqual([2, 1]);
+    expect(result.current.tasks[0].sort_order).toBe(-1);
+  });
+
+  it('should toggle a moved task with its current version', async () => {
+    mockSnapshot([mockTasks[0], { ...mockTasks[1], version: 3 }]);
+    (tasksApi.move as jest.Mock) = jest.fn().mockResolvedValue({
+      ...mockTasks[1],
+      sort_order: -1,
+      version: 4,
+    });
+    (tasksApi.update as jest.Mock) = jest.fn(
+      (id: number, task: object, version?: number) =>
+        version === 4
+          ? Promise.resolve({ ...mockTasks[1], ...task, version: 5 })
+          : Promise.reject(new Error('HTTP error! status: 412'))
+    );
+
+    const { result } = renderHook(() => useTasks());
+
+    await waitFor(() => {
+      expect(result.current.loading).toBe(false);
+    });
+
+    await act(async () => {
+      await result.current.handleDragEnd({
+        active: { id: 2 },
+        over: { id: 1 }
       } as unknown as DragEndEvent);
     });
+    await act(async () => {
+      await result.current.toggleComplete(result.current.tasks[0]);
+    });
 
-    expect(tasksApi.reorder).toHaveBeenCalled();
+    expect(tasksApi.update).toHaveBeenCalledWith(2, { completed: false }, 4);
+    expect(result.current.error).toBeNull();
+    expect(result.current.tasks[0].completed).toBe(false);
+    expect(result.current.tasks[0].version).toBe(5);
   });
 
   it('should handle reorder error', async () => {
     const consoleError = jest.spyOn(console, 'error').mockImplementation();
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
-    (tasksApi.reorder as jest.Mock) = jest.fn().mockRejectedValue(new Error('Reorder failed'));
+    mockSnapshot(mockTasks);
+    (tasksApi.move as jest.Mock) = jest.fn().mockRejectedValue(new Error('Reorder failed'));
 
     const { result } = renderHook(() => useTasks());
 
@@ -144,11 +197,61 @@ describe('useTasks', () => {
     });
 
     expect(consoleError).toHaveBeenCalled();
+    await waitFor(() => {
+      expect(tasksApi.changes).toHaveBeenLastCalledWith('1000');
+    });
+    consoleError.mockRestore();
+  });
+
+  it('should toggle completion with only the flag and version', async () => {
+    const versioned = { ...mockTasks[0], version: 3 };
+    mockSnapshot([versioned]);
+    (tasksApi.update as jest.Mock) = jest.fn().mockResolvedValue({
+      ...mockTasks[0],
+      completed: true,
+      version: 4,
+    });
+
+    const { result } = renderHook(() => useTasks());
+
+    await waitFor(() => {
+      expect(result.current.loading).toBe(false);
+    });
+
+    await act(async () => {
+      await result.current.toggleComplete(result.current.tasks[0]);
+    });
+
+    expect(tasksApi.update).toHaveBeenCalledWith(1, { completed: true }, 3);
+    expect(result.current.tasks[0].completed).toBe(true);
+    expect(result.current.tasks[0].version).toBe(4);
+  });
+
+  it('should revert and resync when a toggle fails', async () => {
+    const consoleError = jest.spyOn(console, 'error').mockImplementation();
+    mockSnapshot(mockTasks);
+    (tasksApi.update as jest.Mock) = jest.fn().mockRejectedValue(new Error('HTTP error! status: 412'));
+
+    const { result } = renderHook(() => useTasks());
+
+    await waitFor(() => {
+      expect(result.current.loading).toBe(false);
+    });
+
+    await act(async () => {
+      await result.current.toggleComplete(mockTasks[0]);
+    });
+
+    expect(result.current.tasks[0].completed).toBe(false);
+    expect(result.current.error).toBe('Failed to update task');
+    await waitFor(() => {
+      expect(tasksApi.changes).toHaveBeenLastCalledWith('1000');
+    });
     consoleError.mockRestore();
   });
 
   it('should update task in local state', async () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
+    mockSnapshot(mockTasks);
 
     const { result } = renderHook(() => useTasks());
 
@@ -166,7 +269,7 @@ describe('useTasks', () => {
   });
 
   it('should not update non-existent task', async () => {
-    (tasksApi.getAll as jest.Mock) = jest.fn().mockResolvedValue(mockTasks);
+    mockSnapshot(mockTasks);
 
     const { result } = renderHook(() => useTasks());
 
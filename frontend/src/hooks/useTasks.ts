@@ -1,20 +1,23 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { DragEndEvent } from '@dnd-kit/core';
 import { arrayMove } from '@dnd-kit/sortable';
 import { Task } from '@/types/task';
 import { tasksApi } from '@/lib/api';
+import { applyTaskChanges } from '@/lib/utils';
 
 export function useTasks() {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const syncToken = useRef<string | null>(null);
 
   const fetchTasks = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await tasksApi.getAll();
-      setTasks(data);
+      const { token, changed } = await tasksApi.changes();
+      syncToken.current = token;
+      setTasks(changed);
     } catch (err) {
       console.error('Error fetching tasks:', err);
       setError('Failed to load tasks');
@@ -23,6 +26,25 @@ export function useTasks() {
     }
   }, []);
 
+  // Fetch only what changed since the last sync; fall back to a full
+  // load when there is no token or it has expired.
+  const syncTasks = useCallback(async () => {
+    if (!syncToken.current) {
+      return fetchTasks();
+    }
+    try {
+      const { token, changed, deleted } = await tasksApi.changes(
+        syncToken.current
+      );
+      syncToken.current = token;
+      setTasks((prevTasks) => applyTaskChanges(prevTasks, changed, deleted));
+    } catch (err) {
+      console.error('Error syncing tasks:', err);
+      syncToken.current = null;
+      return fetchTasks();
+    }
+  }, [fetchTasks]);
+
   useEffect(() => {
     fetchTasks();
   }, [fetchTasks]);
@@ -43,10 +65,16 @@ export function useTasks() {
       );
 
       try {
-        await tasksApi.update(task.id, {
-          ...task,
-          completed: !task.completed,
-        });
+        // Only the flag is sent, and only applied if nobody changed the
+        // task since it was loaded.
+        const updated = await tasksApi.update(
+          task.id,
+          { completed: !task.completed },
+          task.version
+        );
+        setTasks((prevTasks) =>
+          prevTasks.map((t) => (t.id === updated.id ? updated : t))
+        );
       } catch (err) {
         console.error('Error toggling task completion:', err);
         // Revert on error
@@ -56,9 +84,11 @@ export function useTasks() {
           )
         );
         setError('Failed to update task');
+        // Resync to get the current task
+        syncTasks();
       }
     },
-    []
+    [syncTasks]
   );
 
   const handleDragEnd = useCallback(
@@ -70,30 +100,29 @@ export function useTasks() {
         const newIndex = tasks.findIndex((task) => task.id === over.id);
 
         const newTasks = arrayMove(tasks, oldIndex, newIndex);
-        const updatedTasks = newTasks.map((task, index) => ({
-          ...task,
-          sort_order: index,
-        }));
 
         // Optimistic update
-        setTasks(updatedTasks);
+        setTasks(newTasks);
 
         try {
-          const taskOrders = updatedTasks.map((task) => ({
-            id: task.id,
-            sort_order: task.sort_order,
-          }));
-
-          await tasksApi.reorder(taskOrders);
+          // Only the moved task is rewritten; the server picks a rank
+          // between its new neighbours.
+          const moved = await tasksApi.move(active.id as number, {
+            after: newTasks[newIndex - 1]?.id ?? null,
+            before: newTasks[newIndex + 1]?.id ?? null,
+          });
+          setTasks((prevTasks) =>
+            prevTasks.map((t) => (t.id === moved.id ? moved : t))
+          );
         } catch (err) {
           console.error('Error reordering tasks:', err);
           setError('Failed to reorder tasks');
-          // Refetch to get correct order
-          fetchTasks();
+          // Resync to get the correct order
+          syncTasks();
         }
       }
     },
-    [tasks, fetchTasks]
+    [tasks, syncTasks]
   );
 
   return {
@@ -101,6 +130,7 @@ export function useTasks() {
     loading,
     error,
     fetchTasks,
+    syncTasks,
     updateTask,
     toggleComplete,
     handleDragEnd,
@@ -1,4 +1,4 @@
-import { Task } from '@/types/task';
+import { Task, TaskChanges } from '@/types/task';
 
 const API_BASE = '/api';
 
@@ -32,18 +32,27 @@ async function handleResponse<T>(response: Response): Promise<T> {
 
 export const tasksApi = {
   /**
-   * Fetch all tasks
+   * Fetch all tasks (unpaginated)
    */
   getAll: async (): Promise<Task[]> => {
-    const response = await fetch(`${API_BASE}/tasks`);
+    const response = await fetch(`${API_BASE}/tasks?all=true`);
     return handleResponse<Task[]>(response);
   },
 
+  /**
+   * Fetch tasks changed since a sync token, or a full snapshot without one
+   */
+  changes: async (since?: string): Promise<TaskChanges> => {
+    const query = since ? `?since=${encodeURIComponent(since)}` : '';
+    const response = await fetch(`${API_BASE}/tasks/changes${query}`);
+    return handleResponse<TaskChanges>(response);
+  },
+
   /**
    * Create a new task
    */
   create: async (
-    task: Omit<Task, 'id' | 'created_at' | 'sort_order'>
+    task: Omit<Task, 'id' | 'created_at' | 'updated_at' | 'sort_order'>
   ): Promise<Task> => {
     const response = await fetch(`${API_BASE}/tasks`, {
       method: 'POST',
@@ -56,15 +65,20 @@ export const tasksApi = {
   },
 
   /**
-   * Update an existing task
+   * Update the given fields of a task; with a version, only if the task
+   * is still at it (412 otherwise)
    */
-  update: async (id: number, task: Partial<Task>): Promise<Task> => {
+  update: async (
+    id: number,
+    task: Partial<Task>,
+    version?: number
+  ): Promise<Task> => {
     const response = await fetch(`${API_BASE}/tasks/${id}`, {
       method: 'PATCH',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(task),
+      body: JSON.stringify(version === undefined ? task : { ...task, version }),
     });
     return handleResponse<Task>(response);
   },
@@ -94,6 +108,23 @@ export const tasksApi = {
     });
     return handleResponse<void>(response);
   },
+
+  /**
+   * Move a task between two neighbours (either may be omitted)
+   */
+  move: async (
+    id: number,
+    neighbours: { after?: number | null; before?: number | null }
+  ): Promise<Task> => {
+    const response = await fetch(`${API_BASE}/tasks/${id}/move`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(neighbours),
+    });
+    return handleResponse<Task>(response);
+  },
 };
 
 export { ApiError };
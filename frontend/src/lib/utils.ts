@@ -1,6 +1,29 @@
 import { clsx, type ClassValue } from "clsx"
 import { twMerge } from "tailwind-merge"
+import { Task } from "@/types/task"
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+export function compareTasks(a: Task, b: Task): number {
+  return (
+    a.sort_order - b.sort_order ||
+    (a.created_at ?? '').localeCompare(b.created_at ?? '') ||
+    a.id - b.id
+  )
+}
+
+/**
+ * Merge a delta sync into a task list, keeping list order
+ */
+export function applyTaskChanges(
+  tasks: Task[],
+  changed: Task[],
+  deleted: number[]
+): Task[] {
+  const removed = new Set([...deleted, ...changed.map((task) => task.id)])
+  return [...tasks.filter((task) => !removed.has(task.id)), ...changed].sort(
+    compareTasks
+  )
+}
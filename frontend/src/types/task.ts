@@ -7,4 +7,12 @@ export interface Task {
   completed: boolean;
   sort_order: number;
   created_at?: string;
+  updated_at?: string;
+  version?: number;
+}
+
+export interface TaskChanges {
+  token: string;
+  changed: Task[];
+  deleted: number[];
 }